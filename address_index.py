@@ -0,0 +1,123 @@
+"""
+Address Index
+
+This module provides a compact, locally loaded index of disposable-email
+domains and role-account prefixes (info@, noreply@, ...). The lists are read
+once from plain-text data files into frozensets, so classifying an address
+is a handful of set lookups and needs no paid API call.
+"""
+import os
+import logging
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DISPOSABLE_DOMAINS_FILE = os.getenv("DISPOSABLE_DOMAINS_FILE", os.path.join(DATA_DIR, "disposable_domains.txt"))
+ROLE_PREFIXES_FILE = os.getenv("ROLE_PREFIXES_FILE", os.path.join(DATA_DIR, "role_prefixes.txt"))
+
+
+def load_entries(path: str) -> FrozenSet[str]:
+    """
+    Load a one-entry-per-line data file, skipping blank lines and # comments.
+    
+    Args:
+        path: Path to the data file
+    
+    Returns:
+        Frozenset of lowercased entries (empty if the file is missing)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return frozenset(
+                line.strip().lower() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+    except OSError as e:
+        logger.warning(f"Could not load {path}: {str(e)}")
+        return frozenset()
+
+
+class AddressIndex:
+    """In-memory disposable-domain and role-prefix index."""
+    
+    def __init__(self, disposable_domains: Optional[Iterable[str]] = None,
+                 role_prefixes: Optional[Iterable[str]] = None):
+        """
+        Initialize the index.
+        
+        Args:
+            disposable_domains: Disposable domains (default: loaded from DISPOSABLE_DOMAINS_FILE)
+            role_prefixes: Role local parts (default: loaded from ROLE_PREFIXES_FILE)
+        """
+        if disposable_domains is None:
+            self.disposable_domains = load_entries(DISPOSABLE_DOMAINS_FILE)
+        else:
+            self.disposable_domains = frozenset(domain.lower() for domain in disposable_domains)
+        
+        if role_prefixes is None:
+            self.role_prefixes = load_entries(ROLE_PREFIXES_FILE)
+        else:
+            self.role_prefixes = frozenset(prefix.lower() for prefix in role_prefixes)
+    
+    def is_disposable_domain(self, domain: str) -> bool:
+        """Whether the domain, or any parent domain, is a known disposable domain."""
+        domain = domain.lower().rstrip(".")
+        while domain:
+            if domain in self.disposable_domains:
+                return True
+            _, sep, domain = domain.partition(".")
+            if not sep:
+                return False
+        return False
+    
+    def is_role_local_part(self, local: str) -> bool:
+        """Whether the local part is a role account, ignoring any +tag."""
+        return local.lower().partition("+")[0] in self.role_prefixes
+    
+    def classify(self, email: str) -> Dict[str, Any]:
+        """
+        Classify an address.
+        
+        Args:
+            email: A normalized email address
+        
+        Returns:
+            Dict with 'disposable' and 'role' flags
+        """
+        local, _, domain = email.rpartition("@")
+        return {
+            "disposable": self.is_disposable_domain(domain),
+            "role": self.is_role_local_part(local)
+        }
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of entries in each list."""
+        return {
+            "disposable_domains": len(self.disposable_domains),
+            "role_prefixes": len(self.role_prefixes)
+        }
+
+
+@lru_cache(maxsize=1)
+def get_default_index() -> AddressIndex:
+    """Get the process-wide index, loading the data files on first use."""
+    return AddressIndex()
+
+
+def skipped_address_result(email: str, reason: str) -> Dict[str, Any]:
+    """
+    Build the local verification result for an address that was not sent to any provider.
+    
+    Disposable addresses are reported invalid; role addresses may well be
+    deliverable, so their validity is left unknown.
+    """
+    is_valid = False if reason == "disposable" else None
+    return {
+        "email": email,
+        "is_valid": is_valid,
+        "score": 0.0 if is_valid is False else None,
+        "provider": "local",
+        "details": {"reason": reason}
+    }
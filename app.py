@@ -5,6 +5,8 @@ A Streamlit application for email verification and list management using multipl
 verification services.
 """
 import os
+import re
+import html
 import json
 import datetime
 import pandas as pd
@@ -13,6 +15,11 @@ import logging
 import sys
 from typing import Dict, List, Any, Optional
 import tempfile
+import secrets
+import shutil
+import time
+from collections import deque
+from urllib.parse import quote
 
 # Try to import dotenv, but don't fail if it's not available
 try:
@@ -26,8 +33,10 @@ except ImportError:
         pass
 
 from database import init_db, add_default_services
-from email_verification_manager import EmailVerificationManager
+from email_verification_manager import EmailVerificationManager, INTERACTIVE_DEADLINE
 from email_list_manager import EmailListManager
+from verification_job_manager import VerificationJobManager, RESUMABLE_JOB_STATUSES
+from email_csv import EmailCsvSource, ResultCsvWriter
 
 # Debug information
 print("Python version:", sys.version)
@@ -59,11 +68,28 @@ try:
 except Exception as e:
     print(f"Database initialization error: {str(e)}")
     st.error(f"Database error: {str(e)}")
+    # Never serve against a schema with pending migrations
+    st.stop()
 
 # Initialize managers
-verification_manager = EmailVerificationManager()
+@st.cache_resource
+def get_verification_manager():
+    """One manager per server process, so provider connections are reused across reruns."""
+    return EmailVerificationManager()
+
+verification_manager = get_verification_manager()
+job_manager = VerificationJobManager(verification_manager)
 list_manager = EmailListManager()
 
+# Most recent results shown while a bulk verification is streaming
+LIVE_RESULT_ROWS = 200
+
+# Exports larger than this (bytes) are linked from the static folder instead of loaded into the page
+EXPORT_LINK_THRESHOLD = int(os.getenv("EXPORT_LINK_THRESHOLD", str(50 * 1024 * 1024)))
+# Seconds a linked export stays available
+EXPORT_LINK_TTL = int(os.getenv("EXPORT_LINK_TTL", "3600"))
+STATIC_EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "exports")
+
 # Set page configuration
 st.set_page_config(
     page_title="Email Verification System",
@@ -95,17 +121,150 @@ def save_api_key(service_name, api_key):
     
     st.success(f"{service_name} API key saved successfully!")
 
-def verify_single_email(email, service_name=None):
+def verify_single_email(email, service_name=None, bypass_cache=False, routing=None):
     """Verify a single email address."""
     with st.spinner(f"Verifying {email}..."):
-        result = verification_manager.verify_email(email, service_name)
+        result = verification_manager.verify_email(
+            email, service_name, bypass_cache=bypass_cache, routing=routing, deadline=INTERACTIVE_DEADLINE
+        )
     return result
 
-def verify_bulk_emails(emails, service_name=None):
-    """Verify multiple email addresses."""
-    with st.spinner(f"Verifying {len(emails)} emails..."):
-        results = verification_manager.bulk_verify(emails, service_name)
-    return results
+def verify_bulk_emails(emails, service_name=None, bypass_cache=False, routing=None, total=None, compress=False):
+    """Verify multiple email addresses, showing results as they arrive and writing them to an export file."""
+    total = total or len(emails)
+    progress_bar = st.progress(0.0)
+    status_text = st.empty()
+    live_table = st.empty()
+    export = ResultCsvWriter(result_fields(), compress=compress)
+    preview = deque(maxlen=LIVE_RESULT_ROWS)
+    progress = {}
+    
+    def on_progress(update):
+        progress.update(update)
+        progress_bar.progress(min(1.0, update['processed'] / total))
+        status_text.write(f"{update['processed']} of {total} addresses processed")
+        live_table.dataframe(pd.DataFrame(list(preview)), use_container_width=True)
+    
+    try:
+        for result in verification_manager.iter_verify(
+            emails, service_name, bypass_cache=bypass_cache, routing=routing, progress_callback=on_progress
+        ):
+            row = result_row(result)
+            export.write(row)
+            preview.append(row)
+    except ValueError as e:
+        export.remove()
+        return {"error": str(e)}
+    except Exception:
+        export.remove()
+        raise
+    
+    live_table.empty()
+    return {"export": export, "preview": list(preview), "preprocessing": progress.get('preprocessing')}
+
+def export_results(results, compress=False):
+    """Write a list of verification results to an export file."""
+    export = ResultCsvWriter(result_fields(), compress=compress)
+    preview = deque(maxlen=LIVE_RESULT_ROWS)
+    try:
+        for r in results:
+            if isinstance(r, dict) and 'email' in r:
+                row = result_row(r)
+                export.write(row)
+                preview.append(row)
+    except Exception:
+        export.remove()
+        raise
+    return {"export": export, "preview": list(preview)}
+
+def offer_download(path, file_name, mime, label, key):
+    """
+    Offer a finished export file for download.
+    
+    st.download_button holds the whole file in memory, so only small files go
+    through it; larger ones are moved into the static folder and linked, and
+    the browser streams them from disk. The caller still removes the file at
+    path afterwards (a no-op once it has been moved).
+    
+    The static folder is public: anyone with a link can download the file
+    until it expires, so published names carry an unguessable token and
+    expired files are removed on every page load.
+    """
+    size = os.path.getsize(path)
+    if size <= EXPORT_LINK_THRESHOLD:
+        with open(path, 'rb') as export_file:
+            st.download_button(label, export_file, file_name, mime, key=key)
+        return
+    
+    remove_expired_exports()
+    os.makedirs(STATIC_EXPORT_DIR, exist_ok=True)
+    # file_name may come from user input (list names): never use it as a path or unescaped HTML
+    safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.basename(file_name)).lstrip(".") or "export"
+    published = f"{secrets.token_urlsafe(16)}_{safe_name}"
+    shutil.move(path, os.path.join(STATIC_EXPORT_DIR, published))
+    st.markdown(
+        f'<a href="app/static/exports/{quote(published)}" download="{html.escape(file_name, quote=True)}">'
+        f'{html.escape(label)}</a>',
+        unsafe_allow_html=True
+    )
+    st.caption(f"{size / (1024 * 1024):,.0f} MB; the link stays available for {EXPORT_LINK_TTL // 60} minutes.")
+
+def remove_expired_exports():
+    """Delete linked exports older than EXPORT_LINK_TTL."""
+    if not os.path.isdir(STATIC_EXPORT_DIR):
+        return
+    cutoff = time.time() - EXPORT_LINK_TTL
+    for name in os.listdir(STATIC_EXPORT_DIR):
+        path = os.path.join(STATIC_EXPORT_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except OSError:
+            pass
+
+# Linked exports contain customer data; expire them on every page load
+remove_expired_exports()
+
+def result_fields():
+    """Columns of the results table and export file."""
+    fields = ['email', 'is_valid', 'score', 'provider', 'tags']
+    for srv in verification_manager.services:
+        fields += [f"{srv}_valid", f"{srv}_score"]
+    return fields
+
+def result_row(result):
+    """Flatten a verification result into a results table row."""
+    entry = {
+        'email': result.get('email'),
+        'is_valid': result.get('is_valid'),
+        'score': result.get('score'),
+        'provider': result.get('provider', ''),
+        'tags': ', '.join(result.get('tags', []))
+    }
+    
+    # If we have aggregated results
+    if 'results' in result and isinstance(result['results'], dict):
+        for srv, srv_result in result['results'].items():
+            if isinstance(srv_result, dict):
+                entry[f"{srv}_valid"] = srv_result.get('is_valid')
+                entry[f"{srv}_score"] = srv_result.get('score')
+    
+    return entry
+
+def run_verification_job(job_id, bypass_cache=False):
+    """Run or resume a verification job, showing its progress."""
+    progress_bar = st.progress(0.0)
+    status_text = st.empty()
+    
+    def on_progress(job):
+        progress_bar.progress(min(1.0, job['progress']))
+        status_text.write(f"{job['completed_count']} of {job['total_count']} addresses done")
+    
+    job = job_manager.run_job(job_id, bypass_cache=bypass_cache, progress_callback=on_progress)
+    if job.get('error'):
+        return job
+    on_progress(job)
+    return job_manager.get_job_results(job_id)
 
 def display_verification_result(result):
     """Display the result of an email verification."""
@@ -143,10 +302,19 @@ def display_verification_result(result):
     # If we have detailed results from multiple services
     if 'results' in result and isinstance(result['results'], dict):
         st.subheader("Results by Service")
+        if result.get('decided_by'):
+            st.caption(f"Decided by {result['decided_by'].capitalize()} after asking {result['verified_by']} service(s).")
+        if result.get('pending'):
+            st.warning(
+                f"No answer within {INTERACTIVE_DEADLINE:.0f}s from: "
+                f"{', '.join(name.capitalize() for name in result['pending'])}. Showing a partial result."
+            )
         
         for service_name, service_result in result['results'].items():
             with st.expander(f"{service_name.capitalize()} Result"):
-                if 'error' in service_result:
+                if service_result.get('pending'):
+                    st.info("Pending: the service did not answer before the deadline.")
+                elif 'error' in service_result:
                     st.error(f"Error: {service_result['error']}")
                 else:
                     cols = st.columns(3)
@@ -195,7 +363,13 @@ if menu == "Single Email Verification":
     
     # Check if any API keys are configured
     available_services = verification_manager.get_available_services()
-    if not available_services:
+    unavailable_services = verification_manager.get_unavailable_services()
+    if unavailable_services:
+        st.warning(
+            f"Temporarily skipping failing service(s): {', '.join(s.capitalize() for s in unavailable_services)}. "
+            "They are retried automatically."
+        )
+    elif not available_services:
         st.warning("No verification services have API keys configured. Please set up API keys in the 'API Keys' section.")
     
     # Email input
@@ -204,7 +378,7 @@ if menu == "Single Email Verification":
     # Service selection
     col1, col2 = st.columns(2)
     with col1:
-        service_options = ["All Available Services"] + available_services
+        service_options = ["All Available Services", "Cheapest Sufficient Service First"] + available_services
         selected_service = st.selectbox("Select Verification Service", service_options)
     
     with col2:
@@ -212,16 +386,19 @@ if menu == "Single Email Verification":
         for service in available_services:
             st.write(f"- {service.capitalize()}")
     
+    bypass_cache = st.checkbox("Bypass cache (always query the services)", key="single_bypass_cache")
+    
     # Verify button
     if st.button("Verify Email"):
         if not email:
             st.error("Please enter an email address.")
         else:
             # Determine which service to use
-            service_name = None if selected_service == "All Available Services" else selected_service
+            service_name = None if selected_service in ("All Available Services", "Cheapest Sufficient Service First") else selected_service
+            routing = "cascade" if selected_service == "Cheapest Sufficient Service First" else "all"
             
             # Verify email
-            result = verify_single_email(email, service_name)
+            result = verify_single_email(email, service_name, bypass_cache, routing)
             
             # Display result
             display_verification_result(result)
@@ -250,14 +427,22 @@ elif menu == "Bulk Verification":
     
     # Check if any API keys are configured
     available_services = verification_manager.get_available_services()
+    unavailable_services = verification_manager.get_unavailable_services()
+    if unavailable_services:
+        st.warning(
+            f"Temporarily skipping failing service(s): {', '.join(s.capitalize() for s in unavailable_services)}. "
+            "They are retried automatically."
+        )
     if not available_services:
-        st.warning("No verification services have API keys configured. Please set up API keys in the 'API Keys' section.")
+        if not unavailable_services:
+            st.warning("No verification services have API keys configured. Please set up API keys in the 'API Keys' section.")
         st.stop()
     
     # Input method: text or file
     input_method = st.radio("Input Method", ["Enter Emails", "Upload CSV File"])
     
     emails_to_verify = []
+    email_count = 0
     
     if input_method == "Enter Emails":
         email_text = st.text_area(
@@ -268,107 +453,203 @@ elif menu == "Bulk Verification":
         if email_text:
             # Split by newlines and filter empty lines
             emails_to_verify = [e.strip() for e in email_text.split('\n') if e.strip()]
-            st.info(f"{len(emails_to_verify)} email(s) entered.")
+            email_count = len(emails_to_verify)
+            st.info(f"{email_count} email(s) entered.")
     
     else:  # Upload CSV
         uploaded_file = st.file_uploader("Upload CSV file with email addresses", type=["csv"])
         
         if uploaded_file:
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_path = tmp_file.name
-            
             try:
-                # Read CSV
-                df = pd.read_csv(tmp_path)
+                # Stream the addresses from the upload instead of loading the whole file
+                source = EmailCsvSource(uploaded_file)
                 
-                # Look for email column
-                email_columns = [col for col in df.columns if 'email' in col.lower()]
-                
-                if email_columns:
-                    # Use the first column that contains 'email'
-                    email_col = email_columns[0]
-                    emails_to_verify = df[email_col].dropna().tolist()
-                    st.info(f"{len(emails_to_verify)} email(s) found in column '{email_col}'.")
+                if source.column:
+                    emails_to_verify = source
+                    # Counting reads the whole upload, so do it once per file
+                    # instead of on every rerun
+                    count_key = (uploaded_file.file_id, source.column)
+                    cached_count = st.session_state.get("upload_email_count")
+                    if not cached_count or cached_count[0] != count_key:
+                        cached_count = (count_key, source.count())
+                        st.session_state["upload_email_count"] = cached_count
+                    email_count = cached_count[1]
+                    st.info(f"{email_count} email(s) found in column '{source.column}'.")
                 else:
                     st.error("No column containing 'email' found in the CSV file.")
             except Exception as e:
                 st.error(f"Error reading CSV file: {str(e)}")
-            
-            # Clean up
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
     
     # Service selection
-    service_options = ["All Available Services"] + available_services
+    service_options = ["All Available Services", "Cheapest Sufficient Service First"] + available_services
     selected_service = st.selectbox("Select Verification Service", service_options)
-    service_name = None if selected_service == "All Available Services" else selected_service
+    service_name = None if selected_service in ("All Available Services", "Cheapest Sufficient Service First") else selected_service
+    routing = "cascade" if selected_service == "Cheapest Sufficient Service First" else "all"
+    bypass_cache = st.checkbox("Bypass cache (always query the services)", key="bulk_bypass_cache")
+    export_format = st.radio("Results file format", ["CSV", "CSV (gzip)"], horizontal=True)
+    compress_export = export_format == "CSV (gzip)"
+    
+    use_vendor_bulk = False
+    if service_name in verification_manager.bulk_jobs.get_bulk_services():
+        use_vendor_bulk = st.checkbox(
+            f"Submit as a {service_name.capitalize()} bulk job (recommended for large lists)",
+            help="The list is uploaded to the vendor's bulk API and results are stored when the job finishes."
+        )
+    
+    run_as_job = False
+    if not use_vendor_bulk:
+        run_as_job = st.checkbox(
+            "Run as a resumable job",
+            help="Progress is saved after every chunk, so an interrupted run can be resumed without re-verifying addresses."
+        )
+    
+    run_in_background = False
+    if run_as_job:
+        run_in_background = st.checkbox(
+            "Run in background worker",
+            help="The job is queued and picked up by `python verification_worker.py`, so it keeps running when this page is closed."
+        )
     
     # Verify button
     if st.button("Verify Emails"):
-        if not emails_to_verify:
+        if not email_count:
             st.error("No emails to verify. Please enter emails or upload a CSV file.")
-        else:
-            # Limit the number of emails to verify at once
-            max_emails = 100
-            if len(emails_to_verify) > max_emails:
-                st.warning(f"Too many emails. Limiting to first {max_emails} emails.")
-                emails_to_verify = emails_to_verify[:max_emails]
+        elif use_vendor_bulk:
+            with st.spinner(f"Uploading {email_count} emails to {service_name}..."):
+                job = verification_manager.submit_bulk_job(emails_to_verify, service_name)
             
-            # Verify emails
-            results = verify_bulk_emails(emails_to_verify, service_name)
+            if job.get('error'):
+                st.error(f"Error: {job['error']}")
+            else:
+                st.success(f"Bulk job {job['vendor_job_id']} submitted with {job['email_count']} emails. Results will be stored when the vendor finishes.")
+        else:
+            if run_as_job and not run_in_background:
+                job = job_manager.create_job(emails_to_verify, service_name, routing)
+                if job.get('error'):
+                    results = job
+                else:
+                    st.info(f"Job {job['id']} created with {job['total_count']} unique address(es).")
+                    results = run_verification_job(job['id'], bypass_cache)
+            elif run_in_background:
+                job = job_manager.create_job(emails_to_verify, service_name, routing, queue=True)
+                if job.get('error'):
+                    st.error(f"Error: {job['error']}")
+                else:
+                    st.success(
+                        f"Job {job['id']} queued with {job['total_count']} unique address(es). "
+                        "A background worker will run it; follow its progress under Verification Jobs."
+                    )
+                results = {}
+            else:
+                # Verify emails, streaming results into the page
+                results = verify_bulk_emails(
+                    emails_to_verify, service_name, bypass_cache, routing, total=email_count, compress=compress_export
+                )
             
             if 'error' in results:
                 st.error(f"Error: {results['error']}")
-            elif 'results' in results:
-                # Convert results to DataFrame
-                if isinstance(results['results'], list):
-                    # Create a list of dictionaries for the DataFrame
-                    df_data = []
-                    
-                    for r in results['results']:
-                        if isinstance(r, dict) and 'email' in r:
-                            entry = {
-                                'email': r.get('email'),
-                                'is_valid': r.get('is_valid'),
-                                'score': r.get('score'),
-                                'provider': r.get('provider', '')
-                            }
-                            
-                            # If we have aggregated results
-                            if 'results' in r and isinstance(r['results'], dict):
-                                for srv, srv_result in r['results'].items():
-                                    if isinstance(srv_result, dict):
-                                        entry[f"{srv}_valid"] = srv_result.get('is_valid')
-                                        entry[f"{srv}_score"] = srv_result.get('score')
+            elif 'results' in results or 'export' in results:
+                prefilter = results.get('preprocessing')
+                if prefilter:
+                    st.info(
+                        f"Pre-filter: {prefilter['duplicates']} duplicate(s) removed, "
+                        f"{prefilter['invalid_syntax']} invalid address(es) rejected, "
+                        f"{prefilter['disposable']} disposable and {prefilter['role']} role address(es) tagged, "
+                        f"{prefilter['skipped_local']} skipped, "
+                        f"{prefilter['api_calls_saved']} API call(s) saved."
+                    )
+                
+                # Job results come back as a list; write them to an export file too
+                if 'export' not in results and isinstance(results['results'], list):
+                    results = {**results, **export_results(results['results'], compress_export)}
+                
+                if 'export' in results:
+                    export = results['export']
+                    try:
+                        if export.row_count:
+                            # Display results
+                            st.subheader("Verification Results")
+                            if export.row_count > len(results['preview']):
+                                st.caption(
+                                    f"Showing the last {len(results['preview'])} of {export.row_count} results. "
+                                    "Download the file for the full list."
+                                )
+                            st.dataframe(pd.DataFrame(results['preview']), use_container_width=True)
                             
-                            df_data.append(entry)
-                    
-                    if df_data:
-                        result_df = pd.DataFrame(df_data)
-                        
-                        # Display results
-                        st.subheader("Verification Results")
-                        st.dataframe(result_df, use_container_width=True)
-                        
-                        # Download option
-                        csv = result_df.to_csv(index=False)
-                        st.download_button(
-                            "Download Results as CSV",
-                            csv,
-                            "email_verification_results.csv",
-                            "text/csv",
-                            key='download-csv'
-                        )
-                    else:
-                        st.error("No valid results returned.")
+                            # Download option, served from the export file on disk
+                            offer_download(
+                                export.close(),
+                                export.file_name("email_verification_results"),
+                                export.mime,
+                                "Download Results as CSV",
+                                'download-csv'
+                            )
+                        else:
+                            st.error("No valid results returned.")
+                    finally:
+                        export.remove()
                 else:
                     st.error("Unexpected result format.")
             else:
                 st.error("No results returned.")
+    
+    # Vendor bulk jobs
+    bulk_jobs = verification_manager.bulk_jobs.list_jobs()
+    if bulk_jobs:
+        with st.expander("Vendor Bulk Jobs"):
+            if st.button("Check Job Status Now"):
+                verification_manager.bulk_jobs.poll_once()
+                bulk_jobs = verification_manager.bulk_jobs.list_jobs()
+            
+            st.dataframe(pd.DataFrame(bulk_jobs), use_container_width=True)
+            
+            if verification_manager.bulk_jobs.has_active_jobs():
+                verification_manager.bulk_jobs.start_polling()
+    
+    # Resumable verification jobs
+    verification_jobs = job_manager.list_jobs()
+    if verification_jobs:
+        with st.expander("Verification Jobs"):
+            jobs_df = pd.DataFrame(verification_jobs)
+            st.dataframe(
+                jobs_df[['id', 'name', 'status', 'worker_id', 'completed_count', 'total_count', 'error_count', 'created_at']],
+                use_container_width=True
+            )
+            
+            resumable = [job for job in verification_jobs if job['status'] in RESUMABLE_JOB_STATUSES]
+            if resumable:
+                job_options = {
+                    f"Job {job['id']} ({job['completed_count']}/{job['total_count']}, {job['status']})": job['id']
+                    for job in resumable
+                }
+                selected_job = st.selectbox("Select Job", list(job_options.keys()))
+                job_id = job_options[selected_job]
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if st.button("Resume Job"):
+                        job_results = run_verification_job(job_id)
+                        if 'error' in job_results:
+                            st.error(f"Error: {job_results['error']}")
+                        else:
+                            st.success(f"Job {job_id} is {job_results['job']['status']}.")
+                            st.dataframe(pd.DataFrame(job_results['results']), use_container_width=True)
+                with col2:
+                    if st.button("Pause Job"):
+                        if job_manager.pause_job(job_id):
+                            st.info(f"Job {job_id} will pause after its current chunk.")
+                with col3:
+                    if st.button("Queue for Worker"):
+                        if job_manager.queue_job(job_id):
+                            st.info(f"Job {job_id} queued for the background workers.")
+            
+            finished_with_errors = [job for job in verification_jobs if job['error_count']]
+            if finished_with_errors:
+                retry_options = {f"Job {job['id']} ({job['error_count']} error(s))": job['id'] for job in finished_with_errors}
+                selected_retry = st.selectbox("Retry failed addresses of", list(retry_options.keys()))
+                if st.button("Requeue Failed Addresses"):
+                    requeued = job_manager.retry_errors(retry_options[selected_retry])
+                    st.info(f"{requeued} address(es) requeued. Resume the job to verify them again.")
 
 elif menu == "Email Lists":
     st.title("Email Lists")
@@ -397,14 +678,42 @@ elif menu == "Email Lists":
                     st.write(f"**Created:** {email_list['created_at']}")
                     st.write(f"**Updated:** {email_list['updated_at']}")
                     
-                    # Button to view entries
+                    if st.button("Verification Summary", key=f"summary_{email_list['list_id']}"):
+                        summary = list_manager.get_list_verdict_summary(email_list['list_id'])
+                        col1, col2, col3, col4 = st.columns(4)
+                        col1.metric("Valid", summary['valid'])
+                        col2.metric("Invalid", summary['invalid'])
+                        col3.metric("Unknown", summary['unknown'])
+                        col4.metric("Unverified", summary['unverified'])
+                    
+                    # Entries are shown a page at a time; the page key holds the
+                    # after_id of every page visited so far
+                    page_key = f"entries_pages_{email_list['list_id']}"
+                    email_filter = st.text_input("Filter by email", key=f"filter_{email_list['list_id']}")
                     if st.button("View Entries", key=f"view_{email_list['list_id']}"):
-                        entries = list_manager.get_list_entries(email_list['list_id'])
+                        st.session_state[page_key] = [None]
+                    
+                    pages = st.session_state.get(page_key)
+                    if pages:
+                        page = list_manager.get_list_entries_page(
+                            email_list['list_id'], after_id=pages[-1], email_contains=email_filter or None
+                        )
                         
-                        if not entries:
+                        if not page['entries']:
                             st.info("No entries in this list.")
                         else:
-                            st.dataframe(pd.DataFrame(entries), use_container_width=True)
+                            st.dataframe(pd.DataFrame(page['entries']), use_container_width=True)
+                            st.caption(f"Page {len(pages)}")
+                        
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            if len(pages) > 1 and st.button("Previous Page", key=f"prev_{email_list['list_id']}"):
+                                pages.pop()
+                                st.experimental_rerun()
+                        with col2:
+                            if page['next_after_id'] and st.button("Next Page", key=f"next_{email_list['list_id']}"):
+                                pages.append(page['next_after_id'])
+                                st.experimental_rerun()
     
     with tabs[1]:  # Create List
         st.subheader("Create New List")
@@ -468,6 +777,17 @@ elif menu == "Email Lists":
                         st.success(f"Email {email} updated in list!")
                     elif result.get('added', False):
                         st.success(f"Email {email} added to list!")
+            
+            if st.button("Remove from List"):
+                if not email:
+                    st.error("Please enter an email address.")
+                else:
+                    result = list_manager.remove_email_from_list(list_id, email)
+                    
+                    if 'error' in result:
+                        st.error(f"Error: {result['error']}")
+                    else:
+                        st.success(f"Email {email} removed from list!")
     
     with tabs[3]:  # Import/Export
         st.subheader("Import/Export Lists")
@@ -499,7 +819,7 @@ elif menu == "Email Lists":
                     
                     # Preview the file
                     try:
-                        df = pd.read_csv(tmp_path)
+                        df = pd.read_csv(tmp_path, nrows=5)
                         st.write("Preview:")
                         st.dataframe(df.head(), use_container_width=True)
                         
@@ -523,22 +843,36 @@ elif menu == "Email Lists":
             with imp_exp_tabs[1]:  # Export
                 st.write("Export the selected list to a CSV file.")
                 
+                compress_list_export = st.checkbox("Compress (gzip)", key="list_export_gzip")
+                
                 if st.button("Generate Export"):
-                    entries = list_manager.get_list_entries(list_id)
-                    
-                    if not entries:
-                        st.info("No entries to export in this list.")
-                    else:
-                        df = pd.DataFrame(entries)
-                        csv = df.to_csv(index=False)
+                    # Stream the list into a file on disk and serve the download from it
+                    suffix = '.csv.gz' if compress_list_export else '.csv'
+                    handle, export_path = tempfile.mkstemp(suffix=suffix)
+                    os.close(handle)
+                    try:
+                        result = list_manager.export_to_csv(list_id, export_path, compress=compress_list_export)
                         
-                        st.download_button(
-                            "Download CSV",
-                            csv,
-                            f"{selected_list.replace(' ', '_')}_export.csv",
-                            "text/csv",
-                            key="download-list-csv"
-                        )
+                        if not result.get('exported'):
+                            st.info("No entries to export in this list.")
+                        else:
+                            st.caption(
+                                f"Exported {result['exported']:,} entries in {result['seconds']:.1f}s "
+                                f"({result['rows_per_second']:,.0f} rows/s)."
+                            )
+                            offer_download(
+                                export_path,
+                                f"{selected_list.replace(' ', '_')}_export{suffix}",
+                                "application/gzip" if compress_list_export else "text/csv",
+                                "Download CSV",
+                                "download-list-csv"
+                            )
+                    finally:
+                        # Clean up
+                        try:
+                            os.unlink(export_path)
+                        except OSError:
+                            pass
 
 elif menu == "API Keys":
     st.title("API Keys Configuration")
@@ -719,4 +1053,5 @@ if __name__ == "__main__":
 headless = true
 address = "0.0.0.0"
 port = 5000
+enableStaticServing = true
             """)
\ No newline at end of file
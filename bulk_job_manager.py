@@ -0,0 +1,324 @@
+"""
+Bulk Job Manager
+
+This module drives vendor bulk-verification jobs (ZeroBounce, Hunter.io):
+emails are streamed into a CSV upload, the vendor job id is persisted in the
+vendor_bulk_jobs table, jobs are polled in the background with exponential
+backoff, and completed result files are streamed back into the database.
+Each due job is claimed with a conditional update before it is touched, so
+several processes can poll side by side, and result files are imported in
+chunks that commit together with an import cursor, so a failed download
+resumes where it stopped instead of storing the same results twice.
+"""
+import os
+import logging
+import itertools
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable
+
+from database import VendorBulkJob, engine, get_db
+from verification_writer import VerificationWriteBuffer
+
+logger = logging.getLogger(__name__)
+
+# Polling backoff: first poll after INITIAL, doubling up to MAX
+BULK_POLL_INITIAL_DELAY = float(os.getenv("BULK_POLL_INITIAL_DELAY", "30"))
+BULK_POLL_MAX_DELAY = float(os.getenv("BULK_POLL_MAX_DELAY", "900"))
+# How often the background poller looks for jobs that are due
+BULK_POLL_TICK = float(os.getenv("BULK_POLL_TICK", "5"))
+# Give up on a job after this many polls
+BULK_POLL_MAX_ATTEMPTS = int(os.getenv("BULK_POLL_MAX_ATTEMPTS", "200"))
+# Give up on importing a result file after this many failed downloads
+BULK_IMPORT_MAX_ATTEMPTS = int(os.getenv("BULK_IMPORT_MAX_ATTEMPTS", "5"))
+# Result rows committed per import transaction
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "1000"))
+# How long a claimed job is hidden from other pollers; renewed with every import chunk
+BULK_CLAIM_SECONDS = float(os.getenv("BULK_CLAIM_SECONDS", "300"))
+
+ACTIVE_STATUSES = ("submitted", "processing", "importing")
+
+
+class BulkJobManager:
+    """Manager class for vendor bulk-verification jobs."""
+    
+    # Shared across instances so app reruns don't start duplicate pollers
+    _poller: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+    _poll_lock = threading.Lock()
+    
+    def __init__(self, services: Dict[str, Any], writer: Optional[VerificationWriteBuffer] = None):
+        """
+        Initialize the bulk job manager.
+        
+        Args:
+            services: Mapping of provider name to service instance
+            writer: Buffer used to store downloaded results (optional)
+        """
+        self.services = services
+        self.writer = writer or VerificationWriteBuffer()
+    
+    def get_bulk_services(self) -> List[str]:
+        """Get the configured providers that support vendor bulk jobs."""
+        return [
+            name for name, service in self.services.items()
+            if getattr(service, 'supports_bulk_jobs', False) and getattr(service, 'api_key', None)
+        ]
+    
+    def submit_job(self, service_name: str, emails: Iterable[str]) -> Dict[str, Any]:
+        """
+        Upload emails to a provider's bulk API and record the job.
+        
+        Args:
+            service_name: The provider to use
+            emails: Email addresses to verify (consumed lazily)
+        
+        Returns:
+            Dict with the stored job information
+        """
+        if service_name not in self.get_bulk_services():
+            return {"error": f"Service '{service_name}' does not support bulk jobs or is not configured"}
+        
+        service = self.services[service_name]
+        submission = service.bulk_verify(emails)
+        if "error" in submission:
+            return submission
+        
+        try:
+            session = next(get_db())
+            
+            job = VendorBulkJob(
+                provider=service_name,
+                vendor_job_id=str(submission["job_id"]),
+                status="submitted",
+                email_count=submission.get("email_count", 0),
+                next_poll_at=datetime.utcnow() + timedelta(seconds=BULK_POLL_INITIAL_DELAY)
+            )
+            
+            session.add(job)
+            session.commit()
+            job_info = job.to_dict()
+            session.close()
+        except Exception as e:
+            logger.error(f"Error recording bulk job: {str(e)}")
+            return {"error": str(e), "vendor_job_id": submission.get("job_id")}
+        
+        self.start_polling()
+        return job_info
+    
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a bulk job by its database ID."""
+        session = next(get_db())
+        try:
+            job = session.query(VendorBulkJob).filter(VendorBulkJob.id == job_id).first()
+            return job.to_dict() if job else None
+        finally:
+            session.close()
+    
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent bulk jobs."""
+        results = []
+        try:
+            session = next(get_db())
+            jobs = session.query(VendorBulkJob).order_by(
+                VendorBulkJob.created_at.desc()
+            ).limit(limit).all()
+            results = [job.to_dict() for job in jobs]
+            session.close()
+        except Exception as e:
+            logger.error(f"Error listing bulk jobs: {str(e)}")
+        
+        return results
+    
+    def poll_once(self) -> int:
+        """
+        Poll every active job that is due and import finished result files.
+        
+        Jobs claimed by another process in the meantime are skipped.
+        
+        Returns:
+            Number of jobs polled
+        """
+        with self._poll_lock:
+            session = next(get_db())
+            try:
+                due_ids = [job_id for (job_id,) in session.query(VendorBulkJob.id).filter(
+                    VendorBulkJob.status.in_(ACTIVE_STATUSES),
+                    VendorBulkJob.next_poll_at <= datetime.utcnow()
+                ).all()]
+                
+                polled = 0
+                for job_id in due_ids:
+                    if not self._claim_job(session, job_id):
+                        continue
+                    job = session.query(VendorBulkJob).filter(VendorBulkJob.id == job_id).first()
+                    self._poll_job(session, job)
+                    session.commit()
+                    polled += 1
+                
+                return polled
+            except Exception as e:
+                logger.error(f"Error polling bulk jobs: {str(e)}")
+                session.rollback()
+                return 0
+            finally:
+                session.close()
+    
+    def has_active_jobs(self) -> bool:
+        """Whether any job is still waiting on the vendor."""
+        session = next(get_db())
+        try:
+            return session.query(VendorBulkJob).filter(
+                VendorBulkJob.status.in_(ACTIVE_STATUSES)
+            ).first() is not None
+        finally:
+            session.close()
+    
+    def start_polling(self) -> None:
+        """Start the background poller if it is not already running."""
+        cls = type(self)
+        if cls._poller is not None and cls._poller.is_alive():
+            return
+        
+        cls._stop_event.clear()
+        cls._poller = threading.Thread(target=self._run_poller, name="bulk-job-poller", daemon=True)
+        cls._poller.start()
+    
+    def stop_polling(self) -> None:
+        """Stop the background poller."""
+        cls = type(self)
+        cls._stop_event.set()
+        if cls._poller is not None:
+            cls._poller.join(timeout=BULK_POLL_TICK * 2)
+    
+    def _run_poller(self) -> None:
+        """Poll due jobs until none are left active or the poller is stopped."""
+        while not self._stop_event.is_set():
+            self.poll_once()
+            try:
+                if not self.has_active_jobs():
+                    return
+            except Exception as e:
+                logger.error(f"Error checking for active bulk jobs: {str(e)}")
+            self._stop_event.wait(BULK_POLL_TICK)
+    
+    def _claim_job(self, session, job_id: int) -> bool:
+        """
+        Claim a due job for this process.
+        
+        The conditional update pushes next_poll_at past the claim period, so
+        only one poller (in any process) sees the job as due and gets a row
+        back; if the claimant dies, the job becomes due again afterwards.
+        """
+        now = datetime.utcnow()
+        claimed = session.query(VendorBulkJob).filter(
+            VendorBulkJob.id == job_id,
+            VendorBulkJob.status.in_(ACTIVE_STATUSES),
+            VendorBulkJob.next_poll_at <= now
+        ).update(
+            {VendorBulkJob.next_poll_at: now + timedelta(seconds=BULK_CLAIM_SECONDS)},
+            synchronize_session=False
+        )
+        session.commit()
+        return claimed == 1
+    
+    def _poll_job(self, session, job: VendorBulkJob) -> None:
+        """Check one job's status and advance it."""
+        service = self.services.get(job.provider)
+        if service is None:
+            job.status = "failed"
+            job.error = f"Unknown provider '{job.provider}'"
+            return
+        
+        if job.status == "importing":
+            # The vendor already finished; resume the interrupted import
+            self._import_results(session, service, job)
+            return
+        
+        job.poll_attempts = (job.poll_attempts or 0) + 1
+        status = service.get_bulk_job_status(job.vendor_job_id)
+        
+        if "error" in status or status.get("status") == "processing":
+            if "error" in status:
+                logger.warning(f"Error polling {job.provider} bulk job {job.vendor_job_id}: {status['error']}")
+            else:
+                job.status = "processing"
+                job.progress = status.get("progress")
+            
+            if job.poll_attempts >= BULK_POLL_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.error = status.get("error") or "Gave up waiting for the vendor"
+                return
+            
+            delay = min(BULK_POLL_INITIAL_DELAY * (2 ** job.poll_attempts), BULK_POLL_MAX_DELAY)
+            job.next_poll_at = datetime.utcnow() + timedelta(seconds=delay)
+            return
+        
+        if status.get("status") == "failed":
+            job.status = "failed"
+            job.error = str(status.get("details") or "Vendor reported failure")
+            return
+        
+        job.status = "importing"
+        job.imported_count = 0
+        job.import_attempts = 0
+        self._import_results(session, service, job)
+    
+    def _import_results(self, session, service, job: VendorBulkJob) -> None:
+        """
+        Stream a completed job's result file into the database.
+        
+        Results are stored in chunks, each committed together with the job's
+        imported_count, and a retried download skips the rows already stored
+        (the vendor's result file does not change once the job is done).
+        After BULK_IMPORT_MAX_ATTEMPTS failed downloads the job is failed.
+        """
+        job.import_attempts = (job.import_attempts or 0) + 1
+        session.commit()
+        
+        imported = job.imported_count or 0
+        try:
+            results = itertools.islice(service.iter_bulk_results(job.vendor_job_id), imported, None)
+            while True:
+                chunk = list(itertools.islice(results, BULK_IMPORT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                imported = self._import_chunk(job.id, chunk, imported)
+        except Exception as e:
+            logger.error(f"Error downloading results for {job.provider} bulk job {job.vendor_job_id} "
+                         f"(attempt {job.import_attempts}, {imported} rows stored): {str(e)}")
+            job.imported_count = imported
+            job.error = str(e)
+            if job.import_attempts >= BULK_IMPORT_MAX_ATTEMPTS:
+                job.status = "failed"
+                return
+            # Retry the download with backoff; the next attempt resumes after the stored rows
+            delay = min(BULK_POLL_INITIAL_DELAY * (2 ** job.import_attempts), BULK_POLL_MAX_DELAY)
+            job.next_poll_at = datetime.utcnow() + timedelta(seconds=delay)
+            return
+        
+        job.status = "completed"
+        job.progress = 1.0
+        job.imported_count = imported
+        job.result_count = imported
+        job.error = None
+        job.completed_at = datetime.utcnow()
+        logger.info(f"Imported {imported} results for {job.provider} bulk job {job.vendor_job_id}")
+    
+    def _import_chunk(self, job_id: int, results: List[Dict[str, Any]], imported: int) -> int:
+        """
+        Store a chunk of results and advance the job's import cursor in one transaction.
+        
+        Returns:
+            The new number of imported rows
+        """
+        table = VendorBulkJob.__table__
+        with engine.begin() as connection:
+            rows = self.writer.write_now(results, connection)
+            connection.execute(table.update().where(table.c.id == job_id).values(
+                imported_count=imported + len(results),
+                # Renew the claim while the import makes progress
+                next_poll_at=datetime.utcnow() + timedelta(seconds=BULK_CLAIM_SECONDS)
+            ))
+        self.writer.update_latest(rows)
+        return imported + len(results)
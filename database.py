@@ -1,8 +1,19 @@
 """
 Database models and connection module for email verification system.
+
+Schema changes are versioned migrations (see MIGRATIONS), applied explicitly
+once per deploy, before the app and workers start:
+
+    python database.py migrate    # create missing tables, apply pending migrations
+    python database.py status     # list migrations and when they were applied
+
+init_db (called by the app and workers at startup) never migrates: it creates
+missing tables and refuses to continue while migrations are pending.
 """
 import os
+import time
 import logging
+import argparse
 from datetime import datetime
 import json
 import sys
@@ -22,6 +33,11 @@ load_dotenv(os.path.join('config', '.env'))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per transaction when a migration backfills a column
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+# PostgreSQL advisory lock key held while migrating
+MIGRATION_LOCK_KEY = 7341026
+
 # Wrap your entire module code in a try/except block
 try:
     # Extremely defensive database setup
@@ -60,6 +76,8 @@ try:
         # Custom JSON type that works with both PostgreSQL and SQLite
         class JSONB(types.TypeDecorator):
             impl = types.String
+            # Stateless, so statements using it can be cached
+            cache_ok = True
             
             def load_dialect_impl(self, dialect):
                 if dialect.name == 'postgresql':
@@ -100,7 +118,8 @@ try:
             __tablename__ = "email_verification"
             
             id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
-            email = sqlalchemy.Column(sqlalchemy.String(255), nullable=False, index=True)
+            # Indexed by VERIFICATION_EMAIL_DATE_INDEX
+            email = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
             is_valid = sqlalchemy.Column(sqlalchemy.Boolean)
             score = sqlalchemy.Column(sqlalchemy.Float)
             provider = sqlalchemy.Column(sqlalchemy.String(50), nullable=False)
@@ -121,12 +140,185 @@ try:
                     'details': self.details
                 }
 
+        class EmailVerdictLatest(Base):
+            __tablename__ = "email_verdict_latest"
+            
+            # dedupe_key of the address (normalized, lowercased)
+            email_key = sqlalchemy.Column(sqlalchemy.String(255), primary_key=True)
+            email = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+            is_valid = sqlalchemy.Column(sqlalchemy.Boolean)
+            score = sqlalchemy.Column(sqlalchemy.Float)
+            provider_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+            # {provider: {"is_valid", "score", "details", "verified_at"}}, latest result per provider
+            providers = sqlalchemy.Column(JSONB)
+            last_verified_at = sqlalchemy.Column(sqlalchemy.DateTime, index=True)
+            
+            def __repr__(self):
+                return f"<EmailVerdictLatest(email='{self.email}', is_valid={self.is_valid})>"
+            
+            def to_dict(self):
+                return {
+                    'email': self.email,
+                    'is_valid': self.is_valid,
+                    'score': self.score,
+                    'provider_count': self.provider_count,
+                    'providers': self.providers,
+                    'last_verified_at': self.last_verified_at.isoformat() if self.last_verified_at else None
+                }
+
+        class VendorBulkJob(Base):
+            __tablename__ = "vendor_bulk_jobs"
+            
+            id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
+            provider = sqlalchemy.Column(sqlalchemy.String(50), nullable=False)
+            vendor_job_id = sqlalchemy.Column(sqlalchemy.String(255), index=True)
+            status = sqlalchemy.Column(sqlalchemy.String(20), nullable=False, default="submitted", index=True)
+            email_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            result_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            # Result rows already stored; an interrupted import resumes after them
+            imported_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            import_attempts = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            progress = sqlalchemy.Column(sqlalchemy.Float)
+            poll_attempts = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            next_poll_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
+            error = sqlalchemy.Column(sqlalchemy.Text)
+            created_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
+            updated_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+            completed_at = sqlalchemy.Column(sqlalchemy.DateTime)
+            
+            def __repr__(self):
+                return f"<VendorBulkJob(provider='{self.provider}', vendor_job_id='{self.vendor_job_id}', status='{self.status}')>"
+            
+            def to_dict(self):
+                return {
+                    'id': self.id,
+                    'provider': self.provider,
+                    'vendor_job_id': self.vendor_job_id,
+                    'status': self.status,
+                    'email_count': self.email_count,
+                    'result_count': self.result_count,
+                    'imported_count': self.imported_count,
+                    'progress': self.progress,
+                    'poll_attempts': self.poll_attempts,
+                    'error': self.error,
+                    'created_at': self.created_at.isoformat() if self.created_at else None,
+                    'completed_at': self.completed_at.isoformat() if self.completed_at else None
+                }
+
+        class VerificationJob(Base):
+            __tablename__ = "verification_jobs"
+            
+            id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
+            name = sqlalchemy.Column(sqlalchemy.String(100))
+            service_name = sqlalchemy.Column(sqlalchemy.String(50))
+            routing = sqlalchemy.Column(sqlalchemy.String(20))
+            status = sqlalchemy.Column(sqlalchemy.String(20), nullable=False, default="pending", index=True)
+            total_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            completed_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            error_count = sqlalchemy.Column(sqlalchemy.Integer, default=0)
+            preprocessing = sqlalchemy.Column(JSONB)
+            error = sqlalchemy.Column(sqlalchemy.Text)
+            worker_id = sqlalchemy.Column(sqlalchemy.String(100))
+            lease_expires_at = sqlalchemy.Column(sqlalchemy.DateTime)
+            created_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
+            updated_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+            started_at = sqlalchemy.Column(sqlalchemy.DateTime)
+            completed_at = sqlalchemy.Column(sqlalchemy.DateTime)
+            
+            items = relationship("VerificationJobItem", back_populates="job", cascade="all, delete-orphan")
+            
+            def __repr__(self):
+                return f"<VerificationJob(id={self.id}, status='{self.status}', completed={self.completed_count}/{self.total_count})>"
+            
+            def to_dict(self):
+                return {
+                    'id': self.id,
+                    'name': self.name,
+                    'service_name': self.service_name,
+                    'routing': self.routing,
+                    'status': self.status,
+                    'total_count': self.total_count,
+                    'completed_count': self.completed_count,
+                    'error_count': self.error_count,
+                    'progress': (self.completed_count or 0) / self.total_count if self.total_count else 1.0,
+                    'preprocessing': self.preprocessing,
+                    'error': self.error,
+                    'worker_id': self.worker_id,
+                    'created_at': self.created_at.isoformat() if self.created_at else None,
+                    'started_at': self.started_at.isoformat() if self.started_at else None,
+                    'completed_at': self.completed_at.isoformat() if self.completed_at else None
+                }
+
+        class VerificationJobItem(Base):
+            __tablename__ = "verification_job_items"
+            __table_args__ = (
+                sqlalchemy.Index("ix_verification_job_items_job_status", "job_id", "status", "position"),
+            )
+            
+            id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
+            job_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey("verification_jobs.id", ondelete="CASCADE"), nullable=False)
+            position = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+            email = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+            status = sqlalchemy.Column(sqlalchemy.String(20), nullable=False, default="pending")
+            is_valid = sqlalchemy.Column(sqlalchemy.Boolean)
+            score = sqlalchemy.Column(sqlalchemy.Float)
+            provider = sqlalchemy.Column(sqlalchemy.String(50))
+            result = sqlalchemy.Column(JSONB)
+            processed_at = sqlalchemy.Column(sqlalchemy.DateTime)
+            
+            job = relationship("VerificationJob", back_populates="items")
+            
+            def __repr__(self):
+                return f"<VerificationJobItem(email='{self.email}', status='{self.status}')>"
+            
+            def to_dict(self):
+                return {
+                    'position': self.position,
+                    'email': self.email,
+                    'status': self.status,
+                    'is_valid': self.is_valid,
+                    'score': self.score,
+                    'provider': self.provider,
+                    'result': self.result,
+                    'processed_at': self.processed_at.isoformat() if self.processed_at else None
+                }
+
+        class DomainVerdict(Base):
+            __tablename__ = "domain_verdicts"
+            
+            id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
+            domain = sqlalchemy.Column(sqlalchemy.String(255), unique=True, nullable=False, index=True)
+            exists = sqlalchemy.Column(sqlalchemy.Boolean)
+            has_mx = sqlalchemy.Column(sqlalchemy.Boolean)
+            has_a = sqlalchemy.Column(sqlalchemy.Boolean)
+            is_disposable = sqlalchemy.Column(sqlalchemy.Boolean)
+            is_catch_all = sqlalchemy.Column(sqlalchemy.Boolean)
+            source = sqlalchemy.Column(sqlalchemy.String(20))
+            checked_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
+            
+            def __repr__(self):
+                return f"<DomainVerdict(domain='{self.domain}', has_mx={self.has_mx})>"
+            
+            def to_dict(self):
+                return {
+                    'domain': self.domain,
+                    'exists': self.exists,
+                    'has_mx': self.has_mx,
+                    'has_a': self.has_a,
+                    'is_disposable': self.is_disposable,
+                    'is_catch_all': self.is_catch_all,
+                    'source': self.source,
+                    'checked_at': self.checked_at.isoformat() if self.checked_at else None
+                }
+
         class EmailList(Base):
             __tablename__ = "email_lists"
             
             id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, index=True)
             name = sqlalchemy.Column(sqlalchemy.String(100), nullable=False)
             description = sqlalchemy.Column(sqlalchemy.Text)
+            # Maintained by EmailListManager on every add/import/remove
+            entry_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0, server_default="0")
             created_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
             updated_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
             
@@ -152,6 +344,48 @@ try:
             def __repr__(self):
                 return f"<EmailListEntry(email='{self.email}')>"
 
+        class SchemaMigration(Base):
+            __tablename__ = "schema_migrations"
+            
+            version = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True, autoincrement=False)
+            name = sqlalchemy.Column(sqlalchemy.String(100), nullable=False)
+            applied_at = sqlalchemy.Column(sqlalchemy.DateTime, default=datetime.utcnow)
+            duration_seconds = sqlalchemy.Column(sqlalchemy.Float)
+            
+            def __repr__(self):
+                return f"<SchemaMigration(version={self.version}, name='{self.name}')>"
+
+        # An address's history, newest first (also serves plain lookups by email)
+        VERIFICATION_EMAIL_DATE_INDEX = sqlalchemy.Index(
+            "ix_email_verification_email_date",
+            EmailVerification.email,
+            EmailVerification.verification_date.desc()
+        )
+        # Per-provider analytics over a date range
+        VERIFICATION_PROVIDER_DATE_INDEX = sqlalchemy.Index(
+            "ix_email_verification_provider_date",
+            EmailVerification.provider,
+            EmailVerification.verification_date
+        )
+        # Retention deletes and rollover select rows by date alone
+        VERIFICATION_DATE_INDEX = sqlalchemy.Index(
+            "ix_email_verification_date",
+            EmailVerification.verification_date
+        )
+        # One entry per address per list; addresses are matched case-insensitively
+        LIST_ENTRY_UNIQUE_INDEX = sqlalchemy.Index(
+            "uq_email_list_entries_list_email",
+            EmailListEntry.list_id,
+            sqlalchemy.func.lower(EmailListEntry.email),
+            unique=True
+        )
+        # Keyset pagination of a list's entries in ID order
+        LIST_ENTRY_PAGE_INDEX = sqlalchemy.Index(
+            "ix_email_list_entries_list_id_id",
+            EmailListEntry.list_id,
+            EmailListEntry.id
+        )
+
         # Database functions
         def get_db():
             """Get database session."""
@@ -161,14 +395,316 @@ try:
             finally:
                 db.close()
 
+        def _index_exists(connection, name):
+            """Whether an index exists (expression indexes are not reflected on SQLite)."""
+            if connection.dialect.name == "postgresql":
+                query = "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+            else:
+                query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+            return connection.execute(sqlalchemy.text(query), {"name": name}).first() is not None
+
+        def create_index_online(connection, index):
+            """
+            Create an index unless it already exists.
+            
+            On PostgreSQL, with an autocommit connection (online migrations),
+            the index is built CONCURRENTLY so writes to the table are not
+            blocked; an invalid index left by an interrupted build is dropped
+            and rebuilt. Partitioned tables do not support concurrent builds and
+            get a regular CREATE INDEX.
+            
+            Args:
+                connection: Connection to create the index with
+                index: The sqlalchemy.Index to create
+            """
+            if connection.dialect.name != "postgresql":
+                if not _index_exists(connection, index.name):
+                    index.create(connection)
+                return
+            
+            valid = connection.execute(sqlalchemy.text(
+                "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ), {"name": index.name}).scalar()
+            if valid:
+                return
+            
+            concurrently = _can_index_concurrently(connection, index.table.name)
+            if valid is not None:
+                # Left behind by an interrupted concurrent build
+                logger.info(f"Rebuilding invalid index {index.name}.")
+                drop_index_online(connection, index.name, index.table.name)
+            
+            options = index.dialect_options["postgresql"]
+            options["concurrently"] = concurrently
+            try:
+                index.create(connection)
+            finally:
+                options["concurrently"] = False
+
+        def drop_index_online(connection, name, table_name):
+            """
+            Drop an index if it exists.
+            
+            On PostgreSQL, with an autocommit connection (online migrations),
+            the index is dropped CONCURRENTLY so the table is not locked
+            against reads and writes while it goes.
+            
+            Args:
+                connection: Connection to drop the index with
+                name: Name of the index
+                table_name: Table the index belongs to
+            """
+            concurrently = connection.dialect.name == "postgresql" and _can_index_concurrently(connection, table_name)
+            connection.execute(sqlalchemy.text(
+                f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}"
+            ))
+
+        def _can_index_concurrently(connection, table_name):
+            """Whether CONCURRENTLY can be used: an autocommit connection and a table that is not partitioned."""
+            if connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+                return False
+            partitioned = connection.execute(sqlalchemy.text(
+                "SELECT relkind = 'p' FROM pg_class WHERE relname = :name AND pg_table_is_visible(oid)"
+            ), {"name": table_name}).scalar()
+            return not partitioned
+
+        def backfill_in_batches(connection, table, values, batch_size=None):
+            """
+            Run UPDATE table SET values over consecutive id ranges.
+            
+            Used by online migrations: on their autocommit connection every
+            batch is its own short transaction, so backfilling a large table
+            never holds row locks on all of it at once.
+            
+            Args:
+                connection: Connection to run the updates on
+                table: Table to update (must have an integer id column)
+                values: Column values for the UPDATE (may be SQL expressions)
+                batch_size: Rows per batch (default: MIGRATION_BATCH_SIZE)
+                
+            Returns:
+                Number of rows updated
+            """
+            low, high = connection.execute(
+                sqlalchemy.select(sqlalchemy.func.min(table.c.id), sqlalchemy.func.max(table.c.id))
+            ).first()
+            if low is None:
+                return 0
+            
+            updated = 0
+            batch_size = batch_size or MIGRATION_BATCH_SIZE
+            for start in range(low, high + 1, batch_size):
+                updated += connection.execute(
+                    table.update().where(table.c.id >= start, table.c.id < start + batch_size).values(values)
+                ).rowcount
+            return updated
+
+        def _upgrade_job_lease_columns(connection):
+            """Add the background worker lease columns to existing verification_jobs tables."""
+            columns = {column["name"] for column in sqlalchemy.inspect(connection).get_columns("verification_jobs")}
+            if "worker_id" not in columns:
+                connection.execute(sqlalchemy.text("ALTER TABLE verification_jobs ADD COLUMN worker_id VARCHAR(100)"))
+            if "lease_expires_at" not in columns:
+                connection.execute(sqlalchemy.text("ALTER TABLE verification_jobs ADD COLUMN lease_expires_at TIMESTAMP"))
+
+        def _upgrade_list_entry_unique_index(connection):
+            """Drop duplicate list entries (keeping the oldest) and add the unique membership index."""
+            removed = connection.execute(sqlalchemy.text(
+                "DELETE FROM email_list_entries WHERE id NOT IN "
+                "(SELECT MIN(id) FROM email_list_entries GROUP BY list_id, lower(email))"
+            )).rowcount
+            if removed:
+                logger.info(f"Removed {removed} duplicate list entries.")
+            create_index_online(connection, LIST_ENTRY_UNIQUE_INDEX)
+
+        def _upgrade_list_entry_counts(connection):
+            """Add the maintained entry_count column to existing email_lists tables and backfill it."""
+            columns = {column["name"] for column in sqlalchemy.inspect(connection).get_columns("email_lists")}
+            if "entry_count" not in columns:
+                connection.execute(sqlalchemy.text("ALTER TABLE email_lists ADD COLUMN entry_count INTEGER NOT NULL DEFAULT 0"))
+            lists = EmailList.__table__
+            entries = EmailListEntry.__table__
+            backfill_in_batches(connection, lists, {
+                "entry_count": sqlalchemy.select(sqlalchemy.func.count(entries.c.id))
+                .where(entries.c.list_id == lists.c.id).scalar_subquery()
+            })
+
+        def _upgrade_list_entry_page_index(connection):
+            """Add the (list_id, id) index used to page through list entries."""
+            create_index_online(connection, LIST_ENTRY_PAGE_INDEX)
+
+        def _upgrade_verification_history_indexes(connection):
+            """Add the composite history indexes and drop the email index they make redundant."""
+            for index in (VERIFICATION_EMAIL_DATE_INDEX, VERIFICATION_PROVIDER_DATE_INDEX):
+                create_index_online(connection, index)
+            drop_index_online(connection, "ix_email_verification_email", EmailVerification.__tablename__)
+
+        def _upgrade_backfill_latest_verdicts(connection):
+            """Flag an empty email_verdict_latest next to existing history; the backfill is a separate maintenance step."""
+            has_latest = connection.execute(sqlalchemy.text("SELECT 1 FROM email_verdict_latest LIMIT 1")).first()
+            has_history = connection.execute(sqlalchemy.text("SELECT 1 FROM email_verification LIMIT 1")).first()
+            if has_history and not has_latest:
+                logger.warning(
+                    "email_verdict_latest is empty but verification history exists; "
+                    "backfill it with: python latest_verdicts.py rebuild"
+                )
+
+        def _upgrade_bulk_job_import_columns(connection):
+            """Add the import cursor columns to existing vendor_bulk_jobs tables."""
+            columns = {column["name"] for column in sqlalchemy.inspect(connection).get_columns("vendor_bulk_jobs")}
+            for name in ("imported_count", "import_attempts"):
+                if name not in columns:
+                    connection.execute(sqlalchemy.text(f"ALTER TABLE vendor_bulk_jobs ADD COLUMN {name} INTEGER DEFAULT 0"))
+
+        def _upgrade_verification_date_index(connection):
+            """Add the verification_date index used by history retention and rollover."""
+            create_index_online(connection, VERIFICATION_DATE_INDEX)
+
+        class Migration:
+            """
+            A versioned schema change.
+            
+            Regular migrations run in one transaction. Online migrations run on
+            an autocommit connection, so they can build indexes concurrently and
+            backfill in short batches; they must be safe to re-run, since a
+            failure part-way leaves earlier statements committed.
+            """
+            
+            def __init__(self, version, upgrade, online=False):
+                self.version = version
+                self.upgrade = upgrade
+                self.online = online
+                self.name = upgrade.__name__.replace("_upgrade_", "", 1)
+            
+            def __repr__(self):
+                return f"<Migration(version={self.version}, name='{self.name}')>"
+
+        # Applied in version order, each exactly once per database (recorded in
+        # schema_migrations). Versions are permanent: append new migrations,
+        # never renumber or remove applied ones.
+        MIGRATIONS = [
+            Migration(1, _upgrade_job_lease_columns),
+            Migration(2, _upgrade_list_entry_unique_index, online=True),
+            Migration(3, _upgrade_list_entry_counts, online=True),
+            Migration(4, _upgrade_list_entry_page_index, online=True),
+            Migration(5, _upgrade_verification_history_indexes, online=True),
+            Migration(6, _upgrade_backfill_latest_verdicts, online=True),
+            Migration(7, _upgrade_bulk_job_import_columns),
+            Migration(8, _upgrade_verification_date_index, online=True)
+        ]
+
+        def _applied_migrations(connection):
+            """Map applied migration versions to their schema_migrations rows."""
+            table = SchemaMigration.__table__
+            if not sqlalchemy.inspect(connection).has_table(table.name):
+                return {}
+            return {row.version: row for row in connection.execute(sqlalchemy.select(table))}
+
+        def migration_status():
+            """
+            List every known migration and whether it has been applied.
+            
+            Returns:
+                List of dicts with version, name and applied_at (None if pending)
+            """
+            with engine.connect() as connection:
+                applied = _applied_migrations(connection)
+            return [
+                {
+                    "version": migration.version,
+                    "name": migration.name,
+                    "applied_at": applied[migration.version].applied_at.isoformat() if migration.version in applied else None
+                }
+                for migration in MIGRATIONS
+            ]
+
+        def _record_migration(connection, migration, duration_seconds):
+            """Mark a migration as applied in schema_migrations."""
+            connection.execute(SchemaMigration.__table__.insert().values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.utcnow(),
+                duration_seconds=duration_seconds
+            ))
+
+        def migrate():
+            """
+            Apply the pending migrations in version order.
+            
+            Stops at the first failure, since later migrations may depend on
+            it. On PostgreSQL an advisory lock keeps concurrently starting
+            processes (app, workers) from migrating at the same time.
+            
+            Returns:
+                True if every migration has been applied
+            """
+            SchemaMigration.__table__.create(engine, checkfirst=True)
+            autocommit_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+            
+            # Autocommit, so the lock session holds no snapshot a concurrent index build would wait on
+            with autocommit_engine.connect() as lock:
+                if engine.dialect.name == "postgresql":
+                    lock.execute(sqlalchemy.text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                try:
+                    applied = _applied_migrations(lock)
+                    for migration in MIGRATIONS:
+                        if migration.version in applied:
+                            continue
+                        
+                        started = time.monotonic()
+                        try:
+                            if migration.online:
+                                with autocommit_engine.connect() as connection:
+                                    migration.upgrade(connection)
+                            else:
+                                with engine.begin() as connection:
+                                    migration.upgrade(connection)
+                        except Exception as e:
+                            logger.error(f"Error applying migration {migration.version} ({migration.name}): {str(e)}")
+                            return False
+                        
+                        with engine.begin() as connection:
+                            _record_migration(connection, migration, time.monotonic() - started)
+                        logger.info(f"Applied migration {migration.version} ({migration.name}).")
+                    return True
+                finally:
+                    if engine.dialect.name == "postgresql":
+                        lock.execute(sqlalchemy.text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
         def init_db():
-            """Initialize the database."""
+            """
+            Create missing tables and check that the schema is current.
+            
+            Migrations are not applied here (see migrate). A brand-new database
+            is created at the current schema, so every migration is recorded
+            as applied.
+            
+            Raises:
+                RuntimeError: If migrations are pending
+            """
             try:
+                with engine.connect() as connection:
+                    fresh = not sqlalchemy.inspect(connection).get_table_names()
                 # Create all tables
                 Base.metadata.create_all(bind=engine)
+                if fresh:
+                    with engine.begin() as connection:
+                        for migration in MIGRATIONS:
+                            _record_migration(connection, migration, 0.0)
                 logger.info("Database tables created successfully.")
             except Exception as e:
                 logger.error(f"Error creating database tables: {str(e)}")
+            
+            pending = [migration for migration in migration_status() if migration["applied_at"] is None]
+            if pending:
+                message = (
+                    f"Database schema is out of date, {len(pending)} migration(s) pending "
+                    f"({', '.join(str(migration['version']) for migration in pending)}); "
+                    f"run: python database.py migrate"
+                )
+                logger.error(message)
+                raise RuntimeError(message)
 
         def add_default_services():
             """Add default verification services to the database."""
@@ -222,10 +758,30 @@ try:
             except Exception as e:
                 logger.error(f"Error adding default services: {str(e)}")
 
-        # Initialize the database on import
-        if __name__ == "__main__":
+        def main(argv=None):
+            parser = argparse.ArgumentParser(description="Manage the email verification database schema.")
+            parser.add_argument("command", nargs="?", default="init", choices=["init", "migrate", "status"],
+                                help="init: create tables, check the schema is current and add the default services (default); "
+                                     "migrate: create tables and apply pending migrations; "
+                                     "status: list migrations")
+            args = parser.parse_args(argv)
+            
+            if args.command == "status":
+                for migration in migration_status():
+                    print(f"{migration['version']:>4}  {migration['name']:<40} {migration['applied_at'] or 'pending'}")
+                return 0
+            
+            if args.command == "migrate":
+                Base.metadata.create_all(bind=engine)
+                return 0 if migrate() else 1
+            
             init_db()
             add_default_services()
+            return 0
+
+        # Initialize the database on import
+        if __name__ == "__main__":
+            sys.exit(main())
     except Exception as e:
         print(f"Critical database setup error: {str(e)}")
         traceback.print_exc()
@@ -0,0 +1,425 @@
+"""
+Domain Intelligence
+
+This module resolves and remembers per-domain facts (MX/A records, disposable,
+catch-all) so they are learned once per domain instead of once per address.
+Lookups go through a TTL cache in front of a pluggable DNS resolver, verdicts
+are persisted in the domain_verdicts table, and addresses on domains that
+cannot receive mail are answered locally without calling any provider.
+"""
+import os
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from database import DomainVerdict, get_db
+
+try:
+    import dns.resolver
+    import dns.exception
+except ImportError:
+    dns = None
+
+logger = logging.getLogger(__name__)
+
+# Set to "false" to disable DNS checks and domain short-circuiting entirely
+DOMAIN_CHECKS_ENABLED = os.getenv("DOMAIN_CHECKS_ENABLED", "true").lower() != "false"
+
+DEFAULT_DNS_TIMEOUT = float(os.getenv("DOMAIN_DNS_TIMEOUT", "3"))
+DEFAULT_CACHE_SIZE = int(os.getenv("DOMAIN_CACHE_SIZE", "50000"))
+# Parallel DNS lookups when resolving the domains of a bulk run
+DOMAIN_PREFETCH_WORKERS = int(os.getenv("DOMAIN_PREFETCH_WORKERS", "16"))
+
+# How long a verdict is trusted before the domain is resolved again
+VERDICT_TTL = timedelta(days=7)
+DEAD_DOMAIN_TTL = timedelta(days=1)
+
+
+class DnsLookupError(Exception):
+    """Raised when a lookup fails for a transient reason (timeout, SERVFAIL)."""
+
+
+class DnsPythonResolver:
+    """MX/A resolver backed by dnspython."""
+    
+    def __init__(self, timeout: float = DEFAULT_DNS_TIMEOUT):
+        self._resolver = dns.resolver.Resolver()
+        self._resolver.lifetime = timeout
+    
+    def lookup(self, domain: str) -> Dict[str, Any]:
+        """
+        Resolve a domain's MX and A records.
+        
+        Returns:
+            Dict with 'exists', 'mx' (host names) and 'a' (addresses)
+        """
+        try:
+            answer = self._resolver.resolve(domain, "MX")
+            mx = sorted(str(record.exchange).rstrip(".") for record in answer)
+        except dns.resolver.NXDOMAIN:
+            return {"exists": False, "mx": [], "a": []}
+        except dns.resolver.NoAnswer:
+            mx = []
+        except dns.exception.DNSException as e:
+            raise DnsLookupError(str(e))
+        
+        # A null MX ("." per RFC 7505) explicitly declares that the domain accepts no mail
+        if mx == [""]:
+            return {"exists": True, "mx": [], "a": [], "null_mx": True}
+        
+        a = []
+        if not mx:
+            try:
+                a = [record.address for record in self._resolver.resolve(domain, "A")]
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                a = []
+            except dns.exception.DNSException as e:
+                raise DnsLookupError(str(e))
+        
+        return {"exists": True, "mx": mx, "a": a}
+
+
+class SystemResolver:
+    """
+    Fallback resolver using the operating system's getaddrinfo.
+    
+    It cannot see MX records, so it only reports whether the domain has an
+    address; 'mx' is None to signal "unknown".
+    """
+    
+    def lookup(self, domain: str) -> Dict[str, Any]:
+        try:
+            infos = socket.getaddrinfo(domain, None)
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_NONAME:
+                return {"exists": False, "mx": None, "a": []}
+            raise DnsLookupError(str(e))
+        return {"exists": True, "mx": None, "a": sorted({info[4][0] for info in infos})}
+
+
+class StubResolver:
+    """
+    In-memory resolver for tests and offline runs.
+    
+    Domains missing from the records mapping are reported as not existing.
+    """
+    
+    def __init__(self, records: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            records: Mapping of domain to {'mx': [...], 'a': [...]}
+        """
+        self.records = records or {}
+        self.lookups = 0
+    
+    def lookup(self, domain: str) -> Dict[str, Any]:
+        self.lookups += 1
+        record = self.records.get(domain)
+        if record is None:
+            return {"exists": False, "mx": [], "a": []}
+        return {"exists": True, "mx": list(record.get("mx", [])), "a": list(record.get("a", []))}
+
+
+def default_resolver():
+    """Get the best available resolver: dnspython if installed, else the system resolver."""
+    if dns is not None:
+        return DnsPythonResolver()
+    return SystemResolver()
+
+
+class DomainIntelligence:
+    """Per-domain verdicts with an in-memory TTL cache and database persistence."""
+    
+    def __init__(self, resolver=None, max_size: Optional[int] = None,
+                 use_database: bool = True, enabled: Optional[bool] = None):
+        """
+        Initialize the domain intelligence layer.
+        
+        Args:
+            resolver: Object with a lookup(domain) method (default: dnspython/system)
+            max_size: Maximum number of verdicts held in memory
+            use_database: Whether to persist verdicts in the domain_verdicts table
+            enabled: Override for DOMAIN_CHECKS_ENABLED
+        """
+        self.resolver = resolver or default_resolver()
+        self.max_size = max_size or DEFAULT_CACHE_SIZE
+        self.use_database = use_database
+        self.enabled = DOMAIN_CHECKS_ENABLED if enabled is None else enabled
+        
+        self._lock = threading.Lock()
+        self._verdicts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "database_hits": 0, "lookups": 0, "lookup_errors": 0, "short_circuited": 0}
+    
+    def get_cached_verdict(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Get a fresh verdict from memory only (never blocks on I/O)."""
+        domain = domain.lower()
+        with self._lock:
+            verdict = self._verdicts.get(domain)
+            if verdict and verdict["expires_at"] > datetime.utcnow():
+                self._verdicts.move_to_end(domain)
+                self._stats["memory_hits"] += 1
+                return verdict
+        return None
+    
+    def get_verdict(self, domain: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the verdict for a domain, resolving it if nothing fresh is known.
+        
+        Args:
+            domain: The domain name
+        
+        Returns:
+            Verdict dict, or None if the domain could not be resolved right now
+        """
+        domain = domain.lower()
+        verdict = self.get_cached_verdict(domain)
+        if verdict:
+            return verdict
+        
+        if self.use_database:
+            verdict = self._load_verdict(domain)
+            if verdict:
+                with self._lock:
+                    self._stats["database_hits"] += 1
+                self._remember(verdict)
+                return verdict
+        
+        try:
+            lookup = self.resolver.lookup(domain)
+        except DnsLookupError as e:
+            logger.warning(f"DNS lookup failed for {domain}: {str(e)}")
+            with self._lock:
+                self._stats["lookup_errors"] += 1
+            return None
+        with self._lock:
+            self._stats["lookups"] += 1
+        
+        verdict = self._new_verdict(domain)
+        verdict["exists"] = lookup["exists"]
+        verdict["has_mx"] = None if lookup["mx"] is None else bool(lookup["mx"])
+        verdict["has_a"] = bool(lookup["a"])
+        if lookup.get("null_mx"):
+            verdict["has_mx"] = False
+            verdict["null_mx"] = True
+        verdict["expires_at"] = datetime.utcnow() + (DEAD_DOMAIN_TTL if self.is_dead(verdict) else VERDICT_TTL)
+        
+        self._remember(verdict)
+        self.save_verdict(verdict)
+        return verdict
+    
+    def is_cached(self, domain: str) -> bool:
+        """Whether a fresh verdict for the domain is held in memory."""
+        with self._lock:
+            verdict = self._verdicts.get(domain.lower())
+            return verdict is not None and verdict["expires_at"] > datetime.utcnow()
+    
+    def prefetch(self, domains: Iterable[str]) -> None:
+        """Resolve a set of domains (each at most once, in parallel) ahead of verification."""
+        pending = [domain for domain in set(domain.lower() for domain in domains if domain)
+                   if not self.is_cached(domain)]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(DOMAIN_PREFETCH_WORKERS, len(pending))) as executor:
+            list(executor.map(self.get_verdict, pending))
+    
+    @staticmethod
+    def is_dead(verdict: Optional[Dict[str, Any]]) -> bool:
+        """Whether a verdict says the domain cannot receive mail."""
+        if not verdict:
+            return False
+        if verdict.get("exists") is False or verdict.get("null_mx"):
+            return True
+        # RFC 5321 falls back to the A record when there is no MX; an unknown
+        # A record (provider-learned verdicts) never counts as dead
+        return verdict.get("has_mx") is False and verdict.get("has_a") is False
+    
+    def check_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer an address locally if its domain is known to be dead.
+        
+        Args:
+            email: A normalized email address
+        
+        Returns:
+            A local verification result, or None if the providers should be asked
+        """
+        if not self.enabled:
+            return None
+        
+        domain = email.rpartition("@")[2]
+        verdict = self.get_verdict(domain)
+        if not self.is_dead(verdict):
+            return None
+        
+        with self._lock:
+            self._stats["short_circuited"] += 1
+        reason = "domain_not_found" if verdict.get("exists") is False else "no_mx"
+        return {
+            "email": email,
+            "is_valid": False,
+            "score": 0.0,
+            "provider": "local",
+            "details": {"reason": reason, "domain": domain}
+        }
+    
+    def record_provider_result(self, result: Dict[str, Any], persist: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Learn domain-level facts (MX, disposable, catch-all) from a provider result.
+        
+        Args:
+            result: A provider verification result
+            persist: Write a changed verdict to the database immediately; async
+                callers pass False and call save_verdict from a worker thread
+        
+        Returns:
+            The updated verdict if anything changed, otherwise None
+        """
+        details = result.get("details")
+        email = result.get("email") or ""
+        if not isinstance(details, dict) or "@" not in email:
+            return None
+        
+        facts = extract_domain_facts(details)
+        if not facts:
+            return None
+        
+        domain = email.rpartition("@")[2].lower()
+        with self._lock:
+            verdict = self._verdicts.get(domain)
+            if verdict is None:
+                verdict = self._new_verdict(domain)
+                verdict["expires_at"] = datetime.utcnow() + VERDICT_TTL
+            changed = {key: value for key, value in facts.items() if verdict.get(key) != value}
+            if not changed:
+                return None
+            verdict.update(changed)
+            verdict["source"] = "provider"
+        
+        self._remember(verdict)
+        if persist:
+            self.save_verdict(verdict)
+        return verdict
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup counters and the number of verdicts in memory."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._verdicts)
+        return stats
+    
+    def _new_verdict(self, domain: str) -> Dict[str, Any]:
+        return {
+            "domain": domain,
+            "exists": None,
+            "has_mx": None,
+            "has_a": None,
+            "is_disposable": None,
+            "is_catch_all": None,
+            "source": "dns",
+            "expires_at": datetime.utcnow()
+        }
+    
+    def _remember(self, verdict: Dict[str, Any]) -> None:
+        with self._lock:
+            self._verdicts[verdict["domain"]] = verdict
+            self._verdicts.move_to_end(verdict["domain"])
+            while len(self._verdicts) > self.max_size:
+                self._verdicts.popitem(last=False)
+    
+    def _load_verdict(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Load a verdict from the database if it is still fresh."""
+        try:
+            session = next(get_db())
+            try:
+                row = session.query(DomainVerdict).filter(DomainVerdict.domain == domain).first()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error loading domain verdict: {str(e)}")
+            return None
+        
+        if not row or not row.checked_at:
+            return None
+        
+        verdict = row.to_dict()
+        ttl = DEAD_DOMAIN_TTL if self.is_dead(verdict) else VERDICT_TTL
+        verdict["expires_at"] = row.checked_at + ttl
+        if verdict["expires_at"] <= datetime.utcnow():
+            return None
+        return verdict
+    
+    def save_verdict(self, verdict: Dict[str, Any]) -> None:
+        """Insert or update the verdict row for a domain."""
+        if not self.use_database:
+            return
+        
+        try:
+            session = next(get_db())
+            try:
+                row = session.query(DomainVerdict).filter(DomainVerdict.domain == verdict["domain"]).first()
+                if row is None:
+                    row = DomainVerdict(domain=verdict["domain"])
+                    session.add(row)
+                for key in ("exists", "has_mx", "has_a", "is_disposable", "is_catch_all", "source"):
+                    setattr(row, key, verdict.get(key))
+                row.checked_at = datetime.utcnow()
+                session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error saving domain verdict: {str(e)}")
+
+
+def _as_bool(value) -> Optional[bool]:
+    """Interpret the boolean-ish values vendors return (True, 'true', 1, 'yes')."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return str(value).strip().lower() in ("true", "1", "yes")
+
+
+def extract_domain_facts(details: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pull domain-level facts out of a provider's response details.
+    
+    Understands the fields returned by MailboxLayer (mx_found, disposable,
+    catch_all), NeutrinoAPI (domain.has-mx, domain.exists, is-disposable),
+    ZeroBounce (mx_found, status 'catch-all', sub_status 'disposable') and
+    Hunter.io (mx_records, disposable, accept_all).
+    """
+    facts = {}
+    
+    for key in ("mx_found", "domain.has-mx", "mx_records"):
+        value = _as_bool(details.get(key))
+        if value is not None:
+            facts["has_mx"] = value
+            break
+    
+    value = _as_bool(details.get("domain.exists"))
+    if value is not None:
+        facts["exists"] = value
+    
+    for key in ("disposable", "is-disposable"):
+        value = _as_bool(details.get(key))
+        if value is not None:
+            facts["is_disposable"] = value
+            break
+    if str(details.get("sub_status", "")).lower() == "disposable":
+        facts["is_disposable"] = True
+    
+    for key in ("catch_all", "accept_all"):
+        value = _as_bool(details.get(key))
+        if value is not None:
+            facts["is_catch_all"] = value
+            break
+    if str(details.get("status", "")).lower() in ("catch-all", "accept_all"):
+        facts["is_catch_all"] = True
+    
+    return facts
@@ -0,0 +1,170 @@
+"""
+Email CSV
+
+This module provides streaming CSV input and output for bulk verification.
+Uploaded files are read row by row with the csv module instead of being
+loaded into a DataFrame, so a multi-million-row upload is never materialized
+in memory; the addresses are yielded straight into the verification
+pipeline. Results are written the same way, row by row, to a temporary file
+on disk (optionally gzip-compressed) that the download is served from.
+"""
+import io
+import os
+import re
+import csv
+import gzip
+import tempfile
+import itertools
+from typing import Dict, List, Any, Iterator, Optional, BinaryIO
+
+# Addresses per batch when a CSV source is consumed in batches
+CSV_READ_BATCH_SIZE = int(os.getenv("CSV_READ_BATCH_SIZE", "1000"))
+# Directory for result export files (default: the system temp directory)
+EXPORT_DIR = os.getenv("EXPORT_DIR") or None
+
+
+def detect_email_column(header: List[str]) -> Optional[str]:
+    """
+    Find the email column of a CSV header.
+    
+    Args:
+        header: The column names
+    
+    Returns:
+        The first column whose name contains 'email' (case-insensitive,
+        ignoring punctuation, so 'E-mail Address' matches), or None
+    """
+    for column in header:
+        if "email" in re.sub(r"[^a-z]", "", column.lower()):
+            return column
+    return None
+
+
+class EmailCsvSource:
+    """Re-iterable stream of the addresses in one column of a CSV file."""
+    
+    def __init__(self, fileobj: BinaryIO, column: Optional[str] = None,
+                 encoding: str = "utf-8-sig"):
+        """
+        Initialize the source and read the header.
+        
+        Args:
+            fileobj: Seekable binary file object (e.g. a Streamlit upload or an open file)
+            column: Name of the email column (default: detected from the header)
+            encoding: Text encoding of the file; the default strips a UTF-8 BOM
+        """
+        self.fileobj = fileobj
+        self.encoding = encoding
+        
+        rows = self._rows()
+        try:
+            self.header = [name.strip() for name in next(rows, [])]
+        finally:
+            rows.close()
+        
+        self.column = column or detect_email_column(self.header)
+        self._index = self.header.index(self.column) if self.column in self.header else None
+    
+    def _rows(self) -> Iterator[List[str]]:
+        """Read the file from the start, one parsed row at a time."""
+        self.fileobj.seek(0)
+        text = io.TextIOWrapper(self.fileobj, encoding=self.encoding, errors="replace", newline="")
+        try:
+            yield from csv.reader(text)
+        finally:
+            # Leave the caller's file object open
+            text.detach()
+    
+    def __iter__(self) -> Iterator[str]:
+        """Yield the non-blank addresses of the email column, in file order."""
+        if self._index is None:
+            return
+        
+        rows = self._rows()
+        try:
+            next(rows, None)
+            for row in rows:
+                if len(row) > self._index:
+                    value = row[self._index].strip()
+                    if value:
+                        yield value
+        finally:
+            rows.close()
+    
+    def batches(self, batch_size: Optional[int] = None) -> Iterator[List[str]]:
+        """
+        Yield the addresses in lists of at most batch_size.
+        
+        Args:
+            batch_size: Addresses per batch (default: CSV_READ_BATCH_SIZE)
+        
+        Returns:
+            Iterator of address batches
+        """
+        addresses = iter(self)
+        while True:
+            batch = list(itertools.islice(addresses, batch_size or CSV_READ_BATCH_SIZE))
+            if not batch:
+                return
+            yield batch
+    
+    def count(self) -> int:
+        """Count the addresses with one streaming pass over the file."""
+        return sum(1 for _ in self)
+
+
+class ResultCsvWriter:
+    """Incremental CSV (optionally gzip-compressed) writer backed by a temporary file on disk."""
+    
+    def __init__(self, fieldnames: List[str], compress: bool = False,
+                 directory: Optional[str] = None):
+        """
+        Create the file and write the header row.
+        
+        Args:
+            fieldnames: The CSV columns; row keys not listed here are ignored
+            compress: Write a gzip-compressed CSV
+            directory: Where to create the file (default: EXPORT_DIR or the system temp directory)
+        """
+        self.compress = compress
+        self.suffix = ".csv.gz" if compress else ".csv"
+        self.mime = "application/gzip" if compress else "text/csv"
+        self.row_count = 0
+        
+        handle, self.path = tempfile.mkstemp(suffix=self.suffix, dir=directory or EXPORT_DIR)
+        self._file = os.fdopen(handle, "wb")
+        self._binary = gzip.GzipFile(fileobj=self._file, mode="wb") if compress else self._file
+        self._text = io.TextIOWrapper(self._binary, encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._text, fieldnames=fieldnames, restval="", extrasaction="ignore")
+        self._writer.writeheader()
+    
+    def write(self, row: Dict[str, Any]) -> None:
+        """Append one row."""
+        self._writer.writerow(row)
+        self.row_count += 1
+    
+    def close(self) -> str:
+        """
+        Finish the file so it can be served.
+        
+        Returns:
+            Path of the finished file
+        """
+        if not self._text.closed:
+            # Closing the text layer closes the gzip stream, which leaves the file itself open
+            self._text.close()
+        if not self._file.closed:
+            self._file.close()
+        return self.path
+    
+    def remove(self) -> None:
+        """Close and delete the file."""
+        self.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+    
+    def file_name(self, stem: str) -> str:
+        """Download name for the file, with the right extension."""
+        return f"{stem}{self.suffix}"
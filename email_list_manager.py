@@ -4,17 +4,68 @@ Email List Manager
 This module provides functionality for managing email lists, including
 creation, updates, and importing/exporting.
 """
+import io
 import os
 import csv
+import gzip
+import time
 import logging
-from typing import Dict, List, Any, Optional
+import itertools
+from typing import Dict, List, Any, Optional, Iterator, BinaryIO
 from datetime import datetime
+from sqlalchemy import func, select, case, false, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from database import EmailList, EmailListEntry, get_db
+from database import EmailList, EmailListEntry, EmailVerdictLatest, engine, get_db
 
 logger = logging.getLogger(__name__)
 
+# CSV rows imported per transaction
+IMPORT_CHUNK_SIZE = int(os.getenv("LIST_IMPORT_CHUNK_SIZE", "500"))
+# Entry columns filled from the CSV
+ENTRY_FIELDS = ("first_name", "last_name", "company", "position")
+# Columns read when listing entries (no ORM objects are built)
+ENTRY_COLUMNS = (
+    EmailListEntry.id,
+    EmailListEntry.email,
+    EmailListEntry.first_name,
+    EmailListEntry.last_name,
+    EmailListEntry.company,
+    EmailListEntry.position,
+    EmailListEntry.added_at
+)
+# Columns written by export_to_csv, in order
+EXPORT_COLUMNS = ("email", "first_name", "last_name", "company", "position", "added_at")
+# Entries per page in the UI / rows per round trip when streaming a list
+ENTRIES_PAGE_SIZE = int(os.getenv("LIST_ENTRIES_PAGE_SIZE", "100"))
+STREAM_BATCH_SIZE = int(os.getenv("LIST_STREAM_BATCH_SIZE", "1000"))
+
+
+def _entry_insert(session: Session):
+    """INSERT into email_list_entries with the dialect's ON CONFLICT support."""
+    dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+    return dialect.insert(EmailListEntry.__table__)
+
+
+def _entry_upsert(session: Session):
+    """
+    INSERT ... ON CONFLICT (list_id, lower(email)) DO UPDATE.
+    
+    On conflict only the fields the new row fills in are overwritten, like
+    add_email_to_list does for an address that is already on the list.
+    """
+    table = EmailListEntry.__table__
+    statement = _entry_insert(session)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.list_id, func.lower(table.c.email)],
+        set_={
+            field: func.coalesce(func.nullif(statement.excluded[field], ''), table.c[field])
+            for field in ENTRY_FIELDS
+        }
+    )
+
+
 class EmailListManager:
     """Manager class for handling email lists."""
     
@@ -69,7 +120,11 @@ class EmailListManager:
                          company: Optional[str] = None,
                          position: Optional[str] = None) -> Dict[str, Any]:
         """
-        Add an email to a list.
+        Add an email to a list, or update its details if it is already on the list.
+        
+        Membership is enforced by the (list_id, lower(email)) unique index: the
+        insert is skipped on conflict and the existing entry updated instead,
+        so concurrent adds of the same address cannot create duplicates.
         
         Args:
             list_id: ID of the list to add to
@@ -91,45 +146,37 @@ class EmailListManager:
                 session.close()
                 return {"error": f"List with ID {list_id} not found"}
             
-            # Check if email already exists in this list
-            existing = session.query(EmailListEntry).filter(
-                EmailListEntry.list_id == list_id,
-                EmailListEntry.email == email
-            ).first()
+            values = {
+                "first_name": first_name,
+                "last_name": last_name,
+                "company": company,
+                "position": position
+            }
             
-            if existing:
-                # Update existing entry
-                existing.first_name = first_name if first_name else existing.first_name
-                existing.last_name = last_name if last_name else existing.last_name
-                existing.company = company if company else existing.company
-                existing.position = position if position else existing.position
-                session.commit()
-                session.close()
-                
-                return {
-                    "email": email,
-                    "list_id": list_id,
-                    "updated": True
-                }
+            inserted = session.execute(
+                _entry_insert(session).on_conflict_do_nothing().values(
+                    list_id=list_id, email=email, added_at=datetime.utcnow(), **values
+                )
+            ).rowcount
             
-            # Create new entry
-            entry = EmailListEntry(
-                list_id=list_id,
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                company=company,
-                position=position
-            )
+            if not inserted:
+                # Already on the list: only overwrite the fields that were given
+                changes = {field: value for field, value in values.items() if value}
+                if changes:
+                    session.query(EmailListEntry).filter(
+                        EmailListEntry.list_id == list_id,
+                        func.lower(EmailListEntry.email) == func.lower(email)
+                    ).update(changes, synchronize_session=False)
+            else:
+                self._adjust_entry_count(session, list_id, 1)
             
-            session.add(entry)
             session.commit()
             session.close()
             
             return {
                 "email": email,
                 "list_id": list_id,
-                "added": True
+                "added" if inserted else "updated": True
             }
         except Exception as e:
             logger.error(f"Error adding email to list: {str(e)}")
@@ -139,6 +186,9 @@ class EmailListManager:
         """
         Get all email lists.
         
+        Counts come from the maintained entry_count column, so this is a single
+        query however many entries the lists hold.
+        
         Returns:
             List of email lists with counts
         """
@@ -147,19 +197,14 @@ class EmailListManager:
             session = next(get_db())
             
             # Get all lists
-            lists = session.query(EmailList).all()
+            lists = session.query(EmailList).order_by(EmailList.id).all()
             
             for email_list in lists:
-                # Count entries in each list
-                count = session.query(EmailListEntry).filter(
-                    EmailListEntry.list_id == email_list.id
-                ).count()
-                
                 results.append({
                     "list_id": email_list.id,
                     "name": email_list.name,
                     "description": email_list.description,
-                    "email_count": count,
+                    "email_count": email_list.entry_count or 0,
                     "created_at": email_list.created_at.isoformat() if email_list.created_at else None,
                     "updated_at": email_list.updated_at.isoformat() if email_list.updated_at else None
                 })
@@ -170,55 +215,253 @@ class EmailListManager:
         
         return results
     
+    def remove_email_from_list(self, list_id: int, email: str) -> Dict[str, Any]:
+        """
+        Remove an email from a list.
+        
+        Args:
+            list_id: ID of the list to remove from
+            email: Email address to remove (matched case-insensitively)
+            
+        Returns:
+            Dict with operation result
+        """
+        try:
+            session = next(get_db())
+            
+            removed = session.query(EmailListEntry).filter(
+                EmailListEntry.list_id == list_id,
+                func.lower(EmailListEntry.email) == func.lower(email)
+            ).delete(synchronize_session=False)
+            
+            if not removed:
+                session.close()
+                return {"error": f"{email} is not on list {list_id}"}
+            
+            self._adjust_entry_count(session, list_id, -removed)
+            session.commit()
+            session.close()
+            
+            return {
+                "email": email,
+                "list_id": list_id,
+                "removed": True
+            }
+        except Exception as e:
+            logger.error(f"Error removing email from list: {str(e)}")
+            return {"error": str(e)}
+    
+    def reconcile_entry_counts(self, list_id: Optional[int] = None) -> int:
+        """
+        Recount list entries and correct the stored counts.
+        
+        The counts are kept up to date incrementally; this repairs drift, e.g.
+        after concurrent imports of the same addresses or manual edits.
+        
+        Args:
+            list_id: Only reconcile this list (optional)
+            
+        Returns:
+            Number of lists whose count was corrected
+        """
+        session = next(get_db())
+        try:
+            counts = session.query(
+                EmailListEntry.list_id, func.count(EmailListEntry.id)
+            ).group_by(EmailListEntry.list_id)
+            lists = session.query(EmailList)
+            if list_id is not None:
+                counts = counts.filter(EmailListEntry.list_id == list_id)
+                lists = lists.filter(EmailList.id == list_id)
+            counts = dict(counts.all())
+            
+            corrected = 0
+            for email_list in lists:
+                actual = counts.get(email_list.id, 0)
+                if email_list.entry_count != actual:
+                    email_list.entry_count = actual
+                    corrected += 1
+            session.commit()
+            return corrected
+        except Exception as e:
+            logger.error(f"Error reconciling list counts: {str(e)}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+    
+    def get_list_verdict_summary(self, list_id: int) -> Dict[str, int]:
+        """
+        Count a list's entries by their latest verification verdict.
+        
+        Joins the entries against email_verdict_latest (one row per address),
+        so the summary is a single aggregate query rather than a scan of the
+        verification history.
+        
+        Args:
+            list_id: ID of the list
+            
+        Returns:
+            Dict with 'valid', 'invalid', 'unknown' (verified without a definite
+            answer) and 'unverified' counts
+        """
+        summary = {"valid": 0, "invalid": 0, "unknown": 0, "unverified": 0}
+        status = case(
+            (EmailVerdictLatest.email_key.is_(None), "unverified"),
+            (EmailVerdictLatest.is_valid.is_(True), "valid"),
+            (EmailVerdictLatest.is_valid.is_(False), "invalid"),
+            else_="unknown"
+        ).label("status")
+        
+        try:
+            session = next(get_db())
+            try:
+                rows = session.query(status, func.count(EmailListEntry.id)).outerjoin(
+                    EmailVerdictLatest, EmailVerdictLatest.email_key == func.lower(EmailListEntry.email)
+                ).filter(EmailListEntry.list_id == list_id).group_by(status).all()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error summarizing list verdicts: {str(e)}")
+            return summary
+        
+        for name, count in rows:
+            summary[name] = count
+        return summary
+    
+    def _adjust_entry_count(self, session: Session, list_id: int, delta: int) -> None:
+        """Shift a list's stored entry count within the caller's transaction."""
+        if delta:
+            session.query(EmailList).filter(EmailList.id == list_id).update(
+                {EmailList.entry_count: EmailList.entry_count + delta}, synchronize_session=False
+            )
+    
     def get_list_entries(self, list_id: int) -> List[Dict[str, Any]]:
         """
         Get all entries in an email list.
         
+        Loads the whole list into memory; prefer get_list_entries_page or
+        iter_list_entries for large lists.
+        
         Args:
             list_id: ID of the list to get entries from
             
         Returns:
             List of email entries
         """
-        results = []
+        return list(self.iter_list_entries(list_id))
+    
+    def get_list_entries_page(self, list_id: int, after_id: Optional[int] = None,
+                              page_size: Optional[int] = None,
+                              email_contains: Optional[str] = None,
+                              company: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get one page of a list's entries, in ID order.
+        
+        Pages are addressed by keyset (the last ID of the previous page) rather
+        than by offset, so every page is an index range scan however deep
+        into the list it is.
+        
+        Args:
+            list_id: ID of the list to get entries from
+            after_id: Return entries after this ID (default: from the start)
+            page_size: Entries per page (optional)
+            email_contains: Only entries whose address contains this text, case-insensitively (optional)
+            company: Only entries of this company (optional)
+            
+        Returns:
+            Dict with the page's 'entries' and the 'next_after_id' to pass for
+            the following page (None on the last page)
+        """
+        page_size = page_size or ENTRIES_PAGE_SIZE
         try:
             session = next(get_db())
             
-            # Check if the list exists
-            email_list = session.query(EmailList).filter(EmailList.id == list_id).first()
-            if not email_list:
-                session.close()
-                return []
-            
-            # Get all entries
-            entries = session.query(EmailListEntry).filter(
-                EmailListEntry.list_id == list_id
-            ).all()
-            
-            for entry in entries:
-                results.append({
-                    "id": entry.id,
-                    "email": entry.email,
-                    "first_name": entry.first_name,
-                    "last_name": entry.last_name,
-                    "company": entry.company,
-                    "position": entry.position,
-                    "added_at": entry.added_at.isoformat() if entry.added_at else None
-                })
+            query = self._entries_query(session, list_id, email_contains, company)
+            if after_id is not None:
+                query = query.filter(EmailListEntry.id > after_id)
+            rows = query.order_by(EmailListEntry.id).limit(page_size + 1).all()
             
             session.close()
+            
+            entries = [self._entry_dict(row) for row in rows[:page_size]]
+            return {
+                "list_id": list_id,
+                "entries": entries,
+                "next_after_id": entries[-1]["id"] if len(rows) > page_size else None
+            }
         except Exception as e:
             logger.error(f"Error getting list entries: {str(e)}")
+            return {"error": str(e), "list_id": list_id, "entries": [], "next_after_id": None}
+    
+    def iter_list_entries(self, list_id: int, batch_size: Optional[int] = None,
+                          email_contains: Optional[str] = None,
+                          company: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a list's entries in ID order without loading the list into memory.
         
-        return results
+        Rows are fetched batch_size at a time through a server-side cursor on
+        PostgreSQL (stream_results) and as plain column tuples rather than
+        ORM objects, so memory stays flat for lists of any size.
+        
+        Args:
+            list_id: ID of the list to get entries from
+            batch_size: Rows fetched per round trip (optional)
+            email_contains: Only entries whose address contains this text, case-insensitively (optional)
+            company: Only entries of this company (optional)
+            
+        Returns:
+            Iterator of email entries
+        """
+        session = next(get_db())
+        try:
+            query = self._entries_query(session, list_id, email_contains, company).order_by(EmailListEntry.id)
+            rows = query.execution_options(stream_results=True).yield_per(batch_size or STREAM_BATCH_SIZE)
+            for row in rows:
+                yield self._entry_dict(row)
+        except Exception as e:
+            logger.error(f"Error getting list entries: {str(e)}")
+        finally:
+            session.close()
+    
+    def _entries_query(self, session: Session, list_id: int,
+                       email_contains: Optional[str] = None,
+                       company: Optional[str] = None):
+        """Column query for a list's entries, with the optional filters applied."""
+        query = session.query(*ENTRY_COLUMNS).filter(EmailListEntry.list_id == list_id)
+        if email_contains:
+            query = query.filter(
+                func.lower(EmailListEntry.email).contains(email_contains.lower(), autoescape=True)
+            )
+        if company:
+            query = query.filter(EmailListEntry.company == company)
+        return query
     
-    def import_from_csv(self, list_id: int, file_path: str) -> Dict[str, Any]:
+    def _entry_dict(self, row) -> Dict[str, Any]:
+        """Convert an entry row (see ENTRY_COLUMNS) to a dict."""
+        return {
+            "id": row.id,
+            "email": row.email,
+            "first_name": row.first_name,
+            "last_name": row.last_name,
+            "company": row.company,
+            "position": row.position,
+            "added_at": row.added_at.isoformat() if row.added_at else None
+        }
+    
+    def import_from_csv(self, list_id: int, file_path: str,
+                        chunk_size: Optional[int] = None) -> Dict[str, Any]:
         """
         Import emails into a list from a CSV file.
         
+        The file is read in chunks; each chunk is deduplicated, matched against
+        the list's existing entries with one query and written with bulk
+        inserts/updates in a single transaction.
+        
         Args:
             list_id: ID of the list to import into
             file_path: Path to the CSV file
+            chunk_size: Rows per transaction (optional)
             
         Returns:
             Dict with import results
@@ -239,30 +482,25 @@ class EmailListManager:
             updated = 0
             errors = 0
             
-            with open(file_path, 'r') as csvfile:
+            with open(file_path, 'r', newline='', encoding='utf-8-sig') as csvfile:
                 reader = csv.DictReader(csvfile)
                 
-                for row in reader:
-                    email = row.get('email')
-                    if not email:
-                        errors += 1
-                        continue
+                while True:
+                    rows = list(itertools.islice(reader, chunk_size or IMPORT_CHUNK_SIZE))
+                    if not rows:
+                        break
                     
-                    result = self.add_email_to_list(
-                        list_id=list_id,
-                        email=email,
-                        first_name=row.get('first_name'),
-                        last_name=row.get('last_name'),
-                        company=row.get('company'),
-                        position=row.get('position')
-                    )
+                    try:
+                        counts = self._import_chunk(session, list_id, rows)
+                    except Exception as e:
+                        # Retry the chunk row by row so only the offending rows count as errors
+                        logger.warning(f"Bulk import of a chunk failed, importing it row by row: {str(e)}")
+                        session.rollback()
+                        counts = self._import_rows(list_id, rows)
                     
-                    if 'error' in result:
-                        errors += 1
-                    elif result.get('added', False):
-                        added += 1
-                    elif result.get('updated', False):
-                        updated += 1
+                    added += counts["added"]
+                    updated += counts["updated"]
+                    errors += counts["errors"]
             
             return {
                 "list_id": list_id,
@@ -273,51 +511,191 @@ class EmailListManager:
             }
         except Exception as e:
             logger.error(f"Error importing from CSV: {str(e)}")
+            session.rollback()
             return {"error": str(e)}
         finally:
             session.close()
     
-    def export_to_csv(self, list_id: int, file_path: str) -> Dict[str, Any]:
+    def _import_chunk(self, session: Session, list_id: int, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Upsert one chunk of CSV rows in a single transaction.
+        
+        Counts match importing the rows one at a time with add_email_to_list:
+        rows without an email are errors, the first row for a new address is
+        an add and every other row for an address is an update.
+        
+        Concurrent imports (or adds) of the same addresses must not both count
+        an address as added: PostgreSQL counts the rows the upsert actually
+        inserted (RETURNING xmax = 0); SQLite takes the database write lock
+        before reading the existing entries instead.
+        """
+        postgres = session.bind.dialect.name == "postgresql"
+        errors = 0
+        pending: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            email = row.get('email')
+            if not email:
+                errors += 1
+                continue
+            item = pending.setdefault(email.lower(), {"email": email, "versions": []})
+            item["versions"].append({field: row.get(field) for field in ENTRY_FIELDS})
+        
+        existing = set()
+        if pending:
+            if not postgres:
+                lists = EmailList.__table__
+                session.execute(lists.update().where(false()).values(id=lists.c.id))
+            existing = {
+                key for (key,) in session.query(func.lower(EmailListEntry.email)).filter(
+                    EmailListEntry.list_id == list_id,
+                    func.lower(EmailListEntry.email).in_(list(pending))
+                )
+            }
+        
+        now = datetime.utcnow()
+        upserts = []
+        added = 0
+        updated = 0
+        for key, item in pending.items():
+            versions = item["versions"]
+            if key in existing:
+                # Empty fields keep the stored value (see _entry_upsert)
+                values = dict.fromkeys(ENTRY_FIELDS)
+            else:
+                values = versions[0]
+                versions = versions[1:]
+                added += 1
+            
+            # Later rows only overwrite the fields they fill in
+            for version in versions:
+                values = {field: version[field] if version[field] else values[field] for field in ENTRY_FIELDS}
+            updated += len(versions)
+            
+            if key not in existing or any(values.values()):
+                upserts.append({"list_id": list_id, "email": item["email"], "added_at": now, **values})
+        
+        if upserts and postgres:
+            # One multi-row statement, so RETURNING reports every row
+            inserted = session.execute(
+                _entry_upsert(session).values(upserts).returning(literal_column("xmax = 0"))
+            ).scalars().all()
+            # Addresses another writer added since they were read are updates, not adds
+            raced = added - sum(1 for was_inserted in inserted if was_inserted)
+            added -= raced
+            updated += raced
+        elif upserts:
+            session.execute(_entry_upsert(session), upserts)
+        self._adjust_entry_count(session, list_id, added)
+        session.commit()
+        
+        return {"added": added, "updated": updated, "errors": errors}
+    
+    def _import_rows(self, list_id: int, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Import CSV rows one at a time (fallback when a bulk chunk fails)."""
+        counts = {"added": 0, "updated": 0, "errors": 0}
+        for row in rows:
+            email = row.get('email')
+            if not email:
+                counts["errors"] += 1
+                continue
+            
+            result = self.add_email_to_list(
+                list_id=list_id,
+                email=email,
+                first_name=row.get('first_name'),
+                last_name=row.get('last_name'),
+                company=row.get('company'),
+                position=row.get('position')
+            )
+            
+            if 'error' in result:
+                counts["errors"] += 1
+            elif result.get('added', False):
+                counts["added"] += 1
+            elif result.get('updated', False):
+                counts["updated"] += 1
+        return counts
+    
+    def export_to_csv(self, list_id: int, file_path: str, compress: bool = False) -> Dict[str, Any]:
         """
         Export email list to a CSV file.
         
+        Rows are streamed from a Core select straight into the CSV writer, with
+        no ORM objects or intermediate dicts; on PostgreSQL the server writes
+        the CSV itself with COPY ... TO STDOUT.
+        
         Args:
             list_id: ID of the list to export
             file_path: Path for the output CSV file
+            compress: Write a gzip-compressed CSV
             
         Returns:
-            Dict with export results
+            Dict with export results, including the export rate in rows per second
         """
-        entries = self.get_list_entries(list_id)
-        
-        if not entries:
-            return {
-                "list_id": list_id,
-                "exported": 0,
-                "error": "No entries found or list doesn't exist"
-            }
-        
         try:
-            with open(file_path, 'w', newline='') as csvfile:
-                fieldnames = ['email', 'first_name', 'last_name', 'company', 'position', 'added_at']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for entry in entries:
-                    writer.writerow({
-                        'email': entry.get('email'),
-                        'first_name': entry.get('first_name'),
-                        'last_name': entry.get('last_name'),
-                        'company': entry.get('company'),
-                        'position': entry.get('position'),
-                        'added_at': entry.get('added_at')
-                    })
+            start = time.monotonic()
+            opener = gzip.open if compress else open
+            with opener(file_path, 'wb') as output, engine.connect() as connection:
+                if connection.dialect.name == "postgresql":
+                    exported = self._copy_entries(connection, list_id, output)
+                else:
+                    exported = self._write_entries(connection, list_id, output)
+            elapsed = time.monotonic() - start
+            
+            if not exported:
+                os.unlink(file_path)
+                return {
+                    "list_id": list_id,
+                    "exported": 0,
+                    "error": "No entries found or list doesn't exist"
+                }
             
             return {
                 "list_id": list_id,
-                "exported": len(entries),
-                "file": file_path
+                "exported": exported,
+                "file": file_path,
+                "seconds": elapsed,
+                "rows_per_second": exported / elapsed if elapsed > 0 else float(exported)
             }
         except Exception as e:
             logger.error(f"Error exporting to CSV: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def _write_entries(self, connection, list_id: int, output: BinaryIO) -> int:
+        """Stream a list's entries from a Core select into a CSV file."""
+        table = EmailListEntry.__table__
+        statement = select(*(table.c[column] for column in EXPORT_COLUMNS)).where(
+            table.c.list_id == list_id
+        ).order_by(table.c.id)
+        result = connection.execution_options(stream_results=True).execute(statement)
+        
+        text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_COLUMNS)
+        exported = 0
+        try:
+            for rows in result.partitions(STREAM_BATCH_SIZE):
+                writer.writerows(
+                    (*row[:-1], row[-1].isoformat(timespec="microseconds") if row[-1] else None) for row in rows
+                )
+                exported += len(rows)
+        finally:
+            text.flush()
+            text.detach()
+        return exported
+    
+    def _copy_entries(self, connection, list_id: int, output: BinaryIO) -> int:
+        """Have PostgreSQL write a list's entries as CSV with COPY ... TO STDOUT."""
+        # Same added_at format as _write_entries: isoformat with microseconds
+        columns = [
+            f"""to_char({column}, 'YYYY-MM-DD"T"HH24:MI:SS.US') AS {column}""" if column == "added_at" else column
+            for column in EXPORT_COLUMNS
+        ]
+        copy = (
+            f"COPY (SELECT {', '.join(columns)} FROM {EmailListEntry.__tablename__} "
+            f"WHERE list_id = {int(list_id)} ORDER BY id) TO STDOUT WITH (FORMAT csv, HEADER true)"
+        )
+        raw = connection.connection
+        with raw.cursor() as cursor:
+            cursor.copy_expert(copy, output)
+            return max(cursor.rowcount, 0)
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""
+Email Preprocessor
+
+This module provides the local pre-verification stage that runs before any
+paid API call: addresses are normalized, deduplicated and checked against a
+compiled RFC 5322 syntax validator, so only unique, plausible addresses are
+sent to the verification services. Disposable and role addresses are tagged
+from the local AddressIndex and can be skipped as well.
+"""
+import os
+import re
+from typing import Dict, List, Any, Iterable, Optional, Set
+
+from address_index import AddressIndex, get_default_index
+
+# dot-atom or quoted-string local part
+_LOCAL_PART = (
+    r"(?:[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r'|"(?:[^"\\\r\n]|\\.)*")'
+)
+# hostname labels with an alphabetic (or punycode) TLD, or an IPv4 address literal
+_DOMAIN = (
+    r"(?:(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+"
+    r"(?:[A-Za-z]{2,63}|xn--[A-Za-z0-9-]{1,59})"
+    r"|\[(?:\d{1,3}\.){3}\d{1,3}\])"
+)
+EMAIL_PATTERN = re.compile(rf"^{_LOCAL_PART}@{_DOMAIN}$")
+
+MAX_LOCAL_LENGTH = 64
+MAX_EMAIL_LENGTH = 254
+
+# Skip paid provider calls for disposable / role addresses
+SKIP_DISPOSABLE = os.getenv("VERIFICATION_SKIP_DISPOSABLE", "true").lower() == "true"
+SKIP_ROLE = os.getenv("VERIFICATION_SKIP_ROLE", "false").lower() == "true"
+
+
+def normalize_email(email: str) -> str:
+    """
+    Normalize an email address: trim whitespace and lowercase the domain.
+    
+    The local part is left untouched since it is case-sensitive per RFC 5321.
+    """
+    email = (email or "").strip()
+    local, sep, domain = email.rpartition("@")
+    if not sep:
+        return email
+    return f"{local}@{domain.lower()}"
+
+
+def dedupe_key(email: str) -> str:
+    """Key used to detect duplicates; providers treat addresses case-insensitively."""
+    return normalize_email(email).lower()
+
+
+def get_domain(email: str) -> str:
+    """Get the lowercased domain of an address ('' if it has none)."""
+    return normalize_email(email).rpartition("@")[2]
+
+
+def is_valid_syntax(email: str) -> bool:
+    """
+    Check whether a (normalized) address is syntactically valid.
+    
+    Args:
+        email: The email address to check
+    
+    Returns:
+        True if the address matches RFC 5322 addr-spec and the RFC 5321 length limits
+    """
+    if not email or len(email) > MAX_EMAIL_LENGTH:
+        return False
+    
+    local, sep, domain = email.rpartition("@")
+    if not sep or len(local) > MAX_LOCAL_LENGTH:
+        return False
+    
+    # Internationalized domains are validated in their ASCII (punycode) form
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            return False
+        email = f"{local}@{domain}"
+    
+    return EMAIL_PATTERN.match(email) is not None
+
+
+class EmailPreprocessor:
+    """Local pre-filter that normalizes, deduplicates and syntax-checks addresses."""
+    
+    def __init__(self, index: Optional[AddressIndex] = None,
+                 skip_disposable: Optional[bool] = None,
+                 skip_role: Optional[bool] = None):
+        """
+        Initialize the preprocessor.
+        
+        Args:
+            index: Disposable/role index (default: the shared index loaded from data files)
+            skip_disposable: Don't send disposable addresses to providers (default: VERIFICATION_SKIP_DISPOSABLE)
+            skip_role: Don't send role addresses to providers (default: VERIFICATION_SKIP_ROLE)
+        """
+        self.index = index or get_default_index()
+        self.skip_disposable = SKIP_DISPOSABLE if skip_disposable is None else skip_disposable
+        self.skip_role = SKIP_ROLE if skip_role is None else skip_role
+    
+    def process(self, emails: Iterable[str], providers_per_email: int = 1,
+                seen: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Pre-filter a batch of addresses.
+        
+        Args:
+            emails: The raw addresses (as pasted or read from a CSV)
+            providers_per_email: Number of providers each address would be sent to,
+                used to estimate the API calls saved
+            seen: Dedupe keys of addresses already processed in earlier batches of
+                the same run; updated in place (optional)
+        
+        Returns:
+            Dict with the unique valid addresses to verify, rejected and skipped
+            addresses, every unique address in input order (with its tags and
+            skip reason) and savings stats
+        """
+        seen = set() if seen is None else seen
+        valid: List[str] = []
+        invalid: List[str] = []
+        skipped: List[str] = []
+        ordered: List[Dict[str, Any]] = []
+        total = 0
+        blank = 0
+        duplicates = 0
+        disposable = 0
+        role = 0
+        
+        for raw in emails:
+            total += 1
+            email = normalize_email(raw if isinstance(raw, str) else str(raw or ""))
+            if not email:
+                blank += 1
+                continue
+            
+            key = dedupe_key(email)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            
+            if not is_valid_syntax(email):
+                invalid.append(email)
+                ordered.append({"email": email, "valid_syntax": False})
+                continue
+            
+            tags = self.index.classify(email)
+            disposable += tags["disposable"]
+            role += tags["role"]
+            
+            skip_reason = None
+            if tags["disposable"] and self.skip_disposable:
+                skip_reason = "disposable"
+            elif tags["role"] and self.skip_role:
+                skip_reason = "role"
+            
+            if skip_reason:
+                skipped.append(email)
+            else:
+                valid.append(email)
+            ordered.append({"email": email, "valid_syntax": True, "skip_reason": skip_reason, **tags})
+        
+        not_sent = blank + duplicates + len(invalid) + len(skipped)
+        return {
+            "valid": valid,
+            "invalid": invalid,
+            "skipped": skipped,
+            "ordered": ordered,
+            "stats": {
+                "total": total,
+                "unique": len(valid) + len(invalid) + len(skipped),
+                "valid": len(valid),
+                "invalid_syntax": len(invalid),
+                "duplicates": duplicates,
+                "blank": blank,
+                "disposable": disposable,
+                "role": role,
+                "skipped_local": len(skipped),
+                "api_calls_saved": (duplicates + len(invalid) + len(skipped)) * providers_per_email,
+                "skipped_ratio": not_sent / total if total else 0.0
+            }
+        }
+
+
+def invalid_syntax_result(email: str) -> Dict[str, Any]:
+    """Build the local verification result for an address that failed the syntax check."""
+    return {
+        "email": email,
+        "is_valid": False,
+        "score": 0.0,
+        "provider": "local",
+        "details": {"reason": "invalid_syntax"}
+    }
+
+
+def merge_stats(total: Dict[str, Any], batch: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine the pre-filter stats of consecutive batches of one run.
+    
+    Args:
+        total: Stats accumulated so far (empty for the first batch)
+        batch: Stats of the next batch
+    
+    Returns:
+        The combined stats
+    """
+    merged = {key: total.get(key, 0) + value for key, value in batch.items() if key != "skipped_ratio"}
+    not_sent = merged["blank"] + merged["duplicates"] + merged["invalid_syntax"] + merged["skipped_local"]
+    merged["skipped_ratio"] = not_sent / merged["total"] if merged["total"] else 0.0
+    return merged
@@ -6,13 +6,29 @@ It handles service selection, verification requests, and result aggregation.
 """
 import os
 import json
+import atexit
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import itertools
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Iterator, AsyncIterator, Callable
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from sqlalchemy.orm import Session
 
-from database import EmailVerification, get_db
+from verification_history import read_history
+from verification_cache import VerificationCache
+from domain_intelligence import DomainIntelligence
+from address_index import skipped_address_result
+from email_preprocessor import (
+    EmailPreprocessor,
+    normalize_email,
+    get_domain,
+    is_valid_syntax,
+    invalid_syntax_result,
+    merge_stats
+)
+from verification_writer import VerificationWriteBuffer
+from bulk_job_manager import BulkJobManager
 from services import (
     ZeroBounceService,
     MailboxLayerService,
@@ -23,11 +39,59 @@ from services import (
 
 logger = logging.getLogger(__name__)
 
+# Global cap on concurrent provider calls during a verification run
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("VERIFICATION_MAX_CONCURRENCY", "50"))
+
+# Routing when no service is named: "all" asks every provider and takes a majority
+# vote, "cascade" asks providers one at a time in PROVIDER_ORDER until one is confident
+DEFAULT_ROUTING = os.getenv("VERIFICATION_ROUTING", "all")
+PROVIDER_ORDER = [
+    name.strip() for name in
+    os.getenv("VERIFICATION_PROVIDER_ORDER", "zerobounce,neutrinoapi,mailboxlayer,hunter,spokeo").split(",")
+    if name.strip()
+]
+CONFIDENCE_THRESHOLD = float(os.getenv("VERIFICATION_CONFIDENCE_THRESHOLD", "0.9"))
+
+# Overall deadline (seconds) for interactive single-address verification;
+# providers that have not answered by then are reported as pending
+INTERACTIVE_DEADLINE = float(os.getenv("VERIFICATION_INTERACTIVE_DEADLINE", "8"))
+# Hedge cascade requests to the next provider when one exceeds its p95 latency
+HEDGE_REQUESTS = os.getenv("VERIFICATION_HEDGE_REQUESTS", "false").lower() == "true"
+ROUTING_MODES = ("all", "cascade")
+
+# Addresses read from the input per step of a streaming bulk run
+STREAM_BATCH_SIZE = int(os.getenv("VERIFICATION_STREAM_BATCH_SIZE", "100"))
+
 class EmailVerificationManager:
     """Manager class for handling multiple email verification services."""
     
-    def __init__(self):
-        """Initialize the verification manager with all available services."""
+    def __init__(self, max_concurrency: Optional[int] = None,
+                 cache: Optional[VerificationCache] = None,
+                 writer: Optional[VerificationWriteBuffer] = None,
+                 domains: Optional[DomainIntelligence] = None,
+                 routing: Optional[str] = None,
+                 provider_order: Optional[List[str]] = None,
+                 confidence_threshold: Optional[float] = None):
+        """
+        Initialize the verification manager with all available services.
+        
+        Args:
+            max_concurrency: Maximum number of concurrent provider calls (optional)
+            cache: Result cache to use (optional, a default cache is created)
+            writer: Write-behind buffer for results (optional, a default buffer is created)
+            domains: Domain verdict cache (optional, a default DNS-backed one is created)
+            routing: Default routing mode, "all" or "cascade" (optional)
+            provider_order: Cascade order, cheapest/fastest first (optional)
+            confidence_threshold: Confidence at which the cascade stops (optional)
+        """
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.cache = cache or VerificationCache()
+        self.domains = domains or DomainIntelligence()
+        self.routing = routing or DEFAULT_ROUTING
+        self.provider_order = provider_order or PROVIDER_ORDER
+        self.confidence_threshold = CONFIDENCE_THRESHOLD if confidence_threshold is None else confidence_threshold
+        self.preprocessor = EmailPreprocessor()
+        self.writer = writer or VerificationWriteBuffer()
         self.services = {
             "zerobounce": ZeroBounceService(),
             "mailboxlayer": MailboxLayerService(),
@@ -35,6 +99,13 @@ class EmailVerificationManager:
             "spokeo": SpokeoService(),
             "hunter": HunterService()
         }
+        self.bulk_jobs = BulkJobManager(self.services, self.writer)
+        
+        # Event loop behind the synchronous API, started on first use; the
+        # provider aiohttp sessions live on it and are reused across calls
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
         
         # Log which services have API keys configured
         for service_name, service in self.services.items():
@@ -44,23 +115,214 @@ class EmailVerificationManager:
                 logger.warning(f"{service_name} API key is not configured")
     
     def get_available_services(self) -> List[str]:
-        """Get a list of service names that have API keys configured."""
+        """
+        Get a list of service names that have API keys configured.
+        
+        Services whose circuit breaker is open (the vendor is failing) are left
+        out until a probe request shows they have recovered.
+        """
         return [
-            name for name, service in self.services.items()
+            name for name, service in self.get_configured_services().items()
+            if service.circuit_breaker.is_available()
+        ]
+    
+    def get_configured_services(self) -> Dict[str, Any]:
+        """Get the services that have API keys configured, whatever their health."""
+        return {
+            name: service for name, service in self.services.items()
             if hasattr(service, 'api_key') and service.api_key
+        }
+    
+    def get_unavailable_services(self) -> List[str]:
+        """Get configured services that are currently skipped because their circuit is open."""
+        return [
+            name for name, service in self.get_configured_services().items()
+            if not service.circuit_breaker.is_available()
         ]
     
-    def verify_email(self, email: str, service_name: Optional[str] = None) -> Dict[str, Any]:
+    def get_health_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit breaker state and recent error rate for every service."""
+        return {
+            name: service.get_health_stats()
+            for name, service in self.services.items()
+            if hasattr(service, 'get_health_stats')
+        }
+    
+    def get_provider_order(self, service_names: Optional[List[str]] = None) -> List[str]:
+        """
+        Order services for cascade routing.
+        
+        Args:
+            service_names: Services to order (default: all available services)
+        
+        Returns:
+            The services in configured cost order; unlisted services go last
+        """
+        if service_names is None:
+            service_names = self.get_available_services()
+        rank = {name: i for i, name in enumerate(self.provider_order)}
+        return sorted(service_names, key=lambda name: rank.get(name, len(rank)))
+    
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get HTTP connection pool statistics for every service."""
+        return {
+            name: service.get_pool_stats()
+            for name, service in self.services.items()
+            if hasattr(service, 'get_pool_stats')
+        }
+    
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get rate limiter statistics for every service."""
+        return {
+            name: service.get_rate_limit_stats()
+            for name, service in self.services.items()
+            if hasattr(service, 'get_rate_limit_stats')
+        }
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get recent latency percentiles and time budgets for every service."""
+        return {
+            name: service.get_latency_stats()
+            for name, service in self.services.items()
+            if hasattr(service, 'get_latency_stats')
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get result cache hit/miss statistics."""
+        return self.cache.get_stats()
+    
+    def get_domain_stats(self) -> Dict[str, Any]:
+        """Get DNS lookup and domain short-circuit statistics."""
+        return self.domains.get_stats()
+    
+    def verify_email(self, email: str, service_name: Optional[str] = None,
+                     bypass_cache: bool = False, routing: Optional[str] = None,
+                     deadline: Optional[float] = None, hedge: Optional[bool] = None) -> Dict[str, Any]:
         """
         Verify an email using either a specific service or all available services.
         
+        Thin synchronous wrapper around averify_email.
+        
         Args:
             email: The email address to verify
             service_name: The specific service to use (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
+            deadline: Seconds after which unanswered providers are reported pending (optional)
+            hedge: Hedge slow cascade requests to the next provider (default: VERIFICATION_HEDGE_REQUESTS)
             
         Returns:
             Dict with verification results
         """
+        return self._run_sync(self.averify_email, email, service_name, bypass_cache=bypass_cache,
+                              routing=routing, deadline=deadline, hedge=hedge)
+    
+    def bulk_verify(self, emails: List[str], service_name: Optional[str] = None,
+                    bypass_cache: bool = False, routing: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verify multiple email addresses.
+        
+        Thin synchronous wrapper around abulk_verify.
+        
+        Args:
+            emails: List of email addresses to verify
+            service_name: The specific service to use (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
+            
+        Returns:
+            Dict with verification results for each email
+        """
+        return self._run_sync(self.abulk_verify, emails, service_name,
+                              bypass_cache=bypass_cache, routing=routing)
+    
+    def iter_verify(self, emails: Iterable[str], service_name: Optional[str] = None,
+                    bypass_cache: bool = False, routing: Optional[str] = None,
+                    batch_size: Optional[int] = None,
+                    progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Verify a stream of email addresses, yielding each result as soon as it is ready.
+        
+        Synchronous counterpart of aiter_verify: the run is advanced one result
+        at a time on the manager's event loop.
+        
+        Args:
+            emails: Email addresses to verify (any iterable, consumed lazily)
+            service_name: The specific service to use (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
+            batch_size: Addresses read from the input per step (optional)
+            progress_callback: Called after every batch with the progress so far (optional)
+            
+        Returns:
+            Iterator of verification results
+        """
+        agen = self.aiter_verify(emails, service_name, bypass_cache=bypass_cache, routing=routing,
+                                 batch_size=batch_size, progress_callback=progress_callback)
+        loop = self._get_loop()
+        
+        async def next_result():
+            return await agen.__anext__()
+        
+        try:
+            while True:
+                try:
+                    result = asyncio.run_coroutine_threadsafe(next_result(), loop).result()
+                except StopAsyncIteration:
+                    break
+                yield result
+        finally:
+            asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
+    
+    async def averify_email(self, email: str, service_name: Optional[str] = None,
+                            semaphore: Optional[asyncio.Semaphore] = None,
+                            bypass_cache: bool = False,
+                            routing: Optional[str] = None,
+                            deadline: Optional[float] = None,
+                            hedge: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Verify an email concurrently across one or all available services.
+        
+        Fresh cached results are served without calling the provider unless
+        bypass_cache is set. Addresses on domains that cannot receive mail
+        (no such domain, no MX or A record) are answered locally. With
+        "cascade" routing, providers are asked one at a time in cost order
+        until one returns a confident verdict. With a deadline, providers that
+        have not answered in time are cancelled and marked pending in a
+        partial result.
+        
+        Args:
+            email: The email address to verify
+            service_name: The specific service to use (optional)
+            semaphore: Shared concurrency cap for provider calls (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
+            deadline: Seconds after which unanswered providers are reported pending (optional)
+            hedge: Hedge slow cascade requests to the next provider (default: VERIFICATION_HEDGE_REQUESTS)
+            
+        Returns:
+            Dict with verification results
+        """
+        deadline_at = None
+        if deadline:
+            deadline_at = asyncio.get_running_loop().time() + deadline
+        
+        email = normalize_email(email)
+        if not is_valid_syntax(email):
+            return invalid_syntax_result(email)
+        
+        if self.domains.enabled:
+            # Resolve off the event loop unless the domain verdict is already in memory
+            if self.domains.is_cached(get_domain(email)):
+                domain_result = self.domains.check_email(email)
+            else:
+                domain_result = await asyncio.to_thread(self.domains.check_email, email)
+            if domain_result:
+                return domain_result
+        
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        
         if service_name:
             if service_name not in self.services:
                 return {
@@ -69,112 +331,501 @@ class EmailVerificationManager:
                     "verified": False
                 }
             
-            service = self.services[service_name]
-            result = service.verify_email(email)
-            self._store_verification_result(result)
-            return result
-        else:
-            # Use all available services and combine results
-            available_services = self.get_available_services()
-            if not available_services:
-                return {
-                    "email": email,
-                    "error": "No verification services are configured with API keys",
-                    "verified": False
-                }
-            
-            results = {}
-            valid_count = 0
-            total_score = 0.0
-            service_count = 0
-            
-            # Verify with all available services
-            with ThreadPoolExecutor(max_workers=len(available_services)) as executor:
-                future_to_service = {
-                    executor.submit(self.services[name].verify_email, email): name
-                    for name in available_services
-                }
-                
-                for future in as_completed(future_to_service):
-                    service_name = future_to_service[future]
-                    try:
-                        service_result = future.result()
-                        results[service_name] = service_result
-                        
-                        # Store result in database
-                        self._store_verification_result(service_result)
-                        
-                        # Count valid results and accumulate scores
-                        if service_result.get("is_valid"):
-                            valid_count += 1
-                        
-                        if service_result.get("score") is not None:
-                            total_score += service_result.get("score", 0.0)
-                            service_count += 1
-                    except Exception as e:
-                        logger.error(f"Error getting result from {service_name}: {str(e)}")
-                        results[service_name] = {
-                            "email": email,
-                            "error": str(e),
-                            "provider": service_name
-                        }
-            
-            # Determine aggregate validity and score
-            is_valid = None
-            if valid_count > 0:
-                is_valid = valid_count >= len(available_services) / 2  # Simple majority
-            
-            aggregate_score = None
-            if service_count > 0:
-                aggregate_score = total_score / service_count
-            
+            results = await self._averify_services(email, [service_name], semaphore, bypass_cache, deadline_at)
+            return results[service_name]
+        
+        # Use all available services and combine results
+        available_services = self.get_available_services()
+        if not available_services:
             return {
                 "email": email,
-                "is_valid": is_valid,
-                "score": aggregate_score,
-                "results": results,
-                "verified_by": len(results),
-                "verification_date": datetime.utcnow().isoformat()
+                "error": "No verification services are configured with API keys",
+                "verified": False
             }
+        
+        if (routing or self.routing) == "cascade":
+            return await self._averify_cascade(
+                email, available_services, semaphore, bypass_cache, deadline_at,
+                HEDGE_REQUESTS if hedge is None else hedge
+            )
+        
+        results = await self._averify_services(email, available_services, semaphore, bypass_cache, deadline_at)
+        
+        return self._aggregate_results(email, results, len(available_services))
     
-    def bulk_verify(self, emails: List[str], service_name: Optional[str] = None) -> Dict[str, Any]:
+    async def abulk_verify(self, emails: List[str], service_name: Optional[str] = None,
+                           max_concurrency: Optional[int] = None,
+                           bypass_cache: bool = False,
+                           routing: Optional[str] = None) -> Dict[str, Any]:
         """
-        Verify multiple email addresses.
+        Verify multiple email addresses, fanning out across all addresses and
+        providers concurrently under a global concurrency cap.
+        
+        Addresses are normalized, deduplicated and syntax-checked locally first,
+        disposable/role addresses are tagged (and skipped if so configured), and
+        each distinct domain is resolved once up front; only unique, well-formed
+        addresses on live domains reach the providers.
         
         Args:
             emails: List of email addresses to verify
             service_name: The specific service to use (optional)
+            max_concurrency: Maximum number of in-flight provider calls (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
             
         Returns:
-            Dict with verification results for each email
+            Dict with verification results for each unique email and pre-filter stats
         """
         if not emails:
             return {"error": "No emails provided"}
         
-        if service_name:
-            if service_name not in self.services:
-                return {"error": f"Service '{service_name}' not found"}
+        if service_name and service_name not in self.services:
+            return {"error": f"Service '{service_name}' not found"}
+        
+        if service_name or (routing or self.routing) == "cascade":
+            providers_per_email = 1
+        else:
+            providers_per_email = len(self.get_available_services())
+        prefiltered = self.preprocessor.process(emails, providers_per_email)
+        
+        if self.domains.enabled:
+            await asyncio.to_thread(self.domains.prefetch, (get_domain(email) for email in prefiltered["valid"]))
+        
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        try:
+            verified = await asyncio.gather(
+                *(self.averify_email(email, service_name, semaphore, bypass_cache, routing)
+                  for email in prefiltered["valid"])
+            )
+        finally:
+            # Guarantee every result of the run is persisted before returning
+            await asyncio.to_thread(self.writer.flush)
+        
+        verified = iter(verified)
+        results = []
+        for entry in prefiltered["ordered"]:
+            if not entry["valid_syntax"]:
+                results.append(invalid_syntax_result(entry["email"]))
+                continue
             
-            service = self.services[service_name]
-            if hasattr(service, 'bulk_verify'):
-                return service.bulk_verify(emails)
+            if entry["skip_reason"]:
+                result = skipped_address_result(entry["email"], entry["skip_reason"])
             else:
-                # Fall back to individual verification
-                results = []
-                for email in emails:
-                    results.append(service.verify_email(email))
-                return {"results": results}
+                result = next(verified)
+            
+            results.append(self._tag_result(result, entry))
+        
+        return {"results": results, "preprocessing": prefiltered["stats"]}
+    
+    async def aiter_verify(self, emails: Iterable[str], service_name: Optional[str] = None,
+                           bypass_cache: bool = False, routing: Optional[str] = None,
+                           batch_size: Optional[int] = None, max_concurrency: Optional[int] = None,
+                           progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Verify a stream of email addresses, yielding each result as soon as it is ready.
+        
+        The input is read lazily, batch_size addresses at a time, and each batch
+        is pre-filtered and verified concurrently before the next one is read,
+        so memory stays flat however long the list is (only the dedupe keys of
+        addresses already seen are kept). Within a batch, local results come
+        first and provider results follow in completion order.
+        
+        Args:
+            emails: Email addresses to verify (any iterable, consumed lazily)
+            service_name: The specific service to use (optional)
+            bypass_cache: Always query the providers, ignoring cached results
+            routing: "all" or "cascade" when no service is named (default: self.routing)
+            batch_size: Addresses read from the input per step (optional)
+            max_concurrency: Maximum number of in-flight provider calls (optional)
+            progress_callback: Called after every batch with a dict holding the number of
+                input addresses 'processed', results 'yielded' and the 'preprocessing' stats (optional)
+            
+        Returns:
+            Async iterator of verification results
+            
+        Raises:
+            ValueError: If service_name is not a known service
+        """
+        if service_name and service_name not in self.services:
+            raise ValueError(f"Service '{service_name}' not found")
+        
+        if service_name or (routing or self.routing) == "cascade":
+            providers_per_email = 1
+        else:
+            providers_per_email = len(self.get_available_services())
+        
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        batches = iter(emails)
+        seen = set()
+        stats: Dict[str, Any] = {}
+        processed = 0
+        yielded = 0
+        
+        try:
+            while True:
+                batch = list(itertools.islice(batches, batch_size or STREAM_BATCH_SIZE))
+                if not batch:
+                    break
+                
+                prefiltered = self.preprocessor.process(batch, providers_per_email, seen)
+                stats = merge_stats(stats, prefiltered["stats"])
+                if self.domains.enabled:
+                    await asyncio.to_thread(self.domains.prefetch, (get_domain(email) for email in prefiltered["valid"]))
+                
+                tasks = {}
+                try:
+                    for entry in prefiltered["ordered"]:
+                        if not entry["valid_syntax"]:
+                            yielded += 1
+                            yield invalid_syntax_result(entry["email"])
+                        elif entry["skip_reason"]:
+                            yielded += 1
+                            yield self._tag_result(skipped_address_result(entry["email"], entry["skip_reason"]), entry)
+                        else:
+                            task = asyncio.ensure_future(
+                                self.averify_email(entry["email"], service_name, semaphore, bypass_cache, routing)
+                            )
+                            tasks[task] = entry
+                    
+                    pending = set(tasks)
+                    while pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            yielded += 1
+                            yield self._tag_result(task.result(), tasks[task])
+                finally:
+                    # The consumer may stop early; don't leave provider calls running
+                    unfinished = [task for task in tasks if not task.done()]
+                    for task in unfinished:
+                        task.cancel()
+                    if unfinished:
+                        await asyncio.gather(*unfinished, return_exceptions=True)
+                
+                processed += len(batch)
+                if progress_callback:
+                    progress_callback({"processed": processed, "yielded": yielded, "preprocessing": stats})
+        finally:
+            await asyncio.to_thread(self.writer.flush)
+    
+    def _tag_result(self, result: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the disposable/role tags of a pre-filter entry to its result."""
+        tags = [tag for tag in ("disposable", "role") if entry[tag]]
+        return {**result, "tags": tags} if tags else result
+    
+    async def _averify_services(self, email: str, service_names: List[str],
+                                semaphore: asyncio.Semaphore,
+                                bypass_cache: bool,
+                                deadline_at: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Verify an email with several services, serving fresh cached results where possible.
+        
+        Services that have not answered by deadline_at (event loop time) are
+        cancelled and reported as pending.
+        """
+        results = {}
+        if not bypass_cache:
+            results = await asyncio.to_thread(self.cache.get_many, email, service_names)
+        
+        tasks = {
+            asyncio.ensure_future(self._averify_with_service(email, name, semaphore)): name
+            for name in service_names if name not in results
+        }
+        if tasks:
+            timeout = None
+            if deadline_at is not None:
+                timeout = max(0.0, deadline_at - asyncio.get_running_loop().time())
+            try:
+                done, late = await asyncio.wait(tasks, timeout=timeout)
+            except asyncio.CancelledError:
+                # The caller gave up (e.g. a streaming run was stopped); stop the provider calls too
+                for task in tasks:
+                    task.cancel()
+                raise
+            for task in done:
+                results[tasks[task]] = task.result()
+            for task in late:
+                task.cancel()
+                results[tasks[task]] = self._pending_result(email, tasks[task])
+        
+        return {name: results[name] for name in service_names}
+    
+    async def _averify_cascade(self, email: str, service_names: List[str],
+                               semaphore: asyncio.Semaphore,
+                               bypass_cache: bool,
+                               deadline_at: Optional[float] = None,
+                               hedge: bool = False) -> Dict[str, Any]:
+        """
+        Ask services one at a time, cheapest first, until one is confident.
+        
+        Confident cached results end the cascade before any provider is called;
+        errors and inconclusive verdicts (unknown, catch-all) fall through to
+        the next service. With hedging, the next service is also started when
+        the current one is slower than its own p95 latency, and whichever
+        answers confidently first wins.
+        
+        Args:
+            email: The email address to verify
+            service_names: The available services
+            semaphore: Shared concurrency cap for provider calls
+            bypass_cache: Always query the providers, ignoring cached results
+            deadline_at: Event loop time after which unanswered services are reported pending
+            hedge: Start the next service when the current one exceeds its p95
+            
+        Returns:
+            Dict with the aggregate result, including the deciding service
+        """
+        loop = asyncio.get_running_loop()
+        ordered = self.get_provider_order(service_names)
+        cached = {}
+        if not bypass_cache:
+            cached = await asyncio.to_thread(self.cache.get_many, email, ordered)
+        
+        for name in ordered:
+            if name in cached and self._is_confident(name, cached[name]):
+                return self._cascade_result(email, {name: cached[name]}, name)
+        
+        results = {name: cached[name] for name in ordered if name in cached}
+        remaining = [name for name in ordered if name not in cached]
+        running = {}
+        decided_by = None
+        hedged = 0
+        
+        def start(name):
+            running[asyncio.ensure_future(self._averify_with_service(email, name, semaphore))] = name
+        
+        while (remaining or running) and decided_by is None:
+            if not running:
+                start(remaining.pop(0))
+            
+            timeout = None
+            if hedge and remaining and len(running) == 1:
+                timeout = self.services[next(iter(running.values()))].latency_percentile(95)
+            if deadline_at is not None:
+                time_left = max(0.0, deadline_at - loop.time())
+                timeout = time_left if timeout is None else min(timeout, time_left)
+            
+            try:
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                for task in running:
+                    task.cancel()
+                raise
+            if not done:
+                if deadline_at is not None and loop.time() >= deadline_at:
+                    break
+                # The current service is slower than usual: hedge to the next one
+                start(remaining.pop(0))
+                hedged += 1
+                continue
+            
+            for task in done:
+                name = running.pop(task)
+                results[name] = task.result()
+                if decided_by is None and self._is_confident(name, results[name]):
+                    decided_by = name
+        
+        for task, name in running.items():
+            task.cancel()
+            if decided_by is None:
+                results[name] = self._pending_result(email, name)
+        
+        aggregate = self._cascade_result(email, results, decided_by)
+        aggregate["hedged"] = hedged
+        return aggregate
+    
+    def _cascade_result(self, email: str, results: Dict[str, Dict[str, Any]],
+                        decided_by: Optional[str]) -> Dict[str, Any]:
+        """Aggregate cascade results, taking the verdict from the deciding service."""
+        aggregate = self._aggregate_results(email, results, len(results))
+        aggregate["decided_by"] = decided_by
+        if decided_by:
+            aggregate["is_valid"] = results[decided_by].get("is_valid")
+        return aggregate
+    
+    def _pending_result(self, email: str, service_name: str) -> Dict[str, Any]:
+        """Placeholder for a service that did not answer before the deadline."""
+        return {
+            "email": email,
+            "is_valid": None,
+            "score": None,
+            "provider": service_name,
+            "pending": True,
+            "details": {"reason": "deadline_exceeded"}
+        }
+    
+    def _is_confident(self, service_name: str, result: Dict[str, Any]) -> bool:
+        """Whether a service's result is conclusive enough to stop a cascade."""
+        service = self.services[service_name]
+        return service.result_confidence(result) >= self.confidence_threshold
+    
+    async def _averify_with_service(self, email: str, service_name: str,
+                                    semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Verify an email with one service and store the result."""
+        service = self.services[service_name]
+        try:
+            async with semaphore:
+                result = await service.averify_email(email)
+        except Exception as e:
+            logger.error(f"Error getting result from {service_name}: {str(e)}")
+            result = {
+                "email": email,
+                "error": str(e),
+                "provider": service_name
+            }
+        
+        # Refused by the circuit breaker: nothing was learned about the address
+        if result.get("circuit_open"):
+            return result
+        
+        self.cache.set(email, service_name, result)
+        
+        # Share what the provider told us about the domain with later addresses
+        if "error" not in result:
+            verdict = self.domains.record_provider_result(result, persist=False)
+            if verdict:
+                await asyncio.to_thread(self.domains.save_verdict, verdict)
+        
+        # Queue result for the database; only hop to a thread when add() would block
+        if self.writer.is_saturated():
+            await asyncio.to_thread(self._store_verification_result, result)
         else:
-            # Use individual verification with all services for each email
-            results = []
-            for email in emails:
-                results.append(self.verify_email(email))
-            return {"results": results}
+            self._store_verification_result(result)
+        return result
+    
+    def _aggregate_results(self, email: str, results: Dict[str, Dict[str, Any]],
+                           service_count: int) -> Dict[str, Any]:
+        """
+        Combine per-service results into an aggregate verdict.
+        
+        Services still pending at a deadline are listed separately and do not
+        count towards the majority. When every service that answered returned
+        an error, the aggregate carries an 'error' too.
+        
+        Args:
+            email: The email address that was verified
+            results: Mapping of service name to that service's result
+            service_count: Number of services that were asked
+            
+        Returns:
+            Dict with the aggregate result
+        """
+        valid_count = 0
+        total_score = 0.0
+        scored_count = 0
+        pending = [name for name, service_result in results.items() if service_result.get("pending")]
+        service_count -= len(pending)
+        
+        for service_result in results.values():
+            # Count valid results and accumulate scores
+            if service_result.get("is_valid"):
+                valid_count += 1
+            
+            if service_result.get("score") is not None:
+                total_score += service_result.get("score", 0.0)
+                scored_count += 1
+        
+        # Determine aggregate validity and score
+        is_valid = None
+        if valid_count > 0:
+            is_valid = valid_count >= service_count / 2  # Simple majority
+        
+        aggregate_score = None
+        if scored_count > 0:
+            aggregate_score = total_score / scored_count
+        
+        aggregate = {
+            "email": email,
+            "is_valid": is_valid,
+            "score": aggregate_score,
+            "results": results,
+            "verified_by": len(results) - len(pending),
+            "pending": pending,
+            "verification_date": datetime.utcnow().isoformat()
+        }
+        
+        # No provider answered: surface the failures so the item can be retried
+        answered = [result for result in results.values() if not result.get("pending")]
+        if answered and all("error" in result for result in answered):
+            aggregate["error"] = "All providers failed: " + "; ".join(
+                f"{name}: {result['error']}" for name, result in results.items() if "error" in result
+            )
+        return aggregate
+    
+    def _run_sync(self, coroutine_function, *args, **kwargs):
+        """
+        Run one of the async verification methods from synchronous code.
+        
+        The coroutine runs on the manager's long-lived event loop, so provider
+        aiohttp sessions (and their pooled connections) are reused from call to
+        call; buffered results are flushed so the call's writes are durable
+        when it returns.
+        """
+        async def runner():
+            try:
+                return await coroutine_function(*args, **kwargs)
+            finally:
+                await asyncio.to_thread(self.writer.flush)
+        
+        return asyncio.run_coroutine_threadsafe(runner(), self._get_loop()).result()
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the manager's event loop, starting its thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="verification-event-loop", daemon=True
+                )
+                self._loop_thread.start()
+                atexit.register(self.close)
+            elif threading.current_thread() is self._loop_thread:
+                raise RuntimeError("Synchronous verification methods cannot be called from the manager's event loop")
+            return self._loop
+    
+    def close(self) -> None:
+        """Close the provider sessions, stop the event loop and write any buffered results."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._aclose_services(), loop).result(timeout=10)
+            except Exception as e:
+                logger.error(f"Error closing provider sessions: {str(e)}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+            loop.close()
+        self.writer.close()
+    
+    async def _aclose_services(self) -> None:
+        """Close the async HTTP sessions of every service."""
+        for service in self.services.values():
+            if hasattr(service, 'aclose'):
+                await service.aclose()
+    
+    def submit_bulk_job(self, emails: Iterable[str], service_name: str) -> Dict[str, Any]:
+        """
+        Verify a large list through a provider's vendor bulk API.
+        
+        The job is polled in the background and its results are stored in the
+        database when the vendor finishes.
+        
+        Args:
+            emails: Email addresses to verify
+            service_name: A provider that supports bulk jobs
+            
+        Returns:
+            Dict with the bulk job information
+        """
+        return self.bulk_jobs.submit_job(service_name, (normalize_email(email) for email in emails))
     
     def get_verification_history(self, email: str) -> List[Dict[str, Any]]:
         """
         Get verification history for an email from the database.
         
+        Includes rows rolled over into the monthly archive tables.
+        
         Args:
             email: The email address to get history for
             
@@ -182,24 +833,19 @@ class EmailVerificationManager:
             List of verification records
         """
         results = []
-        session = next(get_db())
+        email = normalize_email(email)
+        self.writer.flush()
         
         try:
-            verifications = session.query(EmailVerification).filter(
-                EmailVerification.email == email
-            ).order_by(EmailVerification.verification_date.desc()).all()
-            
-            results = [v.to_dict() for v in verifications]
+            results = read_history(email)
         except Exception as e:
             logger.error(f"Error getting verification history: {str(e)}")
-        finally:
-            session.close()
         
         return results
     
     def _store_verification_result(self, result: Dict[str, Any]) -> None:
         """
-        Store a verification result in the database.
+        Queue a verification result for a batched write to the database.
         
         Args:
             result: The verification result to store
@@ -208,18 +854,10 @@ class EmailVerificationManager:
             return
         
         try:
-            session = next(get_db())
-            
-            verification = EmailVerification(
-                email=result.get("email"),
-                is_valid=result.get("is_valid"),
-                score=result.get("score"),
-                provider=result.get("provider"),
-                details=result.get("details")
-            )
-            
-            session.add(verification)
-            session.commit()
-            session.close()
+            self.writer.add(result)
         except Exception as e:
-            logger.error(f"Error storing verification result: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error storing verification result: {str(e)}")
+    
+    def flush_results(self) -> int:
+        """Write any buffered verification results to the database now."""
+        return self.writer.flush()
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Latest Verdicts
+
+This module maintains the email_verdict_latest table: one row per address
+(keyed case-insensitively) holding the latest result of every provider and
+the aggregate verdict over them. It is updated whenever the result writer
+flushes, so current-status lookups (the verification cache's database tier,
+list-wide status summaries) are single indexed reads instead of scans of the
+email_verification history.
+
+After the table is first created, or to repair it, fill it from the history
+as a maintenance step:
+
+    python latest_verdicts.py rebuild
+"""
+import os
+import sys
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, List, Any, Iterable
+
+from sqlalchemy import select, func, and_, or_, false
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import EmailVerification, EmailVerdictLatest, engine
+from email_preprocessor import dedupe_key
+
+logger = logging.getLogger(__name__)
+
+# Addresses read per page when rebuilding the table
+REBUILD_BATCH_SIZE = int(os.getenv("VERDICT_REBUILD_BATCH_SIZE", "1000"))
+
+
+def is_reusable(row: Dict[str, Any]) -> bool:
+    """Stored errors carry no verdict or details and never replace a provider's latest result."""
+    return not (row.get("is_valid") is None and not row.get("details"))
+
+
+def aggregate_verdict(providers: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the latest per-provider results into one verdict.
+    
+    Valid wins a simple majority of the providers that gave a definite
+    answer, like the verification manager's aggregate.
+    
+    Args:
+        providers: Mapping of provider name to its latest result
+    
+    Returns:
+        Dict with the aggregate 'is_valid' and average 'score'
+    """
+    decided = [entry["is_valid"] for entry in providers.values() if entry.get("is_valid") is not None]
+    scores = [entry["score"] for entry in providers.values() if entry.get("score") is not None]
+    return {
+        "is_valid": sum(decided) >= len(decided) / 2 if decided else None,
+        "score": sum(scores) / len(scores) if scores else None
+    }
+
+
+def update_latest_verdicts(rows: List[Dict[str, Any]]) -> int:
+    """
+    Fold freshly written verification rows into email_verdict_latest.
+    
+    The affected addresses' current rows are locked and read with one query,
+    merged in memory (a provider's entry is only replaced by a newer result)
+    and written back with one upsert, in a single transaction. The lock keeps
+    concurrent writers (several worker processes) from overwriting each
+    other's merges.
+    
+    Args:
+        rows: email_verification rows (email, provider, is_valid, score, details, verification_date)
+    
+    Returns:
+        Number of addresses updated
+    """
+    updates: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if not row.get("email") or not row.get("provider") or not is_reusable(row):
+            continue
+        item = updates.setdefault(dedupe_key(row["email"]), {"email": row["email"], "providers": {}})
+        current = item["providers"].get(row["provider"])
+        if current is None or row["verification_date"] >= current["verification_date"]:
+            item["providers"][row["provider"]] = row
+            item["email"] = row["email"]
+    
+    if not updates:
+        return 0
+    
+    table = EmailVerdictLatest.__table__
+    with engine.begin() as connection:
+        existing = {
+            key: providers or {} for key, providers in connection.execute(_locked_select(connection, sorted(updates)))
+        }
+        
+        values = []
+        for key, item in updates.items():
+            providers = dict(existing.get(key, {}))
+            for provider, row in item["providers"].items():
+                entry = _provider_entry(row)
+                stored = providers.get(provider)
+                if stored is None or entry["verified_at"] >= stored.get("verified_at", ""):
+                    providers[provider] = entry
+            values.append(_latest_row(key, item["email"], providers))
+        
+        connection.execute(_upsert(connection), values)
+    
+    return len(values)
+
+
+def get_latest_verdicts(emails: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up the latest verdicts of several addresses with one query.
+    
+    Args:
+        emails: The email addresses
+    
+    Returns:
+        Dict mapping dedupe key to the verdict (addresses never verified are omitted)
+    """
+    keys = list({dedupe_key(email) for email in emails})
+    if not keys:
+        return {}
+    
+    table = EmailVerdictLatest.__table__
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(select(table).where(table.c.email_key.in_(keys))).fetchall()
+    except Exception as e:
+        logger.error(f"Error reading latest verdicts: {str(e)}")
+        return {}
+    
+    return {
+        row.email_key: {
+            "email": row.email,
+            "is_valid": row.is_valid,
+            "score": row.score,
+            "provider_count": row.provider_count,
+            "providers": row.providers or {},
+            "last_verified_at": row.last_verified_at.isoformat() if row.last_verified_at else None
+        }
+        for row in rows
+    }
+
+
+def rebuild_latest_verdicts(batch_size: int = None) -> int:
+    """
+    Recompute email_verdict_latest from the verification history.
+    
+    Used to backfill the table and to repair it. Addresses are paged in
+    keyset order, and each page only aggregates the history of its own
+    address range, so every page costs about the same however large the
+    history is.
+    
+    Args:
+        batch_size: Addresses per page (optional)
+    
+    Returns:
+        Number of address updates written
+    """
+    history = EmailVerification.__table__
+    reusable = or_(history.c.is_valid.isnot(None), history.c.details.isnot(None))
+    
+    written = 0
+    last = None
+    while True:
+        addresses = select(history.c.email).distinct().order_by(history.c.email).limit(batch_size or REBUILD_BATCH_SIZE)
+        if last is not None:
+            addresses = addresses.where(history.c.email > last)
+        with engine.connect() as connection:
+            emails = connection.execute(addresses).scalars().all()
+            if not emails:
+                return written
+            
+            in_range = and_(history.c.email >= emails[0], history.c.email <= emails[-1], reusable)
+            latest = select(
+                history.c.email,
+                history.c.provider,
+                func.max(history.c.verification_date).label("verification_date")
+            ).where(in_range).group_by(history.c.email, history.c.provider).subquery()
+            rows = [dict(row._mapping) for row in connection.execute(select(
+                history.c.email, history.c.provider, history.c.is_valid,
+                history.c.score, history.c.details, history.c.verification_date
+            ).join(latest, and_(
+                history.c.email == latest.c.email,
+                history.c.provider == latest.c.provider,
+                history.c.verification_date == latest.c.verification_date
+            )).where(in_range))]
+        
+        written += update_latest_verdicts(rows)
+        last = emails[-1]
+
+
+def _provider_entry(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "is_valid": row.get("is_valid"),
+        "score": row.get("score"),
+        "details": row.get("details"),
+        "verified_at": row["verification_date"].isoformat(timespec="microseconds")
+    }
+
+
+def _latest_row(key: str, email: str, providers: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    verdict = aggregate_verdict(providers)
+    return {
+        "email_key": key,
+        "email": email,
+        "is_valid": verdict["is_valid"],
+        "score": verdict["score"],
+        "provider_count": len(providers),
+        "providers": providers,
+        "last_verified_at": datetime.fromisoformat(max(entry["verified_at"] for entry in providers.values()))
+    }
+
+
+def _locked_select(connection, keys: List[str]):
+    """
+    Lock the rows of keys for the rest of the transaction and return the query reading them.
+    
+    PostgreSQL inserts placeholder rows for new addresses first, so that
+    SELECT ... FOR UPDATE has a row to lock for every key (keys are sorted, so
+    concurrent writers lock them in the same order). SQLite has no row locks;
+    a no-op UPDATE takes the database write lock before the read instead.
+    """
+    table = EmailVerdictLatest.__table__
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            postgresql.insert(table).on_conflict_do_nothing(index_elements=[table.c.email_key]),
+            [{"email_key": key, "email": key, "provider_count": 0} for key in keys]
+        )
+        return select(table.c.email_key, table.c.providers).where(
+            table.c.email_key.in_(keys)
+        ).order_by(table.c.email_key).with_for_update()
+    
+    connection.execute(table.update().where(false()).values(email_key=table.c.email_key))
+    return select(table.c.email_key, table.c.providers).where(table.c.email_key.in_(keys))
+
+
+def _upsert(connection):
+    """INSERT ... ON CONFLICT (email_key) DO UPDATE for email_verdict_latest."""
+    table = EmailVerdictLatest.__table__
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.email_key],
+        set_={
+            column: statement.excluded[column]
+            for column in ("email", "is_valid", "score", "provider_count", "providers", "last_verified_at")
+        }
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the latest verdict of every address.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild = subparsers.add_parser("rebuild", help="Recompute email_verdict_latest from the verification history")
+    rebuild.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="Addresses per page")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    logger.info(f"Rebuilt {rebuild_latest_verdicts(args.batch_size)} latest verdicts.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
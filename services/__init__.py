@@ -1,6 +1,9 @@
 """
 Email Verification Services Package
 """
+from .base_service import BaseVerificationService
+from .rate_limiter import TokenBucket
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 from .zerobounce_service import ZeroBounceService
 from .mailboxlayer_service import MailboxLayerService 
 from .neutrinoapi_service import NeutrinoAPIService
@@ -8,6 +11,10 @@ from .spokeo_service import SpokeoService
 from .hunter_service import HunterService
 
 __all__ = [
+    'BaseVerificationService',
+    'TokenBucket',
+    'CircuitBreaker',
+    'CircuitOpenError',
     'ZeroBounceService',
     'MailboxLayerService',
     'NeutrinoAPIService',
@@ -0,0 +1,585 @@
+"""
+Base class for email verification services.
+
+Provides a shared, pooled HTTP session so that every provider reuses
+keep-alive connections instead of paying a new TCP+TLS handshake per request.
+Providers describe their verification request and how to parse the response;
+the base class runs it either synchronously (requests) or asynchronously
+(aiohttp, when installed).
+"""
+import os
+import io
+import csv
+import time
+import asyncio
+import tempfile
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Tuple, Iterable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import TokenBucket, parse_retry_after, parse_quota_reset
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv("VERIFICATION_POOL_SIZE", "10"))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("VERIFICATION_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("VERIFICATION_READ_TIMEOUT", "30"))
+
+# How many times a rate-limited (429) request is queued and retried before giving up
+MAX_RATE_LIMIT_RETRIES = int(os.getenv("VERIFICATION_MAX_RATE_LIMIT_RETRIES", "5"))
+# Wait applied after a 429 that carries no Retry-After header
+DEFAULT_RETRY_AFTER = 1.0
+
+# Number of recent verification latencies kept per provider for percentiles
+LATENCY_WINDOW = int(os.getenv("VERIFICATION_LATENCY_WINDOW", "200"))
+# Percentiles are only reported once this many samples exist
+LATENCY_MIN_SAMPLES = 20
+
+# Bulk upload files stay in memory up to this size, then spill to disk
+BULK_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class BaseVerificationService:
+    """Common base for verification providers with a keep-alive connection pool."""
+    
+    provider_name = "base"
+    display_name = "verification service"
+    
+    # Sustainable request rate and burst budget; providers override these
+    requests_per_second = 5.0
+    burst = 5
+    
+    # Seconds a single verification request may take once it is sent
+    # (rate-limit waits excluded); providers override this
+    timeout_budget = 10.0
+    
+    # Whether the provider implements the vendor bulk-file API hooks
+    # (submit_bulk_file, get_bulk_job_status, iter_bulk_results)
+    supports_bulk_jobs = False
+    
+    def __init__(self, pool_size: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[int] = None,
+                 timeout_budget: Optional[float] = None):
+        """
+        Initialize the pooled HTTP session and rate limiter.
+        
+        Args:
+            pool_size: Maximum number of keep-alive connections per host
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for the server to send a response
+            requests_per_second: Override for the provider's sustained request rate
+            burst: Override for the provider's burst budget
+            timeout_budget: Override for the provider's per-request time budget
+                (also settable with VERIFICATION_TIMEOUT_BUDGET_<PROVIDER>)
+        """
+        self.pool_size = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+        self.connect_timeout = DEFAULT_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout
+        self.read_timeout = DEFAULT_READ_TIMEOUT if read_timeout is None else read_timeout
+        self.timeout_budget = float(
+            os.getenv(f"VERIFICATION_TIMEOUT_BUDGET_{self.provider_name.upper()}", self.timeout_budget)
+        ) if timeout_budget is None else timeout_budget
+        self.rate_limiter = TokenBucket(
+            self.requests_per_second if requests_per_second is None else requests_per_second,
+            self.burst if burst is None else burst
+        )
+        self.circuit_breaker = CircuitBreaker(self.display_name)
+        
+        self._adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        
+        # aiohttp sessions are bound to the event loop that created them
+        self._async_session = None
+        self._async_loop = None
+        self._async_connections_opened = 0
+        
+        self._stats_lock = threading.Lock()
+        self._total_requests = 0
+        self._in_flight = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._timeouts = 0
+    
+    @property
+    def timeout(self):
+        """The (connect, read) timeout tuple passed to every request."""
+        return (self.connect_timeout, self.read_timeout)
+    
+    # Provider hooks
+    
+    def _credentials_error(self) -> Optional[str]:
+        """Return an error message if the provider is missing credentials."""
+        if not getattr(self, "api_key", None):
+            return "API key not provided"
+        return None
+    
+    def _build_verify_request(self, email: str) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Describe the HTTP request used to verify an email.
+        
+        Returns:
+            Tuple of (method, url, request kwargs such as params/json/headers)
+        """
+        raise NotImplementedError
+    
+    def _parse_verify_response(self, email: str, data: Any) -> Dict[str, Any]:
+        """Convert the provider's decoded JSON response into a verification result."""
+        raise NotImplementedError
+    
+    def _error_result(self, email: str, error: str) -> Dict[str, Any]:
+        """Build the standard error result for this provider."""
+        return {
+            "email": email,
+            "is_valid": None,
+            "error": error,
+            "provider": self.provider_name
+        }
+    
+    def _circuit_open_result(self, email: str, error: CircuitOpenError) -> Dict[str, Any]:
+        """Error result for a request refused by the circuit breaker (never cached or stored)."""
+        result = self._error_result(email, str(error))
+        result["circuit_open"] = True
+        return result
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """
+        How conclusive a verification result is, from 0.0 (no information) to 1.0.
+        
+        Used by cascade routing to decide whether other providers still need to
+        be asked. The default trusts the 0-1 score in the direction of the verdict;
+        providers that report "unknown"/"catch-all" style statuses override this.
+        """
+        if result.get("error") or result.get("is_valid") is None:
+            return 0.0
+        score = min(max(float(result.get("score") or 0.0), 0.0), 1.0)
+        return score if result["is_valid"] else 1.0 - score
+    
+    # Verification
+    
+    def verify_email(self, email: str) -> Dict[str, Any]:
+        """
+        Verify an email address with this provider.
+        
+        Args:
+            email: The email address to verify
+        
+        Returns:
+            Dict with verification results
+        """
+        credentials_error = self._credentials_error()
+        if credentials_error:
+            return self._error_result(email, credentials_error)
+        
+        method, url, request_kwargs = self._build_verify_request(email)
+        # requests has no total timeout; bound each read by the budget instead
+        request_kwargs.setdefault("timeout", (self.connect_timeout, min(self.read_timeout, self.timeout_budget)))
+        
+        started = time.monotonic()
+        try:
+            response = self._request(method, url, **request_kwargs)
+            response.raise_for_status()
+            result = self._parse_verify_response(email, response.json())
+            self._record_latency(time.monotonic() - started)
+            return result
+        except CircuitOpenError as e:
+            return self._circuit_open_result(email, e)
+        except requests.Timeout as e:
+            self._record_timeout()
+            logger.error(f"Error verifying email with {self.display_name}: {str(e)}")
+            return self._error_result(email, f"Timed out after {self.timeout_budget:g}s")
+        except Exception as e:
+            logger.error(f"Error verifying email with {self.display_name}: {str(e)}")
+            return self._error_result(email, str(e))
+    
+    async def averify_email(self, email: str) -> Dict[str, Any]:
+        """
+        Verify an email address with this provider without blocking the event loop.
+        
+        Falls back to running the synchronous client in a thread when aiohttp
+        is not installed.
+        
+        Args:
+            email: The email address to verify
+        
+        Returns:
+            Dict with verification results
+        """
+        if aiohttp is None:
+            return await asyncio.to_thread(self.verify_email, email)
+        
+        credentials_error = self._credentials_error()
+        if credentials_error:
+            return self._error_result(email, credentials_error)
+        
+        method, url, request_kwargs = self._build_verify_request(email)
+        request_kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout_budget))
+        
+        started = time.monotonic()
+        try:
+            data = await self._arequest_json(method, url, **request_kwargs)
+            result = self._parse_verify_response(email, data)
+            self._record_latency(time.monotonic() - started)
+            return result
+        except CircuitOpenError as e:
+            return self._circuit_open_result(email, e)
+        except asyncio.TimeoutError:
+            self._record_timeout()
+            logger.error(f"{self.display_name} did not answer within {self.timeout_budget:g}s")
+            return self._error_result(email, f"Timed out after {self.timeout_budget:g}s")
+        except Exception as e:
+            logger.error(f"Error verifying email with {self.display_name}: {str(e)}")
+            return self._error_result(email, str(e))
+    
+    # Synchronous transport
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send an HTTP request through the provider's pooled session.
+        
+        Requests wait for a rate-limit token first; a 429 response pauses the
+        provider's bucket for the Retry-After period and the request is queued
+        again instead of failing. Requests are refused with CircuitOpenError
+        while the provider's circuit is open.
+        
+        Args:
+            method: HTTP method (GET, POST, ...)
+            url: The request URL
+            **kwargs: Extra arguments forwarded to requests.Session.request
+        
+        Returns:
+            The response object
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        self._check_circuit()
+        
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            
+            with self._stats_lock:
+                self._total_requests += 1
+                self._in_flight += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except Exception:
+                self.circuit_breaker.record_failure()
+                raise
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+            
+            if not self._handle_rate_limit(response.status_code, response.headers, attempt):
+                self._record_circuit_outcome(response.status_code)
+                return response
+            response.close()
+            attempt += 1
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request through the pooled session."""
+        return self._request("GET", url, **kwargs)
+    
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request through the pooled session."""
+        return self._request("POST", url, **kwargs)
+    
+    def _handle_rate_limit(self, status_code: int, headers, attempt: int) -> bool:
+        """
+        Update the rate limiter from a response.
+        
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+            attempt: Number of rate-limit retries already made for this request
+        
+        Returns:
+            True if the request was rate limited and should be retried
+        """
+        if status_code != 429:
+            quota_reset = parse_quota_reset(headers)
+            if quota_reset:
+                self.rate_limiter.defer(quota_reset)
+            return False
+        
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER * (2 ** attempt)
+        self.rate_limiter.defer(retry_after)
+        
+        if attempt >= MAX_RATE_LIMIT_RETRIES:
+            logger.error(f"{self.display_name} still rate limited after {attempt} retries")
+            return False
+        
+        logger.warning(f"{self.display_name} rate limited, retrying in {retry_after:.1f}s")
+        return True
+    
+    def _check_circuit(self) -> None:
+        """Raise CircuitOpenError if the provider's circuit refuses the request."""
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(f"{self.display_name} is temporarily unavailable (circuit open)")
+    
+    def _record_circuit_outcome(self, status_code: int) -> None:
+        """Count 5xx responses as failures; any other answer means the provider is up."""
+        if status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+    
+    # Asynchronous transport
+    
+    def _get_async_session(self):
+        """Get (or lazily create) the aiohttp session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._async_session
+        if session is None or session.closed or self._async_loop is not loop:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_async_connection_created)
+            
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout,
+                    sock_read=self.read_timeout
+                ),
+                trace_configs=[trace_config]
+            )
+            self._async_loop = loop
+        return self._async_session
+    
+    async def _on_async_connection_created(self, session, context, params) -> None:
+        with self._stats_lock:
+            self._async_connections_opened += 1
+    
+    async def _arequest_json(self, method: str, url: str, **kwargs) -> Any:
+        """
+        Send an HTTP request through the provider's aiohttp session.
+        
+        Args:
+            method: HTTP method (GET, POST, ...)
+            url: The request URL
+            **kwargs: Extra arguments forwarded to aiohttp.ClientSession.request
+        
+        Returns:
+            The decoded JSON response body
+        """
+        session = self._get_async_session()
+        self._check_circuit()
+        
+        attempt = 0
+        try:
+            while True:
+                await self.rate_limiter.acquire_async()
+                
+                with self._stats_lock:
+                    self._total_requests += 1
+                    self._in_flight += 1
+                try:
+                    async with session.request(method, url, **kwargs) as response:
+                        if self._handle_rate_limit(response.status, response.headers, attempt):
+                            attempt += 1
+                            continue
+                        self._record_circuit_outcome(response.status)
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+                finally:
+                    with self._stats_lock:
+                        self._in_flight -= 1
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self.circuit_breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled by a deadline or a winning hedge, or failed on our side (bad
+            # URL, undecodable body): not the provider's fault, but a half-open
+            # probe slot must never stay taken
+            self.circuit_breaker.release()
+            raise
+    
+    async def aclose(self) -> None:
+        """Close the aiohttp session, if one was opened."""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._async_loop = None
+    
+    # Bulk file helpers
+    
+    def _write_bulk_csv(self, emails: Iterable[str]) -> Tuple[Any, int]:
+        """
+        Write emails to a single-column CSV upload file without holding the list in memory.
+        
+        Args:
+            emails: Iterable of email addresses
+        
+        Returns:
+            Tuple of (binary file object positioned at the start, number of emails written)
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_MAX_SIZE, mode="w+b")
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(["email"])
+        
+        count = 0
+        for email in emails:
+            email = (email or "").strip()
+            if email:
+                writer.writerow([email])
+                count += 1
+        
+        text.flush()
+        text.detach()
+        spool.seek(0)
+        return spool, count
+    
+    def _upload_file(self, url: str, file_obj, fields: Optional[Dict[str, str]] = None,
+                     file_field: str = "file", filename: str = "emails.csv",
+                     **kwargs) -> requests.Response:
+        """
+        POST a file as multipart/form-data.
+        
+        The body is streamed from the file when requests-toolbelt is installed;
+        otherwise requests builds it in memory.
+        """
+        fields = dict(fields or {})
+        if MultipartEncoder is not None:
+            fields[file_field] = (filename, file_obj, "text/csv")
+            encoder = MultipartEncoder(fields=fields)
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers["Content-Type"] = encoder.content_type
+            return self._post(url, data=encoder, headers=headers, **kwargs)
+        
+        return self._post(
+            url,
+            data=fields,
+            files={file_field: (filename, file_obj, "text/csv")},
+            **kwargs
+        )
+    
+    def _iter_csv_download(self, url: str, **kwargs) -> Iterator[Dict[str, str]]:
+        """
+        Stream a CSV download row by row without buffering the whole file.
+        
+        Args:
+            url: The download URL
+            **kwargs: Extra arguments forwarded to the request
+        
+        Yields:
+            One dict per CSV row, keyed by header
+        """
+        response = self._get(url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Keep the stream readable at EOF so TextIOWrapper can finish cleanly
+            response.raw.auto_close = False
+            text = io.TextIOWrapper(response.raw, encoding="utf-8-sig", newline="")
+            for row in csv.DictReader(text):
+                yield row
+        finally:
+            response.close()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics for this provider.
+        
+        Returns:
+            Dict with request count, connections opened, reuse ratio and in-flight count
+        """
+        connections_opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+        
+        with self._stats_lock:
+            connections_opened += self._async_connections_opened
+            total_requests = self._total_requests
+            in_flight = self._in_flight
+        
+        reuse_ratio = 0.0
+        if total_requests:
+            reuse_ratio = max(0.0, 1.0 - connections_opened / total_requests)
+        
+        return {
+            "provider": self.provider_name,
+            "pool_size": self.pool_size,
+            "total_requests": total_requests,
+            "connections_opened": connections_opened,
+            "reuse_ratio": reuse_ratio,
+            "in_flight": in_flight
+        }
+    
+    def _record_latency(self, seconds: float) -> None:
+        with self._stats_lock:
+            self._latencies.append(seconds)
+    
+    def _record_timeout(self) -> None:
+        with self._stats_lock:
+            self._timeouts += 1
+    
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a percentile of recent verification latencies.
+        
+        Args:
+            percentile: Percentile between 0 and 100
+        
+        Returns:
+            Latency in seconds, or None until enough samples have been recorded
+        """
+        with self._stats_lock:
+            samples = sorted(self._latencies)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+        return samples[index]
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Get recent latency percentiles, the time budget and the timeout count."""
+        with self._stats_lock:
+            samples = len(self._latencies)
+            timeouts = self._timeouts
+        return {
+            "provider": self.provider_name,
+            "samples": samples,
+            "p50": self.latency_percentile(50),
+            "p95": self.latency_percentile(95),
+            "timeout_budget": self.timeout_budget,
+            "timeouts": timeouts
+        }
+    
+    def get_health_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker state and recent error rate for this provider."""
+        stats = self.circuit_breaker.get_stats()
+        stats["provider"] = self.provider_name
+        return stats
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Get rate limiter statistics for this provider."""
+        stats = self.rate_limiter.get_stats()
+        stats["provider"] = self.provider_name
+        return stats
+    
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        self.session.close()
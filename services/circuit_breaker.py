@@ -0,0 +1,163 @@
+"""
+Circuit breaking for verification providers.
+
+Each provider owns one breaker. It tracks the outcome of recent requests in
+a rolling time window and opens when the error rate gets too high, so a dead
+vendor is skipped instantly instead of every address waiting on a failing
+request. After a cool-down a single probe request is let through (half-open);
+its outcome closes the circuit again or keeps it open.
+"""
+import os
+import time
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Open when at least MIN_CALLS requests in the last WINDOW seconds failed at FAILURE_RATE or more
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+CIRCUIT_WINDOW = float(os.getenv("CIRCUIT_WINDOW", "60"))
+# Seconds an open circuit waits before letting a probe through
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe closed/open/half-open breaker with a rolling error-rate window."""
+    
+    def __init__(self, name: str, failure_rate: Optional[float] = None,
+                 min_calls: Optional[int] = None, window: Optional[float] = None,
+                 open_seconds: Optional[float] = None):
+        """
+        Initialize the breaker.
+        
+        Args:
+            name: Provider name, used in log messages
+            failure_rate: Error rate (0-1) at which the circuit opens
+            min_calls: Minimum number of requests in the window before it can open
+            window: Length of the rolling window in seconds
+            open_seconds: Cool-down before a half-open probe is allowed
+        """
+        self.name = name
+        self.failure_rate = CIRCUIT_FAILURE_RATE if failure_rate is None else failure_rate
+        self.min_calls = CIRCUIT_MIN_CALLS if min_calls is None else min_calls
+        self.window = CIRCUIT_WINDOW if window is None else window
+        self.open_seconds = CIRCUIT_OPEN_SECONDS if open_seconds is None else open_seconds
+        
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes = deque()
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        
+        self._times_opened = 0
+        self._rejected = 0
+    
+    @property
+    def state(self) -> str:
+        """The current state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+    
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now >= self._open_until:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+    
+    def is_available(self) -> bool:
+        """Whether a request would currently be allowed (without reserving it)."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == CLOSED or (state == HALF_OPEN and not self._probe_in_flight)
+    
+    def allow_request(self) -> bool:
+        """
+        Ask permission to send a request.
+        
+        In the half-open state only one probe is allowed at a time; the caller
+        must report its outcome with record_success, record_failure or release.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+    
+    def record_success(self) -> None:
+        """Record a request the provider answered (any non-5xx response)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._current_state(now) == HALF_OPEN:
+                logger.info(f"{self.name} circuit closed after a successful probe")
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._add_outcome(now, True)
+    
+    def record_failure(self) -> None:
+        """Record a failed request (connection error, timeout or 5xx response)."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            self._add_outcome(now, False)
+            
+            if state == HALF_OPEN:
+                self._open(now)
+                return
+            
+            if state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, ok in self._outcomes if not ok)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    self._open(now)
+    
+    def release(self) -> None:
+        """Give back a half-open probe slot whose request never completed (e.g. cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the state, the error rate in the current window and counters."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            self._prune(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": state,
+                "window_calls": calls,
+                "window_error_rate": failures / calls if calls else 0.0,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+                "retry_in_seconds": max(0.0, self._open_until - now) if state == OPEN else 0.0
+            }
+    
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._open_until = now + self.open_seconds
+        self._probe_in_flight = False
+        self._times_opened += 1
+        logger.warning(f"{self.name} circuit opened; skipping the provider for {self.open_seconds:g}s")
+    
+    def _add_outcome(self, now: float, ok: bool) -> None:
+        self._outcomes.append((now, ok))
+        self._prune(now)
+    
+    def _prune(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
@@ -3,74 +3,78 @@ Hunter.io Email Verification Service
 API Documentation: https://hunter.io/api-documentation
 """
 import os
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, Iterator
 import logging
 
+from .base_service import BaseVerificationService
+
 logger = logging.getLogger(__name__)
 
-class HunterService:
+# The bulk endpoints and response fields below have not been verified against a
+# live Hunter.io account, so vendor bulk jobs stay off unless explicitly enabled
+HUNTER_BULK_ENABLED = os.getenv("HUNTER_BULK_ENABLED", "false").lower() == "true"
+
+class HunterService(BaseVerificationService):
     """Service class for Hunter.io email verification and email finder."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    provider_name = "hunter"
+    display_name = "Hunter.io"
+    requests_per_second = 10.0
+    burst = 10
+    timeout_budget = 20.0
+    supports_bulk_jobs = HUNTER_BULK_ENABLED
+    
+    def __init__(self, api_key: Optional[str] = None, **pool_options):
         """Initialize Hunter.io service with API key."""
+        super().__init__(**pool_options)
         self.api_key = api_key or os.getenv("HUNTER_API_KEY")
         self.base_url = "https://api.hunter.io/v2"
         
         if not self.api_key:
             logger.warning("Hunter.io API key not provided. Service will not function.")
     
-    def verify_email(self, email: str) -> Dict[str, Any]:
-        """
-        Verify an email address using Hunter.io API.
-        
-        Args:
-            email: The email address to verify
-            
-        Returns:
-            Dict with verification results
-        """
-        if not self.api_key:
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": "API key not provided",
-                "provider": "hunter"
-            }
-        
+    def _build_verify_request(self, email: str):
+        """Build the Hunter.io email-verifier request for an email."""
         endpoint = f"{self.base_url}/email-verifier"
         params = {
             "email": email,
             "api_key": self.api_key
         }
+        return "GET", endpoint, {"params": params}
+    
+    def _parse_verify_response(self, email: str, data: Any) -> Dict[str, Any]:
+        """Process a Hunter.io email-verifier response."""
+        data = data.get("data", {})
+        
+        status = data.get("status")
+        is_valid = status in ["valid", "webmail"]
         
+        # Calculate score based on Hunter's own score and other factors
+        hunter_score = data.get("score", 0)
+        
+        return {
+            "email": email,
+            "is_valid": is_valid,
+            "score": hunter_score,
+            "provider": "hunter",
+            "details": data
+        }
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """Hunter.io's 0-100 score measures confidence; accept_all/unknown are inconclusive."""
+        if result.get("error"):
+            return 0.0
+        details = result.get("details") or {}
+        status = str(details.get("status", "")).lower()
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json().get("data", {})
-            
-            # Process response
-            status = data.get("status")
-            is_valid = status in ["valid", "webmail"]
-            
-            # Calculate score based on Hunter's own score and other factors
-            hunter_score = data.get("score", 0)
-            
-            return {
-                "email": email,
-                "is_valid": is_valid,
-                "score": hunter_score,
-                "provider": "hunter",
-                "details": data
-            }
-        except Exception as e:
-            logger.error(f"Error verifying email with Hunter.io: {str(e)}")
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": str(e),
-                "provider": "hunter"
-            }
+            score = min(max(float(details.get("score") or 0) / 100.0, 0.0), 1.0)
+        except (TypeError, ValueError):
+            score = 0.0
+        if status in ("valid", "webmail"):
+            return score
+        if status == "invalid":
+            return 1.0 - score
+        return 0.0
     
     def email_finder(self, domain: str, first_name: str = None, last_name: str = None, company: str = None) -> Dict[str, Any]:
         """
@@ -102,7 +106,7 @@ class HunterService:
             params["company"] = company
         
         try:
-            response = requests.get(endpoint, params=params)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
@@ -131,20 +135,23 @@ class HunterService:
         }
         
         try:
-            response = requests.get(endpoint, params=params)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
             logger.error(f"Error searching domain with Hunter.io: {str(e)}")
             return {"error": str(e)}
     
-    def bulk_verify(self, emails: list) -> Dict[str, Any]:
+    def bulk_verify(self, emails: Iterable[str]) -> Dict[str, Any]:
         """
-        Verify multiple email addresses.
-        For Hunter.io, we need to use their specific bulk verification API.
+        Submit a bulk email verification request.
+        
+        The emails are written to a CSV file and uploaded to the bulk verification
+        endpoint; results are collected later with get_bulk_job_status and
+        iter_bulk_results.
         
         Args:
-            emails: List of email addresses to verify
+            emails: Email addresses to verify
             
         Returns:
             Dict with verification status/ID
@@ -152,24 +159,131 @@ class HunterService:
         if not self.api_key:
             return {"error": "API key not provided"}
         
-        # For Hunter.io, bulk verification typically requires:
-        # 1. Upload a list (CSV file)
-        # 2. Get a verification ID
-        # 3. Check status
-        # 4. Download results
+        file_obj, count = self._write_bulk_csv(emails)
+        try:
+            result = self.submit_bulk_file(file_obj)
+        finally:
+            file_obj.close()
+        
+        if "error" not in result:
+            result["email_count"] = count
+        return result
+    
+    def submit_bulk_file(self, file_obj) -> Dict[str, Any]:
+        """
+        Upload a CSV file (header row, email in the first column) for bulk verification.
         
-        # This is a simplified implementation - in a production environment
-        # you would need to handle file creation, uploading, and status checks
+        Args:
+            file_obj: Binary file object with the CSV contents
+            
+        Returns:
+            Dict with the vendor response and a normalized job_id
+        """
+        if not self.api_key:
+            return {"error": "API key not provided"}
         
         endpoint = f"{self.base_url}/bulks/verification"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
         try:
-            # Note: In a real implementation, you would need to upload a CSV file
-            # This is a placeholder for demonstration purposes
-            response = requests.post(endpoint, headers=headers)
+            response = self._upload_file(endpoint, file_obj, headers=headers)
             response.raise_for_status()
-            return response.json()
+            data = response.json().get("data", {})
+            
+            if not data.get("id"):
+                raise Exception("No bulk verification ID returned")
+            
+            data["job_id"] = str(data["id"])
+            return data
         except Exception as e:
             logger.error(f"Error submitting bulk verification to Hunter.io: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def check_bulk_status(self, bulk_id: str) -> Dict[str, Any]:
+        """
+        Check the status of a bulk verification.
+        
+        Args:
+            bulk_id: The ID returned from bulk_verify
+            
+        Returns:
+            Dict with status information
+        """
+        if not self.api_key:
+            return {"error": "API key not provided"}
+        
+        endpoint = f"{self.base_url}/bulks/verification/{bulk_id}"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        
+        try:
+            response = self._get(endpoint, headers=headers)
+            response.raise_for_status()
+            return response.json().get("data", {})
+        except Exception as e:
+            logger.error(f"Error checking bulk status on Hunter.io: {str(e)}")
+            return {"error": str(e)}
+    
+    def get_bulk_job_status(self, bulk_id: str) -> Dict[str, Any]:
+        """
+        Get a normalized status for a bulk verification.
+        
+        Args:
+            bulk_id: The ID returned from bulk_verify
+            
+        Returns:
+            Dict with status ('processing', 'completed' or 'failed'), progress and raw details
+        """
+        data = self.check_bulk_status(bulk_id)
+        if "error" in data:
+            return data
+        
+        vendor_status = (data.get("status") or "").lower()
+        if vendor_status in ("completed", "done", "finished"):
+            status = "completed"
+        elif vendor_status in ("failed", "error", "cancelled"):
+            status = "failed"
+        else:
+            status = "processing"
+        
+        progress = data.get("progress")
+        try:
+            progress = float(progress) / 100 if progress is not None else None
+        except (TypeError, ValueError):
+            progress = None
+        
+        return {"status": status, "progress": progress, "details": data}
+    
+    def iter_bulk_results(self, bulk_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the results of a completed bulk verification.
+        
+        Args:
+            bulk_id: The ID returned from bulk_verify
+            
+        Yields:
+            One verification result per email, in the same shape as verify_email
+        """
+        endpoint = f"{self.base_url}/bulks/verification/{bulk_id}/download"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        
+        for row in self._iter_csv_download(endpoint, headers=headers):
+            details = {key.lower().strip(): value for key, value in row.items() if key}
+            email = details.pop("email", None)
+            if not email:
+                continue
+            
+            status = (details.get("status") or details.get("result") or "").lower()
+            is_valid = status in ["valid", "webmail", "deliverable"]
+            
+            try:
+                hunter_score = float(details.get("score") or 0)
+            except ValueError:
+                hunter_score = 0
+            
+            yield {
+                "email": email,
+                "is_valid": is_valid,
+                "score": hunter_score,
+                "provider": "hunter",
+                "details": details
+            }
\ No newline at end of file
@@ -3,41 +3,33 @@ MailboxLayer Email Verification Service
 API Documentation: https://mailboxlayer.com/documentation
 """
 import os
-import requests
 from typing import Dict, Any, Optional
 import logging
 
+from .base_service import BaseVerificationService
+
 logger = logging.getLogger(__name__)
 
-class MailboxLayerService:
+class MailboxLayerService(BaseVerificationService):
     """Service class for MailboxLayer email verification."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    provider_name = "mailboxlayer"
+    display_name = "MailboxLayer"
+    requests_per_second = 5.0
+    burst = 5
+    timeout_budget = 8.0
+    
+    def __init__(self, api_key: Optional[str] = None, **pool_options):
         """Initialize MailboxLayer service with API key."""
+        super().__init__(**pool_options)
         self.api_key = api_key or os.getenv("MAILBOXLAYER_API_KEY")
         self.base_url = "https://api.mailboxlayer.com"
         
         if not self.api_key:
             logger.warning("MailboxLayer API key not provided. Service will not function.")
     
-    def verify_email(self, email: str) -> Dict[str, Any]:
-        """
-        Verify an email address using MailboxLayer API.
-        
-        Args:
-            email: The email address to verify
-            
-        Returns:
-            Dict with verification results
-        """
-        if not self.api_key:
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": "API key not provided",
-                "provider": "mailboxlayer"
-            }
-        
+    def _build_verify_request(self, email: str):
+        """Build the MailboxLayer check request for an email."""
         endpoint = f"{self.base_url}/check"
         params = {
             "access_key": self.api_key,
@@ -45,49 +37,49 @@ class MailboxLayerService:
             "smtp": 1,
             "format": 1
         }
+        return "GET", endpoint, {"params": params}
+    
+    def _parse_verify_response(self, email: str, data: Any) -> Dict[str, Any]:
+        """Process a MailboxLayer check response."""
+        # Check if the response contains error information
+        if "error" in data:
+            raise Exception(data["error"]["info"])
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check if the response contains error information
-            if "error" in data:
-                raise Exception(data["error"]["info"])
-            
-            # Process response
-            # MailboxLayer considers an email valid if format_valid, mx_found, and smtp_check are true
-            is_valid = all([
-                data.get("format_valid", False),
-                data.get("mx_found", False),
-                data.get("smtp_check", False)
-            ])
-            
-            # Calculate score based on various checks
-            score_factors = [
-                data.get("format_valid", False),
-                data.get("mx_found", False),
-                data.get("smtp_check", False),
-                not data.get("disposable", True),
-                not data.get("free", True) if "free" in data else True
-            ]
-            score = sum(1 for factor in score_factors if factor) / len(score_factors)
-            
-            return {
-                "email": email,
-                "is_valid": is_valid,
-                "score": score,
-                "provider": "mailboxlayer",
-                "details": data
-            }
-        except Exception as e:
-            logger.error(f"Error verifying email with MailboxLayer: {str(e)}")
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": str(e),
-                "provider": "mailboxlayer"
-            }
+        # MailboxLayer considers an email valid if format_valid, mx_found, and smtp_check are true
+        is_valid = all([
+            data.get("format_valid", False),
+            data.get("mx_found", False),
+            data.get("smtp_check", False)
+        ])
+        
+        # Calculate score based on various checks
+        score_factors = [
+            data.get("format_valid", False),
+            data.get("mx_found", False),
+            data.get("smtp_check", False),
+            not data.get("disposable", True),
+            not data.get("free", True) if "free" in data else True
+        ]
+        score = sum(1 for factor in score_factors if factor) / len(score_factors)
+        
+        return {
+            "email": email,
+            "is_valid": is_valid,
+            "score": score,
+            "provider": "mailboxlayer",
+            "details": data
+        }
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """A bad format or missing MX is definitive; a failed SMTP check is not."""
+        if result.get("error"):
+            return 0.0
+        details = result.get("details") or {}
+        if not details.get("format_valid", False) or not details.get("mx_found", False):
+            return 1.0
+        if details.get("catch_all"):
+            return 0.0
+        return super().result_confidence(result) if result.get("is_valid") else 0.5
     
     def bulk_verify(self, emails: list) -> Dict[str, list]:
         """
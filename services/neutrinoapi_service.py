@@ -3,17 +3,25 @@ NeutrinoAPI Email Verification Service
 API Documentation: https://www.neutrinoapi.com/api/api-basics/
 """
 import os
-import requests
 from typing import Dict, Any, Optional
 import logging
 
+from .base_service import BaseVerificationService
+
 logger = logging.getLogger(__name__)
 
-class NeutrinoAPIService:
+class NeutrinoAPIService(BaseVerificationService):
     """Service class for NeutrinoAPI email verification."""
     
-    def __init__(self, user_id: Optional[str] = None, api_key: Optional[str] = None):
+    provider_name = "neutrinoapi"
+    display_name = "NeutrinoAPI"
+    requests_per_second = 10.0
+    burst = 10
+    timeout_budget = 8.0
+    
+    def __init__(self, user_id: Optional[str] = None, api_key: Optional[str] = None, **pool_options):
         """Initialize NeutrinoAPI service with credentials."""
+        super().__init__(**pool_options)
         self.user_id = user_id or os.getenv("NEUTRINOAPI_USER_ID")
         self.api_key = api_key or os.getenv("NEUTRINOAPI_API_KEY")
         self.base_url = "https://neutrinoapi.net"
@@ -21,24 +29,14 @@ class NeutrinoAPIService:
         if not (self.api_key and self.user_id):
             logger.warning("NeutrinoAPI credentials not provided. Service will not function.")
     
-    def verify_email(self, email: str) -> Dict[str, Any]:
-        """
-        Verify an email address using NeutrinoAPI.
-        
-        Args:
-            email: The email address to verify
-            
-        Returns:
-            Dict with verification results
-        """
+    def _credentials_error(self) -> Optional[str]:
+        """NeutrinoAPI needs both a user ID and an API key."""
         if not (self.api_key and self.user_id):
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": "API credentials not provided",
-                "provider": "neutrinoapi"
-            }
-        
+            return "API credentials not provided"
+        return None
+    
+    def _build_verify_request(self, email: str):
+        """Build the NeutrinoAPI email-validate request for an email."""
         endpoint = f"{self.base_url}/email-validate"
         headers = {
             "User-ID": self.user_id,
@@ -46,41 +44,39 @@ class NeutrinoAPIService:
             "Content-Type": "application/json"
         }
         data = {"email": email}
+        return "POST", endpoint, {"json": data, "headers": headers}
+    
+    def _parse_verify_response(self, email: str, result: Any) -> Dict[str, Any]:
+        """Process a NeutrinoAPI email-validate response."""
+        is_valid = result.get("valid", False)
         
-        try:
-            response = requests.post(endpoint, json=data, headers=headers)
-            response.raise_for_status()
-            result = response.json()
-            
-            # Process response
-            is_valid = result.get("valid", False)
-            
-            # Calculate a score based on the verification results
-            score_factors = [
-                result.get("valid", False),
-                result.get("syntax.valid", False),
-                not result.get("disposable", True),
-                result.get("domain.exists", False),
-                result.get("domain.has-mx", False),
-                not result.get("is-freemail", True) if "is-freemail" in result else True
-            ]
-            score = sum(1 for factor in score_factors if factor) / len(score_factors)
-            
-            return {
-                "email": email,
-                "is_valid": is_valid,
-                "score": score,
-                "provider": "neutrinoapi",
-                "details": result
-            }
-        except Exception as e:
-            logger.error(f"Error verifying email with NeutrinoAPI: {str(e)}")
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": str(e),
-                "provider": "neutrinoapi"
-            }
+        # Calculate a score based on the verification results
+        score_factors = [
+            result.get("valid", False),
+            result.get("syntax.valid", False),
+            not result.get("disposable", True),
+            result.get("domain.exists", False),
+            result.get("domain.has-mx", False),
+            not result.get("is-freemail", True) if "is-freemail" in result else True
+        ]
+        score = sum(1 for factor in score_factors if factor) / len(score_factors)
+        
+        return {
+            "email": email,
+            "is_valid": is_valid,
+            "score": score,
+            "provider": "neutrinoapi",
+            "details": result
+        }
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """Syntax and domain failures are definitive; other invalid verdicts are not."""
+        if result.get("error"):
+            return 0.0
+        details = result.get("details") or {}
+        if not details.get("syntax.valid", True) or not details.get("domain.exists", True):
+            return 1.0
+        return super().result_confidence(result) if result.get("is_valid") else 0.5
     
     def email_validation_and_verification(self, email: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,148 @@
+"""
+Token-bucket rate limiting for verification providers.
+
+Each provider owns one bucket. Callers reserve a token before every request
+and wait (rather than fail) until the bucket refills, so bulk runs settle at
+the vendor's sustainable throughput instead of producing 429 error rows.
+"""
+import time
+import asyncio
+import threading
+import email.utils
+from typing import Dict, Any, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by the sync and async request paths."""
+    
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate: Tokens added per second (sustained requests/second); 0 disables throttling
+            burst: Maximum number of tokens the bucket can hold
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        
+        self._acquired = 0
+        self._throttled = 0
+        self._deferrals = 0
+        self._total_wait = 0.0
+    
+    def _reserve(self) -> float:
+        """
+        Take a token and return how long the caller must wait before using it.
+        
+        Tokens may go negative: each caller queues behind the ones before it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = -self._tokens / self.rate
+            wait = max(wait, self._blocked_until - now)
+            
+            self._acquired += 1
+            if wait > 0:
+                self._throttled += 1
+                self._total_wait += wait
+            return wait
+    
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the time spent waiting."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self) -> float:
+        """Wait without blocking the event loop until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def defer(self, seconds: float) -> None:
+        """Pause the bucket for the given number of seconds (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, seconds))
+            self._deferrals += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bucket configuration and throttling counters."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "deferrals": self._deferrals,
+                "total_wait_seconds": self._total_wait,
+                "blocked_for_seconds": max(0.0, self._blocked_until - time.monotonic())
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds.
+    
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def parse_quota_reset(headers) -> Optional[float]:
+    """
+    Get the seconds until the quota resets when the provider reports it is exhausted.
+    
+    Understands the common X-RateLimit-Remaining / X-RateLimit-Reset headers;
+    the reset value may be delta-seconds or a Unix timestamp.
+    
+    Args:
+        headers: Response headers (case-insensitive mapping)
+    
+    Returns:
+        Seconds to wait, or None if quota is not exhausted or not reported
+    """
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        if int(float(remaining)) > 0:
+            return None
+        reset = float(reset)
+    except ValueError:
+        return None
+    # Values larger than a day are Unix timestamps rather than deltas
+    if reset > 86400:
+        reset -= time.time()
+    return max(0.0, reset)
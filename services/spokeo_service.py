@@ -3,75 +3,61 @@ Spokeo Email Verification Service
 API Documentation: https://www.spokeo.com/
 """
 import os
-import requests
 from typing import Dict, Any, Optional
 import logging
 
+from .base_service import BaseVerificationService
+
 logger = logging.getLogger(__name__)
 
-class SpokeoService:
+class SpokeoService(BaseVerificationService):
     """Service class for Spokeo people search and email verification."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    provider_name = "spokeo"
+    display_name = "Spokeo"
+    requests_per_second = 2.0
+    burst = 2
+    timeout_budget = 15.0
+    
+    def __init__(self, api_key: Optional[str] = None, **pool_options):
         """Initialize Spokeo service with API key."""
+        super().__init__(**pool_options)
         self.api_key = api_key or os.getenv("SPOKEO_API_KEY")
         self.base_url = "https://www.spokeo.com/api"
         
         if not self.api_key:
             logger.warning("Spokeo API key not provided. Service will not function.")
     
-    def verify_email(self, email: str) -> Dict[str, Any]:
-        """
-        Verify an email address using Spokeo API.
-        
-        Args:
-            email: The email address to verify
-            
-        Returns:
-            Dict with verification results
-        """
-        if not self.api_key:
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": "API key not provided",
-                "provider": "spokeo"
-            }
-        
+    def _build_verify_request(self, email: str):
+        """Build the Spokeo email search request for an email."""
         # Note: This is a placeholder implementation.
         # Spokeo does not have a public API specifically for email verification.
         # Actual implementation would need to be based on Spokeo's API documentation
         # when available or through their partnership program.
-        
         endpoint = f"{self.base_url}/search/email"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         params = {"email": email}
+        return "GET", endpoint, {"headers": headers, "params": params}
+    
+    def _parse_verify_response(self, email: str, data: Any) -> Dict[str, Any]:
+        """Process a Spokeo email search response."""
+        # Mock processing of response - actual implementation would parse real response data
+        # Assuming Spokeo returns some indication of email validity and profile data
+        is_valid = data.get("found", False) if isinstance(data, dict) else False
         
-        try:
-            # This is a simulated request - actual implementation would use real endpoints
-            response = requests.get(endpoint, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Mock processing of response - actual implementation would parse real response data
-            # Assuming Spokeo returns some indication of email validity and profile data
-            is_valid = data.get("found", False) if isinstance(data, dict) else False
-            
-            return {
-                "email": email,
-                "is_valid": is_valid,
-                "score": 1.0 if is_valid else 0.0,
-                "provider": "spokeo",
-                "details": data if isinstance(data, dict) else {}
-            }
-        except Exception as e:
-            logger.error(f"Error verifying email with Spokeo: {str(e)}")
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": str(e),
-                "provider": "spokeo"
-            }
+        return {
+            "email": email,
+            "is_valid": is_valid,
+            "score": 1.0 if is_valid else 0.0,
+            "provider": "spokeo",
+            "details": data if isinstance(data, dict) else {}
+        }
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """A people-search hit suggests the address is real; a miss says nothing."""
+        if result.get("error") or not result.get("is_valid"):
+            return 0.0
+        return 0.6
     
     def get_person_info(self, email: str) -> Dict[str, Any]:
         """
@@ -94,7 +80,7 @@ class SpokeoService:
         params = {"email": email}
         
         try:
-            response = requests.get(endpoint, headers=headers, params=params)
+            response = self._get(endpoint, headers=headers, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -3,72 +3,64 @@ ZeroBounce Email Verification Service
 API Documentation: https://www.zerobounce.net/services/
 """
 import os
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, Iterator
 import logging
 
+from .base_service import BaseVerificationService
+
 logger = logging.getLogger(__name__)
 
-class ZeroBounceService:
+class ZeroBounceService(BaseVerificationService):
     """Service class for ZeroBounce email verification."""
     
-    def __init__(self, api_key: Optional[str] = None):
+    provider_name = "zerobounce"
+    display_name = "ZeroBounce"
+    requests_per_second = 50.0
+    burst = 50
+    timeout_budget = 10.0
+    supports_bulk_jobs = True
+    
+    def __init__(self, api_key: Optional[str] = None, **pool_options):
         """Initialize ZeroBounce service with API key."""
+        super().__init__(**pool_options)
         self.api_key = api_key or os.getenv("ZEROBOUNCE_API_KEY")
         self.base_url = "https://api.zerobounce.net/v2"
+        self.bulk_url = "https://bulkapi.zerobounce.net/v2"
         
         if not self.api_key:
             logger.warning("ZeroBounce API key not provided. Service will not function.")
     
-    def verify_email(self, email: str) -> Dict[str, Any]:
-        """
-        Verify an email address using ZeroBounce API.
-        
-        Args:
-            email: The email address to verify
-            
-        Returns:
-            Dict with verification results
-        """
-        if not self.api_key:
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": "API key not provided",
-                "provider": "zerobounce"
-            }
-        
+    def _build_verify_request(self, email: str):
+        """Build the ZeroBounce validate request for an email."""
         endpoint = f"{self.base_url}/validate"
         params = {
             "api_key": self.api_key,
             "email": email,
             "ip_address": ""  # Optional parameter
         }
+        return "GET", endpoint, {"params": params}
+    
+    def _parse_verify_response(self, email: str, data: Any) -> Dict[str, Any]:
+        """Process a ZeroBounce validate response."""
+        status = data.get("status")
+        is_valid = status == "valid"
         
-        try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Process response
-            status = data.get("status")
-            is_valid = status == "valid"
-            
-            return {
-                "email": email,
-                "is_valid": is_valid,
-                "score": 1.0 if is_valid else 0.0,
-                "provider": "zerobounce",
-                "details": data
-            }
-        except Exception as e:
-            logger.error(f"Error verifying email with ZeroBounce: {str(e)}")
-            return {
-                "email": email,
-                "is_valid": None,
-                "error": str(e),
-                "provider": "zerobounce"
-            }
+        return {
+            "email": email,
+            "is_valid": is_valid,
+            "score": 1.0 if is_valid else 0.0,
+            "provider": "zerobounce",
+            "details": data
+        }
+    
+    def result_confidence(self, result: Dict[str, Any]) -> float:
+        """ZeroBounce statuses are definitive except catch-all and unknown."""
+        if result.get("error"):
+            return 0.0
+        status = str((result.get("details") or {}).get("status", "")).lower()
+        if status in ("valid", "invalid", "spamtrap", "abuse", "do_not_mail"):
+            return 1.0
+        return 0.0
     
     def get_credits(self) -> Dict[str, Any]:
         """Get the number of credits remaining in the account."""
@@ -79,39 +71,69 @@ class ZeroBounceService:
         params = {"api_key": self.api_key}
         
         try:
-            response = requests.get(endpoint, params=params)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Error getting ZeroBounce credits: {str(e)}")
             return {"error": str(e)}
     
-    def bulk_verify(self, emails: list) -> Dict[str, Any]:
+    def bulk_verify(self, emails: Iterable[str]) -> Dict[str, Any]:
         """
         Submit a bulk email verification request.
         
+        The emails are written to a CSV file and uploaded to the bulk API;
+        results are collected later with get_bulk_job_status and iter_bulk_results.
+        
         Args:
-            emails: List of email addresses to verify
+            emails: Email addresses to verify
             
         Returns:
-            Dict with file_id for status checking
+            Dict with file_id/job_id for status checking
         """
         if not self.api_key:
             return {"error": "API key not provided"}
         
-        endpoint = f"{self.base_url}/bulkvalidation"
+        file_obj, count = self._write_bulk_csv(emails)
+        try:
+            result = self.submit_bulk_file(file_obj)
+        finally:
+            file_obj.close()
+        
+        if "error" not in result:
+            result["email_count"] = count
+        return result
+    
+    def submit_bulk_file(self, file_obj) -> Dict[str, Any]:
+        """
+        Upload a CSV file (header row, email in the first column) to the bulk API.
+        
+        Args:
+            file_obj: Binary file object with the CSV contents
+            
+        Returns:
+            Dict with the vendor response and a normalized job_id
+        """
+        if not self.api_key:
+            return {"error": "API key not provided"}
         
-        # Prepare the data for bulk validation
-        # This is simplified - in production you would need to handle file uploads
-        data = {
+        endpoint = f"{self.bulk_url}/sendfile"
+        fields = {
             "api_key": self.api_key,
-            "email_batch": emails
+            "email_address_column": "1",
+            "has_header_row": "true"
         }
         
         try:
-            response = requests.post(endpoint, json=data)
+            response = self._upload_file(endpoint, file_obj, fields=fields)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            
+            if not data.get("success", True) or not data.get("file_id"):
+                raise Exception(data.get("message") or data.get("error") or "Upload rejected")
+            
+            data["job_id"] = data["file_id"]
+            return data
         except Exception as e:
             logger.error(f"Error submitting bulk verification to ZeroBounce: {str(e)}")
             return {"error": str(e)}
@@ -129,16 +151,84 @@ class ZeroBounceService:
         if not self.api_key:
             return {"error": "API key not provided"}
         
-        endpoint = f"{self.base_url}/getfile"
+        endpoint = f"{self.bulk_url}/filestatus"
         params = {
             "api_key": self.api_key,
             "file_id": file_id
         }
         
         try:
-            response = requests.get(endpoint, params=params)
+            response = self._get(endpoint, params=params)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             logger.error(f"Error checking bulk status on ZeroBounce: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+    
+    def get_bulk_job_status(self, file_id: str) -> Dict[str, Any]:
+        """
+        Get a normalized status for a bulk file.
+        
+        Args:
+            file_id: The file ID returned from bulk_verify
+            
+        Returns:
+            Dict with status ('processing', 'completed' or 'failed'), progress and raw details
+        """
+        data = self.check_bulk_status(file_id)
+        if "error" in data:
+            return data
+        
+        file_status = (data.get("file_status") or "").lower()
+        progress = str(data.get("complete_percentage") or "0").rstrip("%")
+        
+        if file_status == "complete":
+            status = "completed"
+        elif file_status in ("deleted", "failed", "error") or data.get("success") is False:
+            status = "failed"
+        else:
+            status = "processing"
+        
+        try:
+            progress = float(progress) / 100
+        except ValueError:
+            progress = None
+        
+        return {"status": status, "progress": progress, "details": data}
+    
+    def iter_bulk_results(self, file_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the result file of a completed bulk request.
+        
+        Args:
+            file_id: The file ID returned from bulk_verify
+            
+        Yields:
+            One verification result per email, in the same shape as verify_email
+        """
+        endpoint = f"{self.bulk_url}/getfile"
+        params = {
+            "api_key": self.api_key,
+            "file_id": file_id
+        }
+        
+        for row in self._iter_csv_download(endpoint, params=params):
+            details = {
+                key.lower().replace("zb ", "").strip().replace(" ", "_"): value
+                for key, value in row.items() if key
+            }
+            email = details.pop("email", None) or next(iter(row.values()), None)
+            if not email:
+                continue
+            
+            status = (details.get("status") or "").lower()
+            details["status"] = status
+            is_valid = status == "valid"
+            
+            yield {
+                "email": email,
+                "is_valid": is_valid,
+                "score": 1.0 if is_valid else 0.0,
+                "provider": "zerobounce",
+                "details": details
+            }
\ No newline at end of file
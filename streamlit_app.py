@@ -46,6 +46,8 @@ try:
         except Exception as e:
             print(f"Database initialization error: {str(e)}")
             st.error(f"Database error: {str(e)}")
+            # Never serve against a schema with pending migrations
+            st.stop()
     except Exception as e:
         st.error(f"Failed to import database module: {str(e)}")
     
@@ -0,0 +1,18 @@
+"""
+Unit tests, run against a throwaway SQLite database:
+
+    python -m unittest discover -s tests -t .
+"""
+import os
+import tempfile
+
+# Set before anything imports database, which connects on import
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+
+def reset_database(create=True):
+    """Drop every table, then recreate them unless create is False."""
+    from database import Base, engine
+    Base.metadata.drop_all(bind=engine)
+    if create:
+        Base.metadata.create_all(bind=engine)
@@ -0,0 +1,46 @@
+"""
+Tests for disposable-domain and role-address detection.
+"""
+import os
+import tempfile
+import unittest
+
+from address_index import AddressIndex, load_entries, skipped_address_result
+
+
+class AddressIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = AddressIndex(disposable_domains=["Mailinator.com"], role_prefixes=["info", "no-reply"])
+    
+    def test_disposable_matches_parent_domains(self):
+        self.assertTrue(self.index.is_disposable_domain("mailinator.com"))
+        self.assertTrue(self.index.is_disposable_domain("eu.MAILINATOR.com."))
+        self.assertFalse(self.index.is_disposable_domain("notmailinator.com"))
+        self.assertFalse(self.index.is_disposable_domain("com"))
+    
+    def test_role_ignores_case_and_tags(self):
+        self.assertEqual(self.index.classify("Info+Sales@example.com"), {"disposable": False, "role": True})
+        self.assertEqual(self.index.classify("no-reply@mailinator.com"), {"disposable": True, "role": True})
+        self.assertEqual(self.index.classify("information@example.com"), {"disposable": False, "role": False})
+    
+    def test_load_entries(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# comment\n\nExample.COM\n  spaced.example  \n")
+        self.addCleanup(os.remove, f.name)
+        
+        self.assertEqual(load_entries(f.name), frozenset({"example.com", "spaced.example"}))
+        with self.assertLogs("address_index", level="WARNING"):
+            self.assertEqual(load_entries(f.name + ".missing"), frozenset())
+    
+    def test_bundled_data_files_load(self):
+        stats = AddressIndex().get_stats()
+        self.assertGreater(stats["disposable_domains"], 0)
+        self.assertGreater(stats["role_prefixes"], 0)
+    
+    def test_skipped_address_result(self):
+        self.assertFalse(skipped_address_result("a@mailinator.com", "disposable")["is_valid"])
+        self.assertIsNone(skipped_address_result("info@example.com", "role")["is_valid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+"""
+Tests for choosing the providers that run vendor bulk jobs.
+"""
+import unittest
+
+from bulk_job_manager import BulkJobManager
+from services.hunter_service import HunterService
+from services.zerobounce_service import ZeroBounceService
+
+
+class BulkServicesTest(unittest.TestCase):
+    def test_hunter_bulk_jobs_are_off_by_default(self):
+        services = {"hunter": HunterService(api_key="key"), "zerobounce": ZeroBounceService(api_key="key")}
+        manager = BulkJobManager(services, writer=object())
+        
+        self.assertEqual(manager.get_bulk_services(), ["zerobounce"])
+        self.assertIn("error", manager.submit_job("hunter", ["a@example.com"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
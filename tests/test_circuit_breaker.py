@@ -0,0 +1,125 @@
+"""
+Tests for per-provider circuit breakers.
+"""
+import asyncio
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:
+    web = None
+
+from services.base_service import BaseVerificationService
+from services.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def _breaker(self, **kwargs):
+        options = {"failure_rate": 0.5, "min_calls": 2, "window": 60, "open_seconds": 0}
+        options.update(kwargs)
+        return CircuitBreaker("test", **options)
+    
+    def test_opens_at_the_failure_rate(self):
+        breaker = self._breaker(open_seconds=60)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow_request())
+        self.assertEqual(breaker.get_stats()["rejected"], 1)
+    
+    def test_needs_min_calls_before_opening(self):
+        breaker = self._breaker(min_calls=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+    
+    def test_half_open_admits_one_probe(self):
+        breaker = self._breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+    
+    def test_probe_outcome_closes_or_reopens(self):
+        breaker = self._breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        
+        breaker = self._breaker(open_seconds=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker._open_until = 0.0
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+    
+    def test_release_frees_the_probe(self):
+        breaker = self._breaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.release()
+        self.assertTrue(breaker.allow_request())
+
+
+class ProbeService(BaseVerificationService):
+    provider_name = "probe"
+    display_name = "Probe"
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class AsyncProbeTest(unittest.TestCase):
+    """A half-open probe that fails with an unexpected exception must not leave the circuit stuck."""
+    
+    def _half_open_service(self):
+        service = ProbeService()
+        service.circuit_breaker = CircuitBreaker("probe", failure_rate=0.5, min_calls=1, window=60, open_seconds=0)
+        service.circuit_breaker.record_failure()
+        self.assertEqual(service.circuit_breaker.state, HALF_OPEN)
+        return service
+    
+    def test_invalid_url_releases_the_probe(self):
+        service = self._half_open_service()
+        
+        async def run():
+            try:
+                with self.assertRaises(Exception):
+                    await service._arequest_json("GET", "not a url")
+            finally:
+                await service.aclose()
+        
+        asyncio.run(run())
+        self.assertTrue(service.circuit_breaker.is_available())
+    
+    def test_undecodable_body_does_not_block_the_circuit(self):
+        service = self._half_open_service()
+        
+        async def handler(request):
+            return web.Response(text="not json", content_type="application/json")
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get("/", handler)
+            server = TestServer(app)
+            await server.start_server()
+            try:
+                with self.assertRaises(ValueError):
+                    await service._arequest_json("GET", str(server.make_url("/")))
+            finally:
+                await service.aclose()
+                await server.close()
+        
+        asyncio.run(run())
+        # The provider answered, so the probe closed the circuit
+        self.assertEqual(service.circuit_breaker.state, CLOSED)
+        self.assertTrue(service.circuit_breaker.allow_request())
+
+
+if __name__ == "__main__":
+    unittest.main()
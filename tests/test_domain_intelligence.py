@@ -0,0 +1,86 @@
+"""
+Tests for per-domain verdicts and dead-domain short-circuiting.
+"""
+import unittest
+
+from domain_intelligence import (DomainIntelligence, StubResolver, DnsLookupError,
+                                 extract_domain_facts)
+from tests import reset_database
+
+RECORDS = {
+    "example.com": {"mx": ["mx.example.com"], "a": ["192.0.2.1"]},
+    "a-only.example": {"mx": [], "a": ["192.0.2.2"]},
+    "parked.example": {"mx": [], "a": []}
+}
+
+
+class FailingResolver:
+    def lookup(self, domain):
+        raise DnsLookupError("SERVFAIL")
+
+
+class DomainIntelligenceTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        self.resolver = StubResolver(RECORDS)
+        self.domains = DomainIntelligence(resolver=self.resolver, enabled=True)
+    
+    def test_dead_domains_are_answered_locally(self):
+        self.assertIsNone(self.domains.check_email("user@example.com"))
+        # No MX, but the A record still receives mail (RFC 5321 fallback)
+        self.assertIsNone(self.domains.check_email("user@a-only.example"))
+        
+        result = self.domains.check_email("user@parked.example")
+        self.assertFalse(result["is_valid"])
+        self.assertEqual(result["details"]["reason"], "no_mx")
+        self.assertEqual(self.domains.check_email("user@missing.example")["details"]["reason"],
+                         "domain_not_found")
+        self.assertEqual(self.domains.get_stats()["short_circuited"], 2)
+    
+    def test_each_domain_is_resolved_once(self):
+        self.domains.prefetch(["example.com", "EXAMPLE.com", "parked.example", ""])
+        self.domains.check_email("a@example.com")
+        self.domains.check_email("b@example.com")
+        
+        self.assertEqual(self.resolver.lookups, 2)
+    
+    def test_verdicts_are_shared_through_the_database(self):
+        self.domains.get_verdict("parked.example")
+        
+        other = DomainIntelligence(resolver=StubResolver(), enabled=True)
+        self.assertTrue(other.is_dead(other.get_verdict("parked.example")))
+        self.assertEqual(other.resolver.lookups, 0)
+        self.assertEqual(other.get_stats()["database_hits"], 1)
+    
+    def test_lookup_failure_never_short_circuits(self):
+        domains = DomainIntelligence(resolver=FailingResolver(), use_database=False, enabled=True)
+        with self.assertLogs("domain_intelligence", level="WARNING"):
+            self.assertIsNone(domains.check_email("user@example.com"))
+        self.assertEqual(domains.get_stats()["lookup_errors"], 1)
+    
+    def test_disabled(self):
+        domains = DomainIntelligence(resolver=self.resolver, enabled=False)
+        self.assertIsNone(domains.check_email("user@missing.example"))
+        self.assertEqual(self.resolver.lookups, 0)
+    
+    def test_provider_results_teach_domain_facts(self):
+        verdict = self.domains.record_provider_result({
+            "email": "user@catchall.example",
+            "details": {"mx_found": "true", "catch_all": True, "sub_status": "disposable"}
+        })
+        self.assertTrue(verdict["has_mx"])
+        self.assertTrue(verdict["is_catch_all"])
+        self.assertTrue(verdict["is_disposable"])
+        # Nothing new to learn the second time
+        self.assertIsNone(self.domains.record_provider_result({
+            "email": "other@catchall.example", "details": {"accept_all": 1}
+        }))
+    
+    def test_extract_domain_facts(self):
+        self.assertEqual(extract_domain_facts({"domain.has-mx": False, "domain.exists": "yes"}),
+                         {"has_mx": False, "exists": True})
+        self.assertEqual(extract_domain_facts({"status": "valid"}), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
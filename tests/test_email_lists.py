@@ -0,0 +1,98 @@
+"""
+Tests for list imports, membership and maintained entry counts.
+"""
+import os
+import csv
+import tempfile
+import threading
+import unittest
+
+from tests import reset_database
+from database import EmailListEntry, get_db
+from email_list_manager import EmailListManager
+
+
+class EmailListTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        self.lists = EmailListManager()
+        self.list_id = self.lists.create_list("customers")["list_id"]
+    
+    def _csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", newline="") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=["email", "first_name", "company"])
+            writer.writeheader()
+            writer.writerows(rows)
+        self.addCleanup(os.unlink, path)
+        return path
+    
+    def _count(self):
+        return next(l for l in self.lists.get_lists() if l["list_id"] == self.list_id)["email_count"]
+    
+    def _entries(self):
+        session = next(get_db())
+        try:
+            return {
+                entry.email.lower(): entry for entry in
+                session.query(EmailListEntry).filter(EmailListEntry.list_id == self.list_id)
+            }
+        finally:
+            session.close()
+    
+    def test_chunked_import_counts_duplicates_as_updates(self):
+        path = self._csv([
+            {"email": "a@example.com", "first_name": "Ann"},
+            {"email": "b@example.com"},
+            {"email": "A@Example.com", "company": "Acme"},
+            {"email": ""},
+            {"email": "c@example.com"},
+            {"email": "b@example.com", "first_name": "Bob"}
+        ])
+        
+        result = self.lists.import_from_csv(self.list_id, path, chunk_size=2)
+        
+        self.assertEqual((result["added"], result["updated"], result["errors"]), (3, 2, 1))
+        self.assertEqual(self._count(), 3)
+        entries = self._entries()
+        self.assertEqual(set(entries), {"a@example.com", "b@example.com", "c@example.com"})
+        # Later rows only fill in the fields they have
+        self.assertEqual((entries["a@example.com"].first_name, entries["a@example.com"].company), ("Ann", "Acme"))
+        self.assertEqual(entries["b@example.com"].first_name, "Bob")
+    
+    def test_reimport_adds_nothing(self):
+        path = self._csv([{"email": "a@example.com"}, {"email": "b@example.com"}])
+        self.lists.import_from_csv(self.list_id, path)
+        result = self.lists.import_from_csv(self.list_id, path)
+        
+        self.assertEqual((result["added"], result["updated"]), (0, 2))
+        self.assertEqual(self._count(), 2)
+    
+    def test_membership_is_case_insensitive(self):
+        self.assertTrue(self.lists.add_email_to_list(self.list_id, "a@example.com")["added"])
+        self.assertTrue(self.lists.add_email_to_list(self.list_id, "A@EXAMPLE.COM", first_name="Ann")["updated"])
+        self.assertEqual(self._count(), 1)
+        
+        self.lists.remove_email_from_list(self.list_id, "A@example.com")
+        self.assertEqual(self._count(), 0)
+    
+    def test_concurrent_imports_keep_the_count_exact(self):
+        path = self._csv([{"email": f"user{i}@example.com"} for i in range(200)])
+        results = []
+        
+        def run():
+            results.append(EmailListManager().import_from_csv(self.list_id, path, chunk_size=20))
+        
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sum(result["added"] for result in results), 200)
+        self.assertEqual(self._count(), 200)
+        self.assertEqual(len(self._entries()), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
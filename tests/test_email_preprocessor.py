@@ -0,0 +1,73 @@
+"""
+Tests for address normalization, deduplication and the local pre-filter.
+"""
+import unittest
+
+from address_index import AddressIndex
+from email_preprocessor import (EmailPreprocessor, normalize_email, dedupe_key,
+                                is_valid_syntax, merge_stats)
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_domain_is_lowercased_local_part_kept(self):
+        self.assertEqual(normalize_email("  John.Doe@Example.COM \n"), "John.Doe@example.com")
+        self.assertEqual(normalize_email(None), "")
+        self.assertEqual(normalize_email("no-at-sign"), "no-at-sign")
+    
+    def test_dedupe_key_ignores_case(self):
+        self.assertEqual(dedupe_key("John.Doe@Example.com"), dedupe_key(" john.doe@EXAMPLE.com"))
+    
+    def test_syntax(self):
+        for email in ("a@example.com", "first.last+tag@sub.example.co.uk", '"a b"@example.com',
+                      "user@[192.168.0.1]", "user@xn--bcher-kva.example", "user@bücher.example"):
+            self.assertTrue(is_valid_syntax(email), email)
+        for email in ("", "plain", "a@b", "a..b@example.com", ".a@example.com", "a@-example.com",
+                      "a@example.c0m", "x" * 65 + "@example.com", "a@" + "b" * 250 + ".com"):
+            self.assertFalse(is_valid_syntax(email), email)
+
+
+class EmailPreprocessorTest(unittest.TestCase):
+    def setUp(self):
+        index = AddressIndex(disposable_domains=["mailinator.com"], role_prefixes=["info", "admin"])
+        self.preprocessor = EmailPreprocessor(index=index, skip_disposable=True, skip_role=False)
+    
+    def test_process(self):
+        result = self.preprocessor.process([
+            "Alice@Example.com", "alice@EXAMPLE.com", "", "not-an-email",
+            "bob@sub.mailinator.com", "info+sales@example.com", None
+        ], providers_per_email=2)
+        
+        self.assertEqual(result["valid"], ["Alice@example.com", "info+sales@example.com"])
+        self.assertEqual(result["invalid"], ["not-an-email"])
+        self.assertEqual(result["skipped"], ["bob@sub.mailinator.com"])
+        self.assertEqual([item["email"] for item in result["ordered"]],
+                         ["Alice@example.com", "not-an-email", "bob@sub.mailinator.com", "info+sales@example.com"])
+        self.assertEqual(result["ordered"][2]["skip_reason"], "disposable")
+        self.assertTrue(result["ordered"][3]["role"])
+        
+        stats = result["stats"]
+        self.assertEqual(stats["total"], 7)
+        self.assertEqual(stats["unique"], 4)
+        self.assertEqual(stats["duplicates"], 1)
+        self.assertEqual(stats["blank"], 2)
+        self.assertEqual(stats["invalid_syntax"], 1)
+        self.assertEqual(stats["disposable"], 1)
+        self.assertEqual(stats["role"], 1)
+        # duplicate, invalid and disposable addresses, two providers each
+        self.assertEqual(stats["api_calls_saved"], 6)
+        self.assertAlmostEqual(stats["skipped_ratio"], 5 / 7)
+    
+    def test_seen_dedupes_across_batches(self):
+        seen = set()
+        first = self.preprocessor.process(["a@example.com", "b@example.com"], seen=seen)
+        second = self.preprocessor.process(["B@EXAMPLE.com", "c@example.com"], seen=seen)
+        
+        self.assertEqual(second["valid"], ["c@example.com"])
+        merged = merge_stats(merge_stats({}, first["stats"]), second["stats"])
+        self.assertEqual(merged["total"], 4)
+        self.assertEqual(merged["duplicates"], 1)
+        self.assertAlmostEqual(merged["skipped_ratio"], 1 / 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
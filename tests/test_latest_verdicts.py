@@ -0,0 +1,83 @@
+"""
+Tests for merging verification results into the latest verdicts.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from database import EmailVerification, engine
+from latest_verdicts import (update_latest_verdicts, get_latest_verdicts,
+                             rebuild_latest_verdicts, aggregate_verdict)
+from tests import reset_database
+
+
+def row(provider, is_valid, age=timedelta(0), email="user@example.com", score=None):
+    return {"email": email, "provider": provider, "is_valid": is_valid,
+            "score": score, "details": {"status": "checked"},
+            "verification_date": datetime.utcnow() - age}
+
+
+class LatestVerdictsTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+    
+    def latest(self, email="user@example.com"):
+        return get_latest_verdicts([email])[email.lower()]
+    
+    def test_older_result_does_not_overwrite_newer(self):
+        update_latest_verdicts([row("hunter", True)])
+        update_latest_verdicts([row("hunter", False, age=timedelta(days=1))])
+        
+        self.assertTrue(self.latest()["providers"]["hunter"]["is_valid"])
+        
+        update_latest_verdicts([row("hunter", False)])
+        self.assertFalse(self.latest()["providers"]["hunter"]["is_valid"])
+    
+    def test_newest_row_wins_within_one_batch(self):
+        update_latest_verdicts([row("hunter", True), row("hunter", False, age=timedelta(hours=1))])
+        self.assertTrue(self.latest()["providers"]["hunter"]["is_valid"])
+    
+    def test_errors_never_replace_a_result(self):
+        update_latest_verdicts([row("hunter", True, age=timedelta(hours=1))])
+        error = row("hunter", None)
+        error["details"] = None
+        self.assertEqual(update_latest_verdicts([error]), 0)
+        
+        self.assertTrue(self.latest()["providers"]["hunter"]["is_valid"])
+    
+    def test_providers_merge_case_insensitively_into_one_verdict(self):
+        update_latest_verdicts([row("hunter", True, score=0.9)])
+        update_latest_verdicts([row("zerobounce", False, email="User@EXAMPLE.com", score=0.3)])
+        
+        latest = self.latest()
+        self.assertEqual(sorted(latest["providers"]), ["hunter", "zerobounce"])
+        self.assertEqual(latest["provider_count"], 2)
+        self.assertAlmostEqual(latest["score"], 0.6)
+        # A tie counts as valid
+        self.assertTrue(latest["is_valid"])
+    
+    def test_aggregate_verdict(self):
+        self.assertEqual(aggregate_verdict({}), {"is_valid": None, "score": None})
+        verdict = aggregate_verdict({"a": {"is_valid": False}, "b": {"is_valid": False}, "c": {"is_valid": True}})
+        self.assertFalse(verdict["is_valid"])
+    
+    def test_rebuild_from_history(self):
+        history = [
+            row("hunter", False, age=timedelta(days=2)),
+            row("hunter", True, age=timedelta(days=1)),
+            row("zerobounce", None, age=timedelta(hours=1)),
+            row("hunter", True, email="other@example.com")
+        ]
+        history[2]["details"] = None
+        with engine.begin() as connection:
+            connection.execute(EmailVerification.__table__.insert(), history)
+        
+        self.assertEqual(rebuild_latest_verdicts(batch_size=1), 2)
+        
+        latest = self.latest()
+        self.assertEqual(list(latest["providers"]), ["hunter"])
+        self.assertTrue(latest["providers"]["hunter"]["is_valid"])
+        self.assertIn("other@example.com", get_latest_verdicts(["other@example.com"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
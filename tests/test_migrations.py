@@ -0,0 +1,84 @@
+"""
+Tests for versioned schema migrations and the startup schema check.
+"""
+import unittest
+
+import sqlalchemy
+
+from tests import reset_database
+import database
+from database import Migration, MIGRATIONS, SchemaMigration, engine, init_db, migrate, migration_status
+
+
+def _forget(*versions):
+    with engine.begin() as connection:
+        connection.execute(SchemaMigration.__table__.delete().where(SchemaMigration.version.in_(versions)))
+
+
+class MigrationTest(unittest.TestCase):
+    def setUp(self):
+        reset_database(create=False)
+        self.migrations = list(MIGRATIONS)
+    
+    def tearDown(self):
+        MIGRATIONS[:] = self.migrations
+    
+    def test_versions_are_unique_and_ordered(self):
+        versions = [migration.version for migration in MIGRATIONS]
+        self.assertEqual(versions, sorted(set(versions)))
+    
+    def test_fresh_database_is_current(self):
+        init_db()
+        self.assertTrue(all(migration["applied_at"] for migration in migration_status()))
+    
+    def test_pending_migrations_fail_startup(self):
+        init_db()
+        _forget(MIGRATIONS[-1].version)
+        
+        with self.assertRaises(RuntimeError) as raised:
+            init_db()
+        self.assertIn(str(MIGRATIONS[-1].version), str(raised.exception))
+        
+        self.assertTrue(migrate())
+        init_db()
+    
+    def test_applies_in_version_order_and_stops_at_a_failure(self):
+        init_db()
+        applied = []
+        
+        def _upgrade_first(connection):
+            applied.append("first")
+        
+        def _upgrade_broken(connection):
+            raise RuntimeError("boom")
+        
+        def _upgrade_after(connection):
+            applied.append("after")
+        
+        MIGRATIONS.extend([
+            Migration(1001, _upgrade_first),
+            Migration(1002, _upgrade_broken),
+            Migration(1003, _upgrade_after)
+        ])
+        
+        self.assertFalse(migrate())
+        self.assertEqual(applied, ["first"])
+        status = {migration["version"]: migration["applied_at"] for migration in migration_status()}
+        self.assertIsNotNone(status[1001])
+        self.assertIsNone(status[1002])
+        self.assertIsNone(status[1003])
+    
+    def test_history_index_migration_drops_the_redundant_index(self):
+        init_db()
+        with engine.begin() as connection:
+            connection.execute(sqlalchemy.text("CREATE INDEX ix_email_verification_email ON email_verification (email)"))
+        _forget(5)
+        
+        self.assertTrue(migrate())
+        with engine.connect() as connection:
+            self.assertFalse(database._index_exists(connection, "ix_email_verification_email"))
+            self.assertTrue(database._index_exists(connection, "ix_email_verification_email_date"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests for provider rate limiting and Retry-After handling.
+"""
+import time
+import unittest
+import email.utils
+
+from services.base_service import BaseVerificationService, MAX_RATE_LIMIT_RETRIES
+from services.rate_limiter import TokenBucket, parse_retry_after, parse_quota_reset
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_is_free_then_callers_queue(self):
+        bucket = TokenBucket(rate=10, burst=3)
+        waits = [bucket._reserve() for _ in range(5)]
+        
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        # Each caller waits behind the one before it, a tenth of a second apart
+        self.assertAlmostEqual(waits[3], 0.1, delta=0.02)
+        self.assertAlmostEqual(waits[4], 0.2, delta=0.02)
+        self.assertEqual(bucket.get_stats()["throttled"], 2)
+    
+    def test_zero_rate_disables_throttling(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        self.assertTrue(all(bucket._reserve() == 0 for _ in range(100)))
+    
+    def test_defer_blocks_every_caller(self):
+        bucket = TokenBucket(rate=0, burst=1)
+        bucket.defer(5)
+        
+        self.assertAlmostEqual(bucket._reserve(), 5, delta=0.1)
+        # A shorter deferral does not shorten the pause
+        bucket.defer(1)
+        self.assertAlmostEqual(bucket._reserve(), 5, delta=0.1)
+        self.assertEqual(bucket.get_stats()["deferrals"], 2)
+
+
+class ParseHeadersTest(unittest.TestCase):
+    def test_retry_after_seconds(self):
+        self.assertEqual(parse_retry_after("30"), 30.0)
+        self.assertEqual(parse_retry_after(" 1.5 "), 1.5)
+        self.assertEqual(parse_retry_after("-3"), 0.0)
+    
+    def test_retry_after_http_date(self):
+        value = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(value), 60, delta=2)
+        
+        past = email.utils.formatdate(time.time() - 60, usegmt=True)
+        self.assertEqual(parse_retry_after(past), 0.0)
+    
+    def test_retry_after_missing_or_malformed(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after(""))
+        self.assertIsNone(parse_retry_after("soon"))
+    
+    def test_quota_reset(self):
+        self.assertEqual(parse_quota_reset({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "12"}), 12.0)
+        self.assertAlmostEqual(
+            parse_quota_reset({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 120)}),
+            120, delta=2
+        )
+        self.assertIsNone(parse_quota_reset({"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": "12"}))
+        self.assertIsNone(parse_quota_reset({}))
+
+
+class LimitedService(BaseVerificationService):
+    provider_name = "limited"
+    display_name = "Limited"
+
+
+class HandleRateLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.service = LimitedService()
+        self.service.rate_limiter = TokenBucket(rate=0, burst=1)
+    
+    def test_429_defers_by_retry_after_and_retries(self):
+        self.assertTrue(self.service._handle_rate_limit(429, {"Retry-After": "7"}, 0))
+        self.assertAlmostEqual(self.service.rate_limiter._reserve(), 7, delta=0.1)
+    
+    def test_429_without_header_backs_off_exponentially(self):
+        self.service._handle_rate_limit(429, {}, 0)
+        first = self.service.rate_limiter.get_stats()["blocked_for_seconds"]
+        self.service._handle_rate_limit(429, {}, 3)
+        third = self.service.rate_limiter.get_stats()["blocked_for_seconds"]
+        
+        self.assertGreater(third, first * 4)
+    
+    def test_gives_up_after_max_retries(self):
+        self.assertFalse(self.service._handle_rate_limit(429, {"Retry-After": "0"}, MAX_RATE_LIMIT_RETRIES))
+    
+    def test_exhausted_quota_defers_without_retry(self):
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}
+        self.assertFalse(self.service._handle_rate_limit(200, headers, 0))
+        self.assertAlmostEqual(self.service.rate_limiter.get_stats()["blocked_for_seconds"], 30, delta=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
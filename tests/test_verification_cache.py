@@ -0,0 +1,94 @@
+"""
+Tests for the two-tier verification cache and its per-status TTLs.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from latest_verdicts import update_latest_verdicts
+from tests import reset_database
+from verification_cache import VerificationCache, result_status
+
+
+def result(is_valid, provider="hunter", **extra):
+    return {"email": "User@Example.com", "is_valid": is_valid, "score": 0.5,
+            "provider": provider, "details": {"status": "checked"}, **extra}
+
+
+class MemoryTierTest(unittest.TestCase):
+    def test_result_status(self):
+        self.assertEqual(result_status(result(True)), "valid")
+        self.assertEqual(result_status(result(False)), "invalid")
+        self.assertEqual(result_status(result(None)), "unknown")
+        self.assertEqual(result_status(result(True, error="timeout")), "error")
+    
+    def test_hit_is_marked_cached_and_keyed_by_normalized_address(self):
+        cache = VerificationCache(use_database=False)
+        cache.set("User@Example.com", "hunter", result(True))
+        
+        cached = cache.get(" User@EXAMPLE.com ", "hunter")
+        self.assertTrue(cached["cached"])
+        self.assertTrue(cached["is_valid"])
+        self.assertIsNone(cache.get("User@Example.com", "zerobounce"))
+        self.assertEqual(cache.get_stats()["memory_hits"], 1)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+    
+    def test_expired_entry_is_a_miss(self):
+        cache = VerificationCache(use_database=False, ttls={"unknown": timedelta(seconds=-1)})
+        cache.set("user@example.com", "hunter", result(None))
+        cache.set("user@example.com", "zerobounce", result(True, provider="zerobounce"))
+        
+        found = cache.get_many("user@example.com", ["hunter", "zerobounce"])
+        self.assertEqual(list(found), ["zerobounce"])
+        self.assertEqual(cache.get_stats()["size"], 1)
+    
+    def test_status_without_ttl_is_not_cached(self):
+        cache = VerificationCache(use_database=False, ttls={"error": None})
+        cache.set("user@example.com", "hunter", result(None, error="timeout"))
+        self.assertEqual(cache.get_stats()["size"], 0)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = VerificationCache(max_size=2, use_database=False)
+        cache.set("a@example.com", "hunter", result(True))
+        cache.set("b@example.com", "hunter", result(True))
+        cache.get("a@example.com", "hunter")
+        cache.set("c@example.com", "hunter", result(True))
+        
+        self.assertIsNotNone(cache.get("a@example.com", "hunter"))
+        self.assertIsNone(cache.get("b@example.com", "hunter"))
+
+
+class DatabaseTierTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+    
+    def store(self, provider, is_valid, age):
+        update_latest_verdicts([{
+            "email": "user@example.com", "provider": provider, "is_valid": is_valid,
+            "score": 0.5, "details": {"status": "checked"},
+            "verification_date": datetime.utcnow() - age
+        }])
+    
+    def test_stored_results_expire_by_status(self):
+        # Ten days old: past the invalid TTL (7 days), within the valid TTL (30 days)
+        self.store("hunter", True, timedelta(days=10))
+        self.store("zerobounce", False, timedelta(days=10))
+        self.store("neverbounce", False, timedelta(days=1))
+        cache = VerificationCache()
+        
+        found = cache.get_many("user@example.com", ["hunter", "zerobounce", "neverbounce"])
+        self.assertEqual(sorted(found), ["hunter", "neverbounce"])
+        self.assertTrue(found["hunter"]["cached"])
+        self.assertEqual(cache.get_stats()["database_hits"], 2)
+    
+    def test_database_hit_is_promoted_to_memory(self):
+        self.store("hunter", True, timedelta(hours=1))
+        cache = VerificationCache()
+        cache.get("user@example.com", "hunter")
+        reset_database()
+        
+        self.assertIsNotNone(cache.get("user@example.com", "hunter"))
+        self.assertEqual(cache.get_stats()["memory_hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
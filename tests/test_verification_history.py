@@ -0,0 +1,79 @@
+"""
+Tests for verification history rollover, reads across archives and retention (SQLite).
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import sqlalchemy
+
+from tests import reset_database
+from database import EmailVerification, engine
+from verification_history import (
+    add_months, archive_name, compact_history, month_start, monthly_tables,
+    partition_history_table, read_history, rollover_history
+)
+
+
+class VerificationHistoryTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        with engine.begin() as connection:
+            for name, _ in monthly_tables(connection):
+                connection.execute(sqlalchemy.text(f"DROP TABLE {name}"))
+        self.this_month = month_start(datetime.utcnow())
+    
+    def _insert(self, email, *dates):
+        with engine.begin() as connection:
+            connection.execute(EmailVerification.__table__.insert(), [
+                {"email": email, "provider": "zerobounce", "is_valid": True, "score": 0.9,
+                 "details": {"n": n}, "verification_date": date}
+                for n, date in enumerate(dates)
+            ])
+    
+    def _live_count(self):
+        with engine.connect() as connection:
+            return connection.execute(
+                sqlalchemy.select(sqlalchemy.func.count()).select_from(EmailVerification.__table__)
+            ).scalar()
+    
+    def test_rollover_moves_old_months_and_reads_include_them(self):
+        old = add_months(self.this_month, -5) + timedelta(days=2)
+        older = add_months(self.this_month, -6) + timedelta(days=2)
+        self._insert("a@example.com", datetime.utcnow(), old, older)
+        self._insert("b@example.com", old)
+        
+        moved = rollover_history(hot_months=3, batch_size=1)
+        
+        self.assertEqual(moved, {archive_name(month_start(older)): 1, archive_name(month_start(old)): 2})
+        self.assertEqual(self._live_count(), 1)
+        history = read_history("a@example.com")
+        self.assertEqual([row["details"]["n"] for row in history], [0, 1, 2])
+        self.assertEqual([row["email"] for row in read_history("b@example.com")], ["b@example.com"])
+    
+    def test_rollover_keeps_the_hot_window(self):
+        self._insert("a@example.com", datetime.utcnow(), self.this_month + timedelta(seconds=1))
+        self.assertEqual(rollover_history(hot_months=1), {})
+        self.assertEqual(self._live_count(), 2)
+    
+    def test_retention_drops_expired_archives_and_rows(self):
+        expired = add_months(self.this_month, -14) + timedelta(days=2)
+        kept = add_months(self.this_month, -5) + timedelta(days=2)
+        self._insert("a@example.com", datetime.utcnow(), kept, expired)
+        rollover_history(hot_months=3)
+        # An expired row the rollover has not reached yet is deleted from the live table
+        self._insert("a@example.com", datetime.utcnow() - timedelta(days=400))
+        
+        stats = compact_history(retention_days=365, batch_size=1)
+        
+        self.assertEqual(stats["tables_dropped"], 1)
+        self.assertEqual(stats["rows_deleted"], 1)
+        with engine.connect() as connection:
+            self.assertEqual([name for name, _ in monthly_tables(connection)], [archive_name(month_start(kept))])
+        self.assertEqual(len(read_history("a@example.com")), 2)
+    
+    def test_partitioning_requires_postgresql(self):
+        self.assertIn("error", partition_history_table())
+
+
+if __name__ == "__main__":
+    unittest.main()
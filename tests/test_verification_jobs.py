@@ -0,0 +1,118 @@
+"""
+Tests for resumable verification jobs: checkpoints, claims and leases.
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from tests import reset_database
+from database import VerificationJob, VerificationJobItem, get_db
+from email_preprocessor import EmailPreprocessor
+from address_index import AddressIndex
+from verification_job_manager import VerificationJobManager
+
+
+class FakeVerificationManager:
+    """Answers every address as valid and records what it was asked."""
+    
+    def __init__(self):
+        self.services = {"fake": object()}
+        self.preprocessor = EmailPreprocessor(index=AddressIndex(disposable_domains=[], role_prefixes=[]))
+        self.calls = []
+    
+    def bulk_verify(self, emails, service_name=None, bypass_cache=False, routing=None):
+        self.calls.append(list(emails))
+        return {"results": [{"email": email, "is_valid": True, "score": 1.0, "provider": "fake"} for email in emails]}
+
+
+class VerificationJobTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        self.manager = FakeVerificationManager()
+        self.jobs = VerificationJobManager(self.manager, chunk_size=2)
+    
+    def _items(self, job_id):
+        session = next(get_db())
+        try:
+            return session.query(VerificationJobItem).filter(
+                VerificationJobItem.job_id == job_id
+            ).order_by(VerificationJobItem.position).all()
+        finally:
+            session.close()
+    
+    def test_job_resumes_where_it_paused(self):
+        job = self.jobs.create_job([f"user{i}@example.com" for i in range(5)])
+        
+        paused = self.jobs.run_job(job["id"], max_chunks=1)
+        self.assertEqual(paused["status"], "paused")
+        self.assertEqual(paused["completed_count"], 2)
+        
+        finished = self.jobs.run_job(job["id"])
+        self.assertEqual(finished["status"], "completed")
+        self.assertEqual(finished["completed_count"], 5)
+        # No address was verified twice
+        self.assertEqual(sum(len(call) for call in self.manager.calls), 5)
+    
+    def test_checkpoint_counts_only_pending_items(self):
+        job = self.jobs.create_job(["a@example.com", "b@example.com"])
+        items = self._items(job["id"])
+        results = self.manager.bulk_verify([item.email for item in items])["results"]
+        
+        # Two workers checkpointing the same chunk, e.g. after a lease was lost mid-chunk
+        for _ in range(2):
+            session = next(get_db())
+            try:
+                stored = session.query(VerificationJob).get(job["id"])
+                self.jobs._checkpoint(session, stored, items, results)
+            finally:
+                session.close()
+        
+        info = self.jobs.get_job(job["id"])
+        self.assertEqual(info["completed_count"], 2)
+        self.assertEqual(info["error_count"], 0)
+    
+    def test_claims_queued_jobs_once(self):
+        job = self.jobs.create_job(["a@example.com"], queue=True)
+        
+        self.assertEqual(self.jobs.claim_job("worker-1"), job["id"])
+        self.assertIsNone(self.jobs.claim_job("worker-2"))
+        
+        result = self.jobs.run_job(job["id"], worker_id="worker-2")
+        self.assertIn("error", result)
+    
+    def test_expired_lease_is_reclaimed(self):
+        job = self.jobs.create_job(["a@example.com"], queue=True)
+        self.jobs.claim_job("worker-1")
+        
+        session = next(get_db())
+        try:
+            session.query(VerificationJob).filter(VerificationJob.id == job["id"]).update(
+                {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+            )
+            session.commit()
+        finally:
+            session.close()
+        
+        self.assertEqual(self.jobs.claim_job("worker-2"), job["id"])
+        finished = self.jobs.run_job(job["id"], worker_id="worker-2")
+        self.assertEqual(finished["status"], "completed")
+        self.assertIsNone(finished.get("worker_id"))
+    
+    def test_retry_errors_requeues_failed_items(self):
+        job = self.jobs.create_job(["a@example.com"])
+        items = self._items(job["id"])
+        session = next(get_db())
+        try:
+            stored = session.query(VerificationJob).get(job["id"])
+            self.jobs._checkpoint(session, stored, items, [])
+        finally:
+            session.close()
+        self.assertEqual(self.jobs.get_job(job["id"])["error_count"], 1)
+        
+        self.assertEqual(self.jobs.retry_errors(job["id"]), 1)
+        finished = self.jobs.run_job(job["id"])
+        self.assertEqual(finished["completed_count"], 1)
+        self.assertEqual(finished["error_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
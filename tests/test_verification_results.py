@@ -0,0 +1,48 @@
+"""
+Tests for classifying aggregate verification results.
+"""
+import unittest
+
+from email_verification_manager import EmailVerificationManager
+from verification_job_manager import VerificationJobManager
+
+
+class AggregateResultsTest(unittest.TestCase):
+    def setUp(self):
+        # Only the pure result helpers are exercised; no services or database needed
+        self.manager = EmailVerificationManager.__new__(EmailVerificationManager)
+        self.jobs = VerificationJobManager.__new__(VerificationJobManager)
+    
+    def test_all_provider_errors_mark_the_item_as_error(self):
+        results = {
+            "zerobounce": {"email": "a@example.com", "error": "timeout", "provider": "zerobounce"},
+            "hunter": {"email": "a@example.com", "error": "HTTP 500", "provider": "hunter"}
+        }
+        aggregate = self.manager._aggregate_results("a@example.com", results, len(results))
+        
+        self.assertIn("error", aggregate)
+        self.assertIn("zerobounce: timeout", aggregate["error"])
+        self.assertEqual(self.jobs._item_result(aggregate)["status"], "error")
+    
+    def test_one_answer_is_enough(self):
+        results = {
+            "zerobounce": {"email": "a@example.com", "error": "timeout", "provider": "zerobounce"},
+            "hunter": {"email": "a@example.com", "is_valid": True, "score": 0.9, "provider": "hunter"}
+        }
+        aggregate = self.manager._aggregate_results("a@example.com", results, len(results))
+        
+        self.assertNotIn("error", aggregate)
+        self.assertEqual(self.jobs._item_result(aggregate)["status"], "done")
+    
+    def test_pending_only_is_not_an_error(self):
+        results = {
+            "hunter": {"email": "a@example.com", "is_valid": None, "score": None,
+                       "provider": "hunter", "pending": True}
+        }
+        aggregate = self.manager._aggregate_results("a@example.com", results, len(results))
+        
+        self.assertNotIn("error", aggregate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the verification write-behind buffer.
+"""
+import unittest
+from unittest import mock
+
+from sqlalchemy import exc
+
+from database import EmailVerification, get_db
+from tests import reset_database
+from verification_writer import VerificationWriteBuffer
+
+
+def result(email, provider="hunter"):
+    return {"email": email, "is_valid": True, "score": 0.9, "provider": provider, "details": {}}
+
+
+class VerificationWriteBufferTest(unittest.TestCase):
+    def setUp(self):
+        reset_database()
+        # Large enough that only explicit flushes write
+        self.buffer = VerificationWriteBuffer(batch_size=1000, flush_interval=60, max_failures=2)
+        self.addCleanup(self.buffer.close)
+    
+    def stored_emails(self):
+        session = next(get_db())
+        try:
+            return sorted(row.email for row in session.query(EmailVerification).all())
+        finally:
+            session.close()
+    
+    def test_flush_writes_batch(self):
+        for i in range(5):
+            self.buffer.add(result(f"user{i}@example.com"))
+        
+        self.assertEqual(self.buffer.flush(), 5)
+        self.assertEqual(len(self.stored_emails()), 5)
+        self.assertEqual(self.buffer.get_stats()["pending"], 0)
+    
+    def test_bad_rows_are_dropped_and_the_rest_written(self):
+        for i in range(7):
+            # provider is NOT NULL, so these two rows are rejected
+            self.buffer.add(result(f"user{i}@example.com", provider=None if i in (2, 5) else "hunter"))
+        
+        self.assertEqual(self.buffer.flush(), 5)
+        self.assertEqual(self.stored_emails(),
+                         [f"user{i}@example.com" for i in (0, 1, 3, 4, 6)])
+        stats = self.buffer.get_stats()
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["retries"], 0)
+    
+    def test_connection_failure_keeps_rows_for_retry(self):
+        for i in range(3):
+            self.buffer.add(result(f"user{i}@example.com"))
+        
+        down = exc.OperationalError("INSERT", {}, Exception("connection refused"))
+        with mock.patch.object(self.buffer, "_insert_rows", side_effect=down) as insert:
+            self.assertEqual(self.buffer.flush(), 0)
+            # Not bisected: splitting cannot help when the database is down
+            self.assertEqual(insert.call_count, 1)
+        self.assertEqual(self.buffer.get_stats()["pending"], 3)
+        
+        self.assertEqual(self.buffer.flush(), 3)
+        self.assertEqual(len(self.stored_emails()), 3)
+    
+    def test_rows_dropped_after_max_failures(self):
+        self.buffer.add(result("user@example.com"))
+        
+        down = exc.OperationalError("INSERT", {}, Exception("connection refused"))
+        with mock.patch.object(self.buffer, "_insert_rows", side_effect=down):
+            self.buffer.flush()
+            self.buffer.flush()
+        
+        stats = self.buffer.get_stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["failed"], 1)
+    
+    def test_copy_writes_null_marker_for_missing_values(self):
+        captured = {}
+        
+        class Cursor:
+            def copy_expert(self, statement, buffer):
+                captured["statement"] = statement
+                captured["data"] = buffer.getvalue()
+        
+        class Connection:
+            def cursor(self):
+                return Cursor()
+        
+        row = self.buffer._row({"email": "user@example.com", "is_valid": None, "score": None,
+                                "provider": None, "details": None})
+        self.buffer._copy_rows([row], Connection())
+        
+        self.assertIn("NULL '\\N'", captured["statement"])
+        fields = captured["data"].strip().split(",")
+        self.assertEqual(fields[:4], ["user@example.com", "\\N", "\\N", "\\N"])
+        self.assertEqual(fields[5], "\\N")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+"""
+Verification Result Cache
+
+This module provides a two-tier cache for email verification results: an
+in-process LRU in front of the email_verdict_latest table, keyed by normalized
+address and provider. Entries expire according to a per-status TTL so that
+definitive verdicts are reused for a long time while unknown results and
+errors are retried soon.
+"""
+import os
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from database import EmailVerdictLatest, get_db
+from email_preprocessor import normalize_email, dedupe_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = int(os.getenv("VERIFICATION_CACHE_SIZE", "10000"))
+
+# How long a result stays fresh, by status
+DEFAULT_TTLS = {
+    "valid": timedelta(days=30),
+    "invalid": timedelta(days=7),
+    "unknown": timedelta(hours=1),
+    "error": timedelta(minutes=5)
+}
+
+
+def result_status(result: Dict[str, Any]) -> str:
+    """Classify a provider result as 'valid', 'invalid', 'unknown' or 'error'."""
+    if result.get("error"):
+        return "error"
+    if result.get("is_valid") is True:
+        return "valid"
+    if result.get("is_valid") is False:
+        return "invalid"
+    return "unknown"
+
+
+class VerificationCache:
+    """Two-tier (LRU + database) cache of per-provider verification results."""
+    
+    def __init__(self, max_size: Optional[int] = None,
+                 ttls: Optional[Dict[str, timedelta]] = None,
+                 use_database: bool = True):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries held in memory
+            ttls: Per-status time-to-live overrides
+            use_database: Whether to fall back to the latest verdicts in the database
+        """
+        self.max_size = max_size or DEFAULT_CACHE_SIZE
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.use_database = use_database
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[datetime, Dict[str, Any]]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "database_hits": 0, "misses": 0, "stores": 0}
+    
+    def get(self, email: str, provider: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a fresh cached result for an email and provider.
+        
+        Args:
+            email: The email address
+            provider: The provider name
+        
+        Returns:
+            The cached result, or None on a miss
+        """
+        return self.get_many(email, [provider]).get(provider)
+    
+    def get_many(self, email: str, providers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get fresh cached results for an email from several providers.
+        
+        Memory is checked first; the remaining providers are looked up in the
+        database with a single query and promoted into memory.
+        
+        Args:
+            email: The email address
+            providers: The provider names to look up
+        
+        Returns:
+            Dict mapping provider name to cached result (misses are omitted)
+        """
+        email = normalize_email(email)
+        now = datetime.utcnow()
+        found = {}
+        missing = []
+        
+        with self._lock:
+            for provider in providers:
+                key = (email, provider)
+                entry = self._entries.get(key)
+                if entry and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    found[provider] = self._mark_cached(entry[1])
+                    self._stats["memory_hits"] += 1
+                else:
+                    if entry:
+                        del self._entries[key]
+                    missing.append(provider)
+        
+        if missing and self.use_database:
+            for provider, (expires_at, result) in self._load_from_database(email, missing, now).items():
+                self._put(email, provider, result, expires_at)
+                found[provider] = self._mark_cached(result)
+                missing.remove(provider)
+                with self._lock:
+                    self._stats["database_hits"] += 1
+        
+        with self._lock:
+            self._stats["misses"] += len(missing)
+        
+        return found
+    
+    def set(self, email: str, provider: str, result: Dict[str, Any]) -> None:
+        """
+        Cache a freshly obtained provider result in memory.
+        
+        The database tier is fed by the manager's normal result storage.
+        
+        Args:
+            email: The email address
+            provider: The provider name
+            result: The provider result
+        """
+        ttl = self.ttls.get(result_status(result))
+        if not ttl:
+            return
+        self._put(normalize_email(email), provider, result, datetime.utcnow() + ttl)
+        with self._lock:
+            self._stats["stores"] += 1
+    
+    def invalidate(self, email: Optional[str] = None) -> None:
+        """Drop in-memory entries for one email, or all entries if no email is given."""
+        with self._lock:
+            if email is None:
+                self._entries.clear()
+                return
+            email = normalize_email(email)
+            for key in [key for key in self._entries if key[0] == email]:
+                del self._entries[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the current cache size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        hits = stats["memory_hits"] + stats["database_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        return stats
+    
+    def _put(self, email: str, provider: str, result: Dict[str, Any], expires_at: datetime) -> None:
+        with self._lock:
+            self._entries[(email, provider)] = (expires_at, result)
+            self._entries.move_to_end((email, provider))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def _mark_cached(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        cached = copy.copy(result)
+        cached["cached"] = True
+        return cached
+    
+    def _load_from_database(self, email: str, providers: List[str],
+                            now: datetime) -> Dict[str, Tuple[datetime, Dict[str, Any]]]:
+        """
+        Load the latest non-error result per provider that is still within its TTL.
+        
+        Reads the address's single email_verdict_latest row, which holds the
+        latest stored result of every provider (errors are never stored there).
+        
+        Returns:
+            Dict mapping provider name to (expires_at, result)
+        """
+        found = {}
+        
+        try:
+            session = next(get_db())
+            try:
+                latest = session.query(EmailVerdictLatest).get(dedupe_key(email))
+            finally:
+                session.close()
+        except Exception as e:
+            logger.error(f"Error reading verification cache from database: {str(e)}")
+            return found
+        
+        if latest is None:
+            return found
+        
+        for provider in providers:
+            entry = (latest.providers or {}).get(provider)
+            if not entry:
+                continue
+            result = {
+                "email": latest.email,
+                "is_valid": entry.get("is_valid"),
+                "score": entry.get("score"),
+                "provider": provider,
+                "details": entry.get("details")
+            }
+            verified_at = datetime.fromisoformat(entry["verified_at"])
+            expires_at = verified_at + self.ttls.get(result_status(result), timedelta(0))
+            if expires_at > now:
+                found[provider] = (expires_at, result)
+        
+        return found
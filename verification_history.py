@@ -0,0 +1,449 @@
+"""
+Verification History
+
+This module keeps the email_verification history table fast as it grows by
+one row per provider per check. History is split by month of
+verification_date:
+
+- On PostgreSQL the table can be converted (once, see partition_history_table)
+  into a natively range-partitioned table with one partition per month plus
+  a default partition; maintenance creates upcoming partitions ahead of time.
+- Elsewhere (SQLite) complete months older than the hot window are rolled
+  over into email_verification_archive_yYYYYmMM tables, keeping the live
+  table small. History reads (read_history) include the archive tables.
+
+Retention drops whole monthly tables once they are past the retention period
+and deletes the remaining expired rows in short batches. Current verdicts are
+unaffected: they live in email_verdict_latest, which is why
+rebuild_latest_verdicts should not be run after history has been compacted.
+
+Usage:
+    python verification_history.py maintain [--retention-days DAYS] [--hot-months MONTHS]
+    python verification_history.py partition
+"""
+import os
+import re
+import sys
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple
+
+import sqlalchemy
+from sqlalchemy import select, func
+
+from database import EmailVerification, engine
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TABLE = EmailVerification.__tablename__
+# Rows older than this are removed by compact_history
+HISTORY_RETENTION_DAYS = int(os.getenv("VERIFICATION_HISTORY_RETENTION_DAYS", "365"))
+# Months (including the current one) kept in the live table before rollover (non-partitioned databases)
+HISTORY_HOT_MONTHS = int(os.getenv("VERIFICATION_HISTORY_HOT_MONTHS", "3"))
+# Monthly partitions created ahead of time (partitioned PostgreSQL tables)
+HISTORY_PARTITIONS_AHEAD = int(os.getenv("VERIFICATION_HISTORY_PARTITIONS_AHEAD", "2"))
+# Rows moved or deleted per transaction
+HISTORY_BATCH_SIZE = int(os.getenv("VERIFICATION_HISTORY_BATCH_SIZE", "5000"))
+
+MONTHLY_TABLE_PATTERN = re.compile(rf"^{HISTORY_TABLE}_(archive_)?y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant of the month containing moment."""
+    return datetime(moment.year, moment.month, 1)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """First instant of the month count months after (or before) month."""
+    years, index = divmod(month.month - 1 + count, 12)
+    return datetime(month.year + years, index + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the PostgreSQL partition holding a month."""
+    return f"{HISTORY_TABLE}_y{month.year}m{month.month:02d}"
+
+
+def archive_name(month: datetime) -> str:
+    """Name of the rollover table holding a month."""
+    return f"{HISTORY_TABLE}_archive_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(connection) -> bool:
+    """Whether email_verification is a natively partitioned PostgreSQL table."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(sqlalchemy.text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+    ), {"name": HISTORY_TABLE}).first() is not None
+
+
+def monthly_tables(connection) -> List[Tuple[str, datetime]]:
+    """
+    List the monthly partitions and rollover tables.
+    
+    Returns:
+        (table name, first instant of its month) pairs, oldest first
+    """
+    tables = []
+    for name in sqlalchemy.inspect(connection).get_table_names():
+        match = MONTHLY_TABLE_PATTERN.match(name)
+        if match:
+            tables.append((name, datetime(int(match.group(2)), int(match.group(3)), 1)))
+    return sorted(tables, key=lambda table: (table[1], table[0]))
+
+
+def read_history(email: str) -> List[Dict[str, Any]]:
+    """
+    Read an address's verification history, newest first.
+    
+    Rows rolled over into archive tables are included, so rollover never
+    hides history that is still within the retention period. Partitions of a
+    partitioned table are reached through the parent.
+    
+    Args:
+        email: The (normalized) email address
+    
+    Returns:
+        List of verification records
+    """
+    with engine.connect() as connection:
+        tables = [EmailVerification.__table__] + [
+            _archive_table(name) for name, _ in monthly_tables(connection)
+            if name.startswith(f"{HISTORY_TABLE}_archive_")
+        ]
+        history = sqlalchemy.union_all(*(
+            select(*table.c).where(table.c.email == email) for table in tables
+        )).subquery()
+        rows = connection.execute(
+            select(history).order_by(history.c.verification_date.desc(), history.c.id.desc())
+        ).fetchall()
+    
+    return [
+        {
+            "id": row.id,
+            "email": row.email,
+            "is_valid": row.is_valid,
+            "score": row.score,
+            "provider": row.provider,
+            "verification_date": row.verification_date.isoformat() if row.verification_date else None,
+            "details": row.details
+        }
+        for row in rows
+    ]
+
+
+def partition_history_table() -> Dict[str, str]:
+    """
+    Convert email_verification into a range-partitioned table (PostgreSQL only).
+    
+    The existing table becomes the partition for everything before next
+    month. Its bound is proven up front with a NOT VALID check constraint that
+    is validated without blocking writes, so the swap itself only holds its
+    exclusive lock for catalog changes, not for a scan of the history.
+    
+    Returns:
+        Dict with the name of the legacy partition, or an error
+    """
+    legacy = f"{HISTORY_TABLE}_legacy"
+    bound = add_months(month_start(datetime.utcnow()), 1)
+    check = f"{legacy}_bound"
+    
+    try:
+        with engine.connect() as connection:
+            if connection.dialect.name != "postgresql":
+                return {"error": "Native partitioning requires PostgreSQL"}
+            if is_partitioned(connection):
+                return {"error": f"{HISTORY_TABLE} is already partitioned"}
+        
+        # Range partitions cannot hold NULL bounds; such rows predate the column default
+        with engine.begin() as connection:
+            fixed = connection.execute(sqlalchemy.text(
+                f"UPDATE {HISTORY_TABLE} SET verification_date = '1970-01-01' WHERE verification_date IS NULL"
+            )).rowcount
+            if fixed:
+                logger.info(f"Dated {fixed} history rows without a verification date to 1970-01-01.")
+            connection.execute(sqlalchemy.text(
+                f"ALTER TABLE {HISTORY_TABLE} ADD CONSTRAINT {check} "
+                f"CHECK (verification_date IS NOT NULL AND verification_date < '{bound.isoformat()}') NOT VALID"
+            ))
+        with engine.begin() as connection:
+            connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} VALIDATE CONSTRAINT {check}"))
+            # The validated check lets NOT NULL skip its scan; the partition key must be NOT NULL
+            connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} ALTER COLUMN verification_date SET NOT NULL"))
+        
+        # The parent's primary key must include the partition key. Build its
+        # index on the existing table without blocking writes, so attaching
+        # the table below adopts it instead of building one under lock.
+        with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as connection:
+            connection.execute(sqlalchemy.text(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {legacy}_id_date "
+                f"ON {HISTORY_TABLE} (id, verification_date)"
+            ))
+        
+        with engine.begin() as connection:
+            sequence = connection.execute(sqlalchemy.text(
+                "SELECT pg_get_serial_sequence(:table, 'id')"
+            ), {"table": HISTORY_TABLE}).scalar()
+            connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} RENAME TO {legacy}"))
+            connection.execute(sqlalchemy.text(
+                f"CREATE TABLE {HISTORY_TABLE} (LIKE {legacy} INCLUDING DEFAULTS, "
+                f"PRIMARY KEY (id, verification_date)) PARTITION BY RANGE (verification_date)"
+            ))
+            if sequence:
+                # Keep the id sequence alive when the legacy partition is eventually dropped
+                connection.execute(sqlalchemy.text(f"ALTER SEQUENCE {sequence} OWNED BY {HISTORY_TABLE}.id"))
+            connection.execute(sqlalchemy.text(
+                f"ALTER TABLE {HISTORY_TABLE} ATTACH PARTITION {legacy} "
+                f"FOR VALUES FROM (MINVALUE) TO ('{bound.isoformat()}')"
+            ))
+            connection.execute(sqlalchemy.text(f"ALTER TABLE {legacy} DROP CONSTRAINT {check}"))
+            
+            # Indexes created on the parent adopt the legacy table's matching indexes
+            for index in EmailVerification.__table__.indexes:
+                connection.execute(sqlalchemy.text(
+                    f"ALTER INDEX IF EXISTS {index.name} RENAME TO {index.name}_legacy"
+                ))
+                index.create(connection)
+            
+            connection.execute(sqlalchemy.text(
+                f"CREATE TABLE {HISTORY_TABLE}_default PARTITION OF {HISTORY_TABLE} DEFAULT"
+            ))
+    except Exception as e:
+        logger.error(f"Error partitioning verification history: {str(e)}")
+        return {"error": str(e)}
+    
+    ensure_partitions()
+    logger.info(f"Partitioned {HISTORY_TABLE}; existing history is in {legacy}.")
+    return {"legacy_partition": legacy}
+
+
+def ensure_partitions(months_ahead: int = None) -> List[str]:
+    """
+    Create the monthly partitions for the coming months.
+    
+    The current month is expected to exist already (created by an earlier
+    run, or covered by the legacy partition right after conversion). Rows
+    outside every monthly partition land in the default partition; if it
+    already holds rows of a month being created, they are moved into the
+    new partition (PostgreSQL refuses to create it otherwise).
+    
+    Args:
+        months_ahead: Number of upcoming months to cover (optional)
+    
+    Returns:
+        Names of the partitions created
+    """
+    created = []
+    current = month_start(datetime.utcnow())
+    
+    with engine.connect() as connection:
+        if not is_partitioned(connection):
+            return created
+        existing = {name for name, _ in monthly_tables(connection)}
+    
+    for offset in range(1, (months_ahead or HISTORY_PARTITIONS_AHEAD) + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            with engine.begin() as connection:
+                _create_partition(connection, name, month)
+            created.append(name)
+        except Exception as e:
+            logger.error(f"Error creating history partition {name}: {str(e)}")
+    
+    return created
+
+
+def _create_partition(connection, name: str, month: datetime) -> None:
+    """Create a month's partition, first moving any rows of that month out of the default partition."""
+    default = f"{HISTORY_TABLE}_default"
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    in_month = f"verification_date >= '{start}' AND verification_date < '{end}'"
+    
+    stray = connection.execute(sqlalchemy.text(f"SELECT 1 FROM {default} WHERE {in_month} LIMIT 1")).first()
+    if stray is None:
+        connection.execute(sqlalchemy.text(
+            f"CREATE TABLE {name} PARTITION OF {HISTORY_TABLE} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+        return
+    
+    # Detached, the default's rows can be moved; re-attaching checks it holds no rows of any partition
+    connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} DETACH PARTITION {default}"))
+    connection.execute(sqlalchemy.text(
+        f"CREATE TABLE {name} PARTITION OF {HISTORY_TABLE} FOR VALUES FROM ('{start}') TO ('{end}')"
+    ))
+    moved = connection.execute(sqlalchemy.text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    )).rowcount
+    connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} ATTACH PARTITION {default} DEFAULT"))
+    logger.info(f"Moved {moved} history rows from {default} into {name}.")
+
+
+def rollover_history(hot_months: int = None, batch_size: int = None) -> Dict[str, int]:
+    """
+    Move complete months older than the hot window into monthly archive tables.
+    
+    Used where native partitioning is not available. Rows are moved in
+    batches, each in its own short transaction.
+    
+    Args:
+        hot_months: Months (including the current one) kept in the live table (optional)
+        batch_size: Rows moved per transaction (optional)
+    
+    Returns:
+        Dict mapping archive table name to the number of rows moved into it
+    """
+    history = EmailVerification.__table__
+    cutoff = add_months(month_start(datetime.utcnow()), -((hot_months or HISTORY_HOT_MONTHS) - 1))
+    moved = {}
+    
+    with engine.connect() as connection:
+        oldest = connection.execute(
+            select(func.min(history.c.verification_date)).where(history.c.verification_date < cutoff)
+        ).scalar()
+    if oldest is None:
+        return moved
+    
+    month = month_start(oldest)
+    while month < cutoff:
+        archive = _archive_table(archive_name(month))
+        archive.create(engine, checkfirst=True)
+        in_month = (history.c.verification_date >= month) & (history.c.verification_date < add_months(month, 1))
+        
+        while True:
+            with engine.begin() as connection:
+                ids = [row[0] for row in connection.execute(
+                    select(history.c.id).where(in_month).order_by(history.c.id).limit(batch_size or HISTORY_BATCH_SIZE)
+                )]
+                if not ids:
+                    break
+                connection.execute(archive.insert().from_select(
+                    list(history.c.keys()), select(history).where(history.c.id.in_(ids))
+                ))
+                connection.execute(history.delete().where(history.c.id.in_(ids)))
+            moved[archive.name] = moved.get(archive.name, 0) + len(ids)
+        
+        # Skip months without rows rather than creating empty archive tables
+        with engine.connect() as connection:
+            oldest = connection.execute(select(func.min(history.c.verification_date)).where(
+                history.c.verification_date >= add_months(month, 1), history.c.verification_date < cutoff
+            )).scalar()
+        if oldest is None:
+            break
+        month = month_start(oldest)
+    
+    return moved
+
+
+def compact_history(retention_days: int = None, batch_size: int = None) -> Dict[str, int]:
+    """
+    Remove verification history older than the retention period.
+    
+    Monthly partitions and archive tables entirely past the cutoff are
+    dropped outright; older rows left elsewhere (the live table, the legacy
+    or default partition, a month straddling the cutoff) are deleted in
+    batches.
+    
+    Args:
+        retention_days: Days of history to keep (optional)
+        batch_size: Rows deleted per transaction (optional)
+    
+    Returns:
+        Dict with the number of tables dropped and rows deleted
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days or HISTORY_RETENTION_DAYS)
+    stats = {"tables_dropped": 0, "rows_deleted": 0}
+    
+    with engine.connect() as connection:
+        partitioned = is_partitioned(connection)
+        tables = monthly_tables(connection)
+    
+    remaining = [EmailVerification.__table__]
+    for name, month in tables:
+        if add_months(month, 1) > cutoff:
+            # Partitions are reached through the parent table
+            if not partitioned or name.startswith(f"{HISTORY_TABLE}_archive_"):
+                remaining.append(_archive_table(name))
+            continue
+        with engine.begin() as connection:
+            if partitioned and not name.startswith(f"{HISTORY_TABLE}_archive_"):
+                connection.execute(sqlalchemy.text(f"ALTER TABLE {HISTORY_TABLE} DETACH PARTITION {name}"))
+            connection.execute(sqlalchemy.text(f"DROP TABLE {name}"))
+        stats["tables_dropped"] += 1
+    
+    for table in remaining:
+        expired = select(table.c.id).where(table.c.verification_date < cutoff).limit(batch_size or HISTORY_BATCH_SIZE)
+        while True:
+            with engine.begin() as connection:
+                deleted = connection.execute(table.delete().where(table.c.id.in_(expired))).rowcount
+            stats["rows_deleted"] += deleted
+            if not deleted:
+                break
+    
+    return stats
+
+
+def maintain_history(retention_days: int = None, hot_months: int = None) -> Dict[str, Any]:
+    """
+    Run the periodic history maintenance: partitions or rollover, then retention.
+    
+    Args:
+        retention_days: Days of history to keep (optional)
+        hot_months: Months kept in the live table before rollover (optional)
+    
+    Returns:
+        Dict describing what was done
+    """
+    with engine.connect() as connection:
+        partitioned = is_partitioned(connection)
+    
+    result = {}
+    if partitioned:
+        result["partitions_created"] = ensure_partitions()
+    else:
+        result["rows_archived"] = rollover_history(hot_months)
+    result.update(compact_history(retention_days))
+    return result
+
+
+def _archive_table(name: str) -> sqlalchemy.Table:
+    """Table object for a monthly table; index names are global on SQLite, so it gets its own."""
+    table = EmailVerification.__table__.to_metadata(sqlalchemy.MetaData(), name=name)
+    table.indexes.clear()
+    sqlalchemy.Index(f"ix_{name}_email_date", table.c.email, table.c.verification_date)
+    sqlalchemy.Index(f"ix_{name}_date", table.c.verification_date)
+    return table
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the email verification history.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    maintain = subparsers.add_parser("maintain", help="Create partitions or roll over old months, then apply retention")
+    maintain.add_argument("--retention-days", type=int, default=HISTORY_RETENTION_DAYS,
+                          help="Days of history to keep")
+    maintain.add_argument("--hot-months", type=int, default=HISTORY_HOT_MONTHS,
+                          help="Months kept in the live table before rollover (non-partitioned databases)")
+    subparsers.add_parser("partition", help="Convert the history table to native partitioning (PostgreSQL)")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    if args.command == "partition":
+        result = partition_history_table()
+    else:
+        result = maintain_history(args.retention_days, args.hot_months)
+    logger.info(f"{args.command}: {result}")
+    return 1 if "error" in result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
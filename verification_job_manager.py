@@ -0,0 +1,504 @@
+"""
+Verification Job Manager
+
+This module runs bulk verification as a persistent, resumable job: the
+unique addresses of a list are stored as job items, verified chunk by chunk,
+and every chunk's results are checkpointed to the database. A job that was
+interrupted (closed browser, crashed worker) resumes from its last checkpoint
+and never re-verifies (or re-pays for) an address that is already done.
+"""
+import os
+import logging
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterable, Callable
+
+from sqlalchemy import or_, and_, func
+
+from database import VerificationJob, VerificationJobItem, engine, get_db
+from email_preprocessor import dedupe_key, invalid_syntax_result
+from address_index import skipped_address_result
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Number of addresses verified between checkpoints
+JOB_CHUNK_SIZE = int(os.getenv("VERIFICATION_JOB_CHUNK_SIZE", "200"))
+
+# A worker must renew its lease on a job within this many seconds, or another
+# worker may take the job over
+JOB_LEASE_SECONDS = int(os.getenv("VERIFICATION_JOB_LEASE_SECONDS", "300"))
+# Lock file serializing job claims on databases without SKIP LOCKED (SQLite)
+WORKER_LOCK_FILE = os.getenv(
+    "VERIFICATION_WORKER_LOCK_FILE",
+    os.path.join(tempfile.gettempdir(), "verification_worker.lock")
+)
+
+# Jobs in these states still have pending items and can be (re)started
+RESUMABLE_JOB_STATUSES = ("pending", "queued", "running", "paused", "failed")
+
+
+class VerificationJobManager:
+    """Manager class for resumable, checkpointed bulk verification jobs."""
+    
+    def __init__(self, verification_manager, chunk_size: Optional[int] = None):
+        """
+        Initialize the job manager.
+        
+        Args:
+            verification_manager: The EmailVerificationManager used to verify each chunk
+            chunk_size: Number of addresses verified between checkpoints (optional)
+        """
+        self.verification_manager = verification_manager
+        self.chunk_size = chunk_size or JOB_CHUNK_SIZE
+    
+    def create_job(self, emails: Iterable[str], service_name: Optional[str] = None,
+                   routing: Optional[str] = None, name: Optional[str] = None,
+                   queue: bool = False) -> Dict[str, Any]:
+        """
+        Create a job for a list of addresses.
+        
+        Addresses are pre-filtered first; invalid and skipped addresses are
+        recorded as done straight away, so only the rest is left to verify.
+        
+        Args:
+            emails: The addresses to verify
+            service_name: The specific service to use (optional)
+            routing: "all" or "cascade" when no service is named (optional)
+            name: A label for the job (optional)
+            queue: Queue the job for the background workers instead of running it here
+        
+        Returns:
+            Dict with the job information
+        """
+        if service_name and service_name not in self.verification_manager.services:
+            return {"error": f"Service '{service_name}' not found"}
+        
+        prefiltered = self.verification_manager.preprocessor.process(emails)
+        if not prefiltered["ordered"]:
+            return {"error": "No emails provided"}
+        
+        now = datetime.utcnow()
+        items = []
+        completed = 0
+        for position, entry in enumerate(prefiltered["ordered"]):
+            result = None
+            if not entry["valid_syntax"]:
+                result = invalid_syntax_result(entry["email"])
+            elif entry["skip_reason"]:
+                result = skipped_address_result(entry["email"], entry["skip_reason"])
+            
+            item = {"position": position, "email": entry["email"], "status": "pending"}
+            if result:
+                item.update(self._item_result(result))
+                item["processed_at"] = now
+                completed += 1
+            items.append(item)
+        
+        try:
+            session = next(get_db())
+            
+            job = VerificationJob(
+                name=name,
+                service_name=service_name,
+                routing=routing,
+                status="queued" if queue else "pending",
+                total_count=len(items),
+                completed_count=completed,
+                error_count=0,
+                preprocessing=prefiltered["stats"]
+            )
+            session.add(job)
+            session.flush()
+            
+            for item in items:
+                item["job_id"] = job.id
+            session.bulk_insert_mappings(VerificationJobItem, items)
+            
+            if completed == len(items):
+                job.status = "completed"
+                job.completed_at = now
+            
+            session.commit()
+            job_info = job.to_dict()
+            session.close()
+        except Exception as e:
+            logger.error(f"Error creating verification job: {str(e)}")
+            return {"error": str(e)}
+        
+        return job_info
+    
+    def run_job(self, job_id: int, bypass_cache: bool = False,
+                progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                max_chunks: Optional[int] = None, worker_id: Optional[str] = None,
+                should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+        """
+        Run (or resume) a job until it completes, is paused, or max_chunks is reached.
+        
+        Only items that are still pending are verified; each chunk's results
+        are committed before the next chunk starts. A job leased by a live
+        background worker cannot be run by anyone else.
+        
+        Args:
+            job_id: The job to run
+            bypass_cache: Always query the providers, ignoring cached results
+            progress_callback: Called with the job information after every checkpoint (optional)
+            max_chunks: Stop after this many chunks (optional)
+            worker_id: The background worker running the job; its lease is renewed every chunk (optional)
+            should_stop: Checked between chunks; when it returns True the job is put back
+                in the queue (worker) or paused (optional)
+        
+        Returns:
+            Dict with the job information
+        """
+        session = next(get_db())
+        try:
+            job = session.query(VerificationJob).filter(VerificationJob.id == job_id).first()
+            if not job:
+                return {"error": f"Job {job_id} not found"}
+            if job.status == "completed":
+                return job.to_dict()
+            if self._leased_by_other(job, worker_id):
+                return {"error": f"Job {job_id} is being run by worker {job.worker_id}", "id": job_id}
+            
+            job.status = "running"
+            job.error = None
+            job.started_at = job.started_at or datetime.utcnow()
+            self._renew_lease(job, worker_id)
+            session.commit()
+            
+            chunks = 0
+            while True:
+                # Pick up pause requests (and lost leases) from other sessions
+                session.refresh(job)
+                if job.status == "paused" or self._leased_by_other(job, worker_id):
+                    break
+                
+                if should_stop and should_stop():
+                    job.status = "queued" if worker_id else "paused"
+                    self._release_lease(job)
+                    session.commit()
+                    break
+                
+                items = session.query(VerificationJobItem).filter(
+                    VerificationJobItem.job_id == job_id,
+                    VerificationJobItem.status == "pending"
+                ).order_by(VerificationJobItem.position).limit(self.chunk_size).all()
+                
+                if not items:
+                    job.status = "completed"
+                    job.completed_at = datetime.utcnow()
+                    self._release_lease(job)
+                    session.commit()
+                    break
+                
+                verified = self.verification_manager.bulk_verify(
+                    [item.email for item in items], job.service_name,
+                    bypass_cache=bypass_cache, routing=job.routing
+                )
+                if "error" in verified:
+                    job.status = "failed"
+                    job.error = verified["error"]
+                    self._release_lease(job)
+                    session.commit()
+                    break
+                
+                self._renew_lease(job, worker_id)
+                self._checkpoint(session, job, items, verified["results"])
+                
+                if progress_callback:
+                    progress_callback(job.to_dict())
+                
+                chunks += 1
+                if max_chunks and chunks >= max_chunks:
+                    job.status = "paused"
+                    self._release_lease(job)
+                    session.commit()
+                    break
+            
+            if job.status == "paused" and job.worker_id == worker_id:
+                self._release_lease(job)
+                session.commit()
+            
+            return job.to_dict()
+        except Exception as e:
+            logger.error(f"Error running verification job {job_id}: {str(e)}")
+            session.rollback()
+            return {"error": str(e), "id": job_id}
+        finally:
+            session.close()
+    
+    def claim_job(self, worker_id: str) -> Optional[int]:
+        """
+        Atomically take the oldest queued job (or one whose worker's lease expired).
+        
+        PostgreSQL uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers
+        never block on or double-claim a job; SQLite serializes claims with a
+        file lock instead.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+        
+        Returns:
+            The claimed job ID, or None if there is nothing to do
+        """
+        with _claim_lock():
+            session = next(get_db())
+            try:
+                now = datetime.utcnow()
+                query = session.query(VerificationJob).filter(
+                    or_(
+                        VerificationJob.status == "queued",
+                        and_(
+                            VerificationJob.status == "running",
+                            VerificationJob.lease_expires_at.isnot(None),
+                            VerificationJob.lease_expires_at < now
+                        )
+                    )
+                ).order_by(VerificationJob.created_at)
+                
+                if session.bind.dialect.name == "postgresql":
+                    query = query.with_for_update(skip_locked=True)
+                
+                job = query.first()
+                if job is None:
+                    session.rollback()
+                    return None
+                
+                if job.status == "running":
+                    logger.warning(f"Reclaiming job {job.id} from worker {job.worker_id} (lease expired)")
+                job.status = "running"
+                job.started_at = job.started_at or now
+                self._renew_lease(job, worker_id)
+                session.commit()
+                return job.id
+            except Exception as e:
+                logger.error(f"Error claiming verification job: {str(e)}")
+                session.rollback()
+                return None
+            finally:
+                session.close()
+    
+    def queue_job(self, job_id: int) -> bool:
+        """
+        Hand a job to the background workers.
+        
+        Returns:
+            True if the job was waiting to run (pending, paused or failed)
+        """
+        session = next(get_db())
+        try:
+            updated = session.query(VerificationJob).filter(
+                VerificationJob.id == job_id,
+                VerificationJob.status.in_(("pending", "paused", "failed"))
+            ).update({"status": "queued", "error": None}, synchronize_session=False)
+            session.commit()
+            return updated > 0
+        except Exception as e:
+            logger.error(f"Error queueing verification job {job_id}: {str(e)}")
+            session.rollback()
+            return False
+        finally:
+            session.close()
+    
+    def pause_job(self, job_id: int) -> bool:
+        """
+        Ask a running job to stop after its current chunk.
+        
+        Returns:
+            True if the job was pending, queued or running
+        """
+        session = next(get_db())
+        try:
+            updated = session.query(VerificationJob).filter(
+                VerificationJob.id == job_id,
+                VerificationJob.status.in_(("pending", "queued", "running"))
+            ).update({"status": "paused"}, synchronize_session=False)
+            session.commit()
+            return updated > 0
+        except Exception as e:
+            logger.error(f"Error pausing verification job {job_id}: {str(e)}")
+            session.rollback()
+            return False
+        finally:
+            session.close()
+    
+    def retry_errors(self, job_id: int) -> int:
+        """
+        Put a job's failed items back in the queue so the next run retries them.
+        
+        Returns:
+            Number of items requeued
+        """
+        session = next(get_db())
+        try:
+            job = session.query(VerificationJob).filter(VerificationJob.id == job_id).first()
+            if not job:
+                return 0
+            
+            requeued = session.query(VerificationJobItem).filter(
+                VerificationJobItem.job_id == job_id,
+                VerificationJobItem.status == "error"
+            ).update({"status": "pending"}, synchronize_session=False)
+            
+            if requeued:
+                job.completed_count = (job.completed_count or 0) - requeued
+                job.error_count = 0
+                if job.status == "completed":
+                    job.status = "paused"
+                    job.completed_at = None
+            session.commit()
+            return requeued
+        except Exception as e:
+            logger.error(f"Error requeueing items of verification job {job_id}: {str(e)}")
+            session.rollback()
+            return 0
+        finally:
+            session.close()
+    
+    def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get a job's information and progress counters."""
+        session = next(get_db())
+        try:
+            job = session.query(VerificationJob).filter(VerificationJob.id == job_id).first()
+            return job.to_dict() if job else None
+        finally:
+            session.close()
+    
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent jobs."""
+        results = []
+        try:
+            session = next(get_db())
+            jobs = session.query(VerificationJob).order_by(
+                VerificationJob.created_at.desc()
+            ).limit(limit).all()
+            results = [job.to_dict() for job in jobs]
+            session.close()
+        except Exception as e:
+            logger.error(f"Error listing verification jobs: {str(e)}")
+        
+        return results
+    
+    def get_job_results(self, job_id: int) -> Dict[str, Any]:
+        """
+        Get a job's results in the same shape as EmailVerificationManager.bulk_verify.
+        
+        Items that are not done yet are left out.
+        
+        Returns:
+            Dict with the per-address results and pre-filter stats
+        """
+        session = next(get_db())
+        try:
+            job = session.query(VerificationJob).filter(VerificationJob.id == job_id).first()
+            if not job:
+                return {"error": f"Job {job_id} not found"}
+            
+            items = session.query(VerificationJobItem).filter(
+                VerificationJobItem.job_id == job_id,
+                VerificationJobItem.status != "pending"
+            ).order_by(VerificationJobItem.position).all()
+            
+            return {
+                "results": [item.result for item in items if item.result],
+                "preprocessing": job.preprocessing,
+                "job": job.to_dict()
+            }
+        finally:
+            session.close()
+    
+    def delete_job(self, job_id: int) -> bool:
+        """Delete a job and its items."""
+        session = next(get_db())
+        try:
+            job = session.query(VerificationJob).filter(VerificationJob.id == job_id).first()
+            if not job:
+                return False
+            session.delete(job)
+            session.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting verification job {job_id}: {str(e)}")
+            session.rollback()
+            return False
+        finally:
+            session.close()
+    
+    def _leased_by_other(self, job: VerificationJob, worker_id: Optional[str]) -> bool:
+        """Whether another worker holds a live lease on the job."""
+        return bool(
+            job.worker_id and job.worker_id != worker_id
+            and job.lease_expires_at and job.lease_expires_at > datetime.utcnow()
+        )
+    
+    def _renew_lease(self, job: VerificationJob, worker_id: Optional[str]) -> None:
+        job.worker_id = worker_id
+        job.lease_expires_at = datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS) if worker_id else None
+    
+    def _release_lease(self, job: VerificationJob) -> None:
+        job.worker_id = None
+        job.lease_expires_at = None
+    
+    def _checkpoint(self, session, job: VerificationJob, items: List[VerificationJobItem],
+                    results: List[Dict[str, Any]]) -> None:
+        """
+        Record a chunk's results and progress counters in one transaction.
+        
+        Only items still pending are updated and counted: a worker whose lease
+        expired mid-chunk may checkpoint items another worker already did.
+        """
+        results_by_key = {dedupe_key(result.get("email", "")): result for result in results}
+        now = datetime.utcnow()
+        table = VerificationJobItem.__table__
+        
+        completed = 0
+        errors = 0
+        for item in items:
+            result = results_by_key.get(dedupe_key(item.email))
+            if result is None:
+                result = {"email": item.email, "error": "No result returned", "is_valid": None}
+            
+            update = self._item_result(result)
+            update["processed_at"] = now
+            updated = session.execute(
+                table.update().where(table.c.id == item.id, table.c.status == "pending").values(**update)
+            ).rowcount
+            completed += updated
+            if updated and update["status"] == "error":
+                errors += 1
+        
+        # Incremented in SQL, so concurrent checkpoints never overwrite each other's counts
+        job.completed_count = func.coalesce(VerificationJob.completed_count, 0) + completed
+        job.error_count = func.coalesce(VerificationJob.error_count, 0) + errors
+        session.commit()
+    
+    def _item_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a job item that has a result."""
+        return {
+            "status": "error" if result.get("error") else "done",
+            "is_valid": result.get("is_valid"),
+            "score": result.get("score"),
+            "provider": result.get("provider") or result.get("decided_by"),
+            "result": result
+        }
+
+
+@contextmanager
+def _claim_lock():
+    """Serialize job claims across processes where the database cannot (SQLite)."""
+    if engine is None or engine.dialect.name == "postgresql" or fcntl is None:
+        yield
+        return
+    
+    with open(WORKER_LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,137 @@
+"""
+Verification Worker
+
+Standalone background worker for resumable verification jobs. Workers pull
+queued jobs from the database, run them with the verification engine and
+checkpoint every chunk, so bulk runs no longer depend on a Streamlit session
+staying open. Any number of workers can run side by side, on one host
+(--processes) or many: claims use SELECT ... FOR UPDATE SKIP LOCKED on
+PostgreSQL and a file lock on SQLite, and a job whose worker stops renewing
+its lease is picked up by another worker.
+
+Usage:
+    python verification_worker.py [--processes N] [--poll-interval SECONDS] [--once]
+"""
+import os
+import sys
+import socket
+import signal
+import logging
+import argparse
+import multiprocessing
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join('config', '.env'))
+except ImportError:
+    pass
+
+logger = logging.getLogger("verification_worker")
+
+POLL_INTERVAL = float(os.getenv("VERIFICATION_WORKER_POLL_INTERVAL", "5"))
+
+
+def run_worker(poll_interval: float = POLL_INTERVAL, once: bool = False,
+               stop_event=None) -> int:
+    """
+    Claim and run queued jobs until stopped.
+    
+    Args:
+        poll_interval: Seconds to wait when the queue is empty
+        once: Exit as soon as the queue is empty
+        stop_event: Set to stop the worker; a running job is requeued after its current chunk
+    
+    Returns:
+        Number of jobs run
+    """
+    # Imported here so every spawned process opens its own database engine
+    from database import init_db
+    from email_verification_manager import EmailVerificationManager
+    from verification_job_manager import VerificationJobManager
+    
+    stop_event = stop_event or multiprocessing.Event()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    
+    init_db()
+    verification_manager = EmailVerificationManager()
+    job_manager = VerificationJobManager(verification_manager)
+    
+    jobs_run = 0
+    logger.info(f"Worker {worker_id} started")
+    try:
+        while not stop_event.is_set():
+            job_id = job_manager.claim_job(worker_id)
+            if job_id is None:
+                if once:
+                    break
+                stop_event.wait(poll_interval)
+                continue
+            
+            logger.info(f"Worker {worker_id} running job {job_id}")
+            job = job_manager.run_job(job_id, worker_id=worker_id, should_stop=stop_event.is_set)
+            jobs_run += 1
+            if job.get('error'):
+                logger.error(f"Job {job_id} failed: {job['error']}")
+            else:
+                logger.info(f"Job {job_id} is {job['status']} ({job['completed_count']}/{job['total_count']})")
+    finally:
+        verification_manager.close()
+        logger.info(f"Worker {worker_id} stopped after {jobs_run} job(s)")
+    
+    return jobs_run
+
+
+def _worker_process(poll_interval: float, once: bool, stop_event) -> None:
+    """Entry point of a spawned worker process; Ctrl-C is handled by the parent."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    run_worker(poll_interval, once, stop_event)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run queued email verification jobs.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("VERIFICATION_WORKER_PROCESSES", "1")),
+                        help="Number of worker processes to run on this host")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL,
+                        help="Seconds to wait between polls when the queue is empty")
+    parser.add_argument("--once", action="store_true",
+                        help="Exit when there are no queued jobs left")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    
+    def request_stop(signum, frame):
+        logger.info("Stopping workers after their current chunk...")
+        stop_event.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    if args.processes <= 1:
+        run_worker(args.poll_interval, args.once, stop_event)
+        return 0
+    
+    processes = [
+        context.Process(target=_worker_process, args=(args.poll_interval, args.once, stop_event), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
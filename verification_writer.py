@@ -0,0 +1,346 @@
+"""
+Verification Result Writer
+
+This module provides a write-behind buffer for email verification results.
+Rows are accumulated in memory and written to the email_verification table in
+bulk (COPY on PostgreSQL, executemany elsewhere) when the buffer reaches a size
+threshold or a time interval elapses, instead of one commit per result. Each
+flush also folds its rows into the email_verdict_latest table.
+"""
+import io
+import os
+import csv
+import json
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from sqlalchemy import exc
+
+from database import EmailVerification, engine
+from latest_verdicts import update_latest_verdicts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv("VERIFICATION_WRITE_BATCH_SIZE", "500"))
+DEFAULT_FLUSH_INTERVAL = float(os.getenv("VERIFICATION_WRITE_FLUSH_INTERVAL", "2"))
+DEFAULT_MAX_PENDING = int(os.getenv("VERIFICATION_WRITE_MAX_PENDING", "10000"))
+# Consecutive failed flushes after which the buffered rows are dropped
+DEFAULT_MAX_FAILURES = int(os.getenv("VERIFICATION_WRITE_MAX_FAILURES", "5"))
+
+COPY_COLUMNS = ["email", "is_valid", "score", "provider", "verification_date", "details"]
+# Marks NULL in the COPY stream, so that an empty string stays an empty string
+# and a missing value is NULL (and rejected by NOT NULL), as with executemany
+COPY_NULL = "\\N"
+
+
+class VerificationWriteBuffer:
+    """Thread-safe write-behind buffer for EmailVerification rows."""
+    
+    def __init__(self, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 max_pending: Optional[int] = None,
+                 max_failures: Optional[int] = None):
+        """
+        Initialize the buffer.
+        
+        Args:
+            batch_size: Number of buffered rows that triggers a flush
+            flush_interval: Seconds after which buffered rows are flushed regardless of size
+                (also the delay before a failed flush is retried)
+            max_pending: Buffer size at which add() blocks until a flush catches up
+            max_failures: Consecutive failed flushes after which buffered rows are dropped
+        """
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.flush_interval = flush_interval or DEFAULT_FLUSH_INTERVAL
+        self.max_pending = max(max_pending or DEFAULT_MAX_PENDING, self.batch_size)
+        self.max_failures = max_failures or DEFAULT_MAX_FAILURES
+        
+        self._pending: List[Dict[str, Any]] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._failures = 0
+        
+        self._stats = {"buffered": 0, "written": 0, "flushes": 0, "failed": 0,
+                       "retries": 0, "backpressure_waits": 0}
+        atexit.register(self.close)
+    
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        Buffer a verification result for writing.
+        
+        Blocks while the buffer holds max_pending rows or more.
+        
+        Args:
+            result: The verification result to store
+        """
+        if not result or "email" not in result:
+            return
+        
+        row = self._row(result)
+        
+        self._ensure_flusher()
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self._stats["backpressure_waits"] += 1
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._condition.notify_all()
+                self._condition.wait()
+            self._pending.append(row)
+            self._stats["buffered"] += 1
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+    
+    def is_saturated(self) -> bool:
+        """Whether add() would currently block for backpressure."""
+        with self._condition:
+            return len(self._pending) >= self.max_pending
+    
+    def flush(self) -> int:
+        """
+        Write all buffered rows now.
+        
+        If the batch is rejected it is split in halves until the offending rows
+        are isolated; those are dropped and the rest is written. If the database
+        itself fails, the unwritten rows go back to the head of the buffer (as
+        far as max_pending allows) and are retried by the next flush; they are
+        only dropped after max_failures consecutive failures.
+        
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._condition:
+                rows = self._pending
+                self._pending = []
+                self._condition.notify_all()
+            
+            if not rows:
+                return 0
+            
+            written, rejected, unwritten, error = self._insert_isolating(rows)
+            if written:
+                self.update_latest(written)
+            
+            with self._condition:
+                if rejected:
+                    logger.error(f"Dropping {len(rejected)} verification results the database "
+                                 f"rejected: {str(error)}")
+                    self._stats["failed"] += len(rejected)
+                self._stats["written"] += len(written)
+                if not unwritten:
+                    self._failures = 0
+                    self._stats["flushes"] += 1
+            if unwritten:
+                self._requeue(unwritten, error)
+            return len(written)
+    
+    def _insert_isolating(self, rows: List[Dict[str, Any]]):
+        """
+        Insert rows, bisecting a rejected batch down to the rows that cause it.
+        
+        Stops at the first connection-level failure, which no split can fix.
+        
+        Returns:
+            Tuple of (written rows, rejected rows, rows not attempted, last error)
+        """
+        written: List[Dict[str, Any]] = []
+        rejected: List[Dict[str, Any]] = []
+        error: Optional[Exception] = None
+        chunks = [rows]
+        while chunks:
+            chunk = chunks.pop()
+            try:
+                self._insert_rows(chunk)
+                written.extend(chunk)
+                continue
+            except Exception as e:
+                error = e
+                if _is_connection_error(e):
+                    unwritten = [row for pending in chunks + [chunk] for row in pending]
+                    return written, rejected, unwritten, error
+            if len(chunk) == 1:
+                rejected.extend(chunk)
+            else:
+                middle = len(chunk) // 2
+                # Popped from the end, so push the second half first to keep order
+                chunks.append(chunk[middle:])
+                chunks.append(chunk[:middle])
+        return written, rejected, [], error
+    
+    def _requeue(self, rows: List[Dict[str, Any]], error: Exception) -> None:
+        """Put the unwritten rows of a failed flush back in front of the buffer, or drop them after too many failures."""
+        with self._condition:
+            self._failures += 1
+            if self._failures >= self.max_failures:
+                logger.error(f"Dropping {len(rows)} verification results after {self._failures} "
+                             f"consecutive failed flushes: {str(error)}")
+                self._failures = 0
+                self._stats["failed"] += len(rows)
+                return
+            
+            room = max(self.max_pending - len(self._pending), 0)
+            dropped = len(rows) - room
+            if dropped > 0:
+                logger.error(f"Dropping {dropped} verification results that no longer fit in the buffer")
+                self._stats["failed"] += dropped
+                rows = rows[dropped:]
+            self._pending = rows + self._pending
+            self._stats["retries"] += 1
+            logger.error(f"Error flushing verification results (attempt {self._failures} of "
+                         f"{self.max_failures}), {len(rows)} kept for retry: {str(error)}")
+    
+    def close(self) -> None:
+        """Stop the background flusher and write any remaining rows."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval * 2)
+        self.flush()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer counters and the number of rows currently pending."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+    
+    def _ensure_flusher(self) -> None:
+        with self._condition:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._closed = False
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="verification-writer", daemon=True
+                )
+                self._flusher.start()
+    
+    def _run_flusher(self) -> None:
+        """
+        Flush whenever the batch size is reached or the interval elapses.
+        
+        After a failed flush the next attempt waits a full interval, whatever
+        the buffer size, to give the database time to recover.
+        """
+        last_flush = time.monotonic()
+        while True:
+            with self._condition:
+                while not self._closed:
+                    remaining = self.flush_interval - (time.monotonic() - last_flush)
+                    full = len(self._pending) >= self.batch_size and not self._failures
+                    if full or (self._pending and remaining <= 0):
+                        break
+                    self._condition.wait(timeout=max(remaining, 0.05))
+                if self._closed:
+                    return
+            self.flush()
+            last_flush = time.monotonic()
+    
+    def write_now(self, results: List[Dict[str, Any]], connection) -> List[Dict[str, Any]]:
+        """
+        Insert results immediately, bypassing the buffer, in the caller's transaction.
+        
+        Used when the rows must commit together with other state (e.g. a bulk
+        import cursor). Call update_latest with the returned rows once the
+        transaction has committed.
+        
+        Args:
+            results: Verification results to store
+            connection: Connection whose transaction the rows are written in
+        
+        Returns:
+            The rows written
+        """
+        rows = [self._row(result) for result in results if result and "email" in result]
+        if not rows:
+            return rows
+        
+        if connection.dialect.name == "postgresql":
+            self._copy_rows(rows, connection.connection)
+        else:
+            connection.execute(EmailVerification.__table__.insert(), rows)
+        with self._condition:
+            self._stats["written"] += len(rows)
+        return rows
+    
+    def update_latest(self, rows: List[Dict[str, Any]]) -> None:
+        """Fold committed rows into the latest verdicts."""
+        # The history rows are committed; a failure here only leaves the latest
+        # verdicts stale until the next result for these addresses
+        try:
+            update_latest_verdicts(rows)
+        except Exception as e:
+            logger.error(f"Error updating latest verdicts: {str(e)}")
+    
+    def _row(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "email": result.get("email"),
+            "is_valid": result.get("is_valid"),
+            "score": result.get("score"),
+            "provider": result.get("provider"),
+            "verification_date": datetime.utcnow(),
+            "details": result.get("details")
+        }
+    
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Bulk insert rows into email_verification."""
+        if engine.dialect.name == "postgresql":
+            try:
+                self._copy_rows(rows)
+                return
+            except Exception as e:
+                logger.warning(f"COPY failed, falling back to executemany: {str(e)}")
+        
+        with engine.begin() as connection:
+            connection.execute(EmailVerification.__table__.insert(), rows)
+    
+    def _copy_rows(self, rows: List[Dict[str, Any]], dbapi_connection=None) -> None:
+        """
+        Stream rows into email_verification with COPY ... FROM STDIN.
+        
+        Commits on its own connection unless the DBAPI connection of an open
+        transaction is passed in.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                COPY_NULL if row["email"] is None else row["email"],
+                COPY_NULL if row["is_valid"] is None else ("t" if row["is_valid"] else "f"),
+                COPY_NULL if row["score"] is None else row["score"],
+                COPY_NULL if row["provider"] is None else row["provider"],
+                row["verification_date"].isoformat(),
+                COPY_NULL if row["details"] is None else json.dumps(row["details"])
+            ])
+        buffer.seek(0)
+        statement = (
+            f"COPY {EmailVerification.__tablename__} ({', '.join(COPY_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        
+        if dbapi_connection is not None:
+            dbapi_connection.cursor().copy_expert(statement, buffer)
+            return
+        
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.copy_expert(statement, buffer)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """Whether a write failed because of the database connection rather than the rows."""
+    if isinstance(error, exc.DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (exc.OperationalError, exc.InterfaceError, exc.TimeoutError))